@@ -2,11 +2,8 @@ import streamlit as st
 from streamlit.components.v1 import html
 import streamlit.components.v1 as components
 
-from app_user_info import run_user_info
-# from app_pref import run_pref
-from app_eda import run_eda
-from app_ml import run_ml
-from app_img import run_img
+# 페이지 모듈은 해당 메뉴를 선택했을 때만 import 합니다.
+# (홈만 보는 사용자는 pandas, plotly, sklearn, PIL, Gemini 를 로드하지 않습니다)
 
 # Theme detection script
 def detect_system_theme():
@@ -19,6 +16,12 @@ def detect_system_theme():
     """
     components.html(theme_script, height=0)
 
+# Sidebar navigation callback
+def select_menu(item):
+    # on_click 콜백은 스크립트 실행 전에 호출되므로 st.rerun() 없이
+    # 한 번의 실행으로 선택한 페이지가 그려집니다.
+    st.session_state.menu_choice = item
+
 # Custom CSS for theme-aware styling
 def apply_custom_css():
     custom_css = """
@@ -184,8 +187,19 @@ def apply_custom_css():
     st.markdown(custom_css, unsafe_allow_html=True)
 
 def main():
+    # 카탈로그/색인/모델/Gemini 클라이언트를 프로세스 당 한 번 백그라운드에서 미리 불러옵니다.
+    # (홈 화면은 기다리지 않고, 다른 메뉴로 이동할 때쯤에는 로드가 끝나 있습니다)
+    # python app_warmup.py --serve app1.py 로 실행했으면 서버 시작 시 이미 시작되었으므로 아무 일도 하지 않습니다.
+    from app_warmup import start_background_warmup
+    start_background_warmup()
+
     # Apply theme detection and custom CSS
-    detect_system_theme()
+    # 테마 감지 iframe 은 세션 당 첫 실행에서만 보냅니다.
+    if 'theme_detected' not in st.session_state:
+        st.session_state.theme_detected = True
+        detect_system_theme()
+    # CSS 블록은 매 실행마다 그려야 유지되지만, .streamlit/config.toml 의
+    # minCachedMessageSize 설정으로 두 번째 실행부터는 해시 참조만 전송됩니다.
     apply_custom_css()
     
     # Configure page layout
@@ -213,6 +227,7 @@ def main():
             "AI 맞춤 식단 설정": "🍱",
             "음식 영양 정보 보기": "📊",
             "AI 음식 영양 분석기": "🤖",
+            "식품 목록 보기": "📋",
             # "내 맛 선호도 입력": "🌶️"
             
         }
@@ -227,14 +242,14 @@ def main():
         
         # Create buttons for each menu item
         for item in menu:
-            if st.sidebar.button(
+            st.sidebar.button(
                 f"{menu_icons[item]} {item}",
                 key=item,
                 use_container_width=True,
-                type="secondary" if item != choice else "primary"
-            ):
-                st.session_state.menu_choice = item
-                st.rerun()
+                type="secondary" if item != choice else "primary",
+                on_click=select_menu,
+                args=(item,)
+            )
         
         st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
         
@@ -352,16 +367,33 @@ def main():
         """, unsafe_allow_html=True)
             
     elif "사용자 정보" in choice:
+        from app_user_info import run_user_info
         run_user_info()
     elif "식단 설정" in choice:
+        from app_ml import run_ml
         run_ml()
     elif "영양 정보" in choice:
+        from app_eda import run_eda
         run_eda()
     elif "분석기" in choice:
+        from app_img import run_img
         run_img()
+    elif "식품 목록" in choice:
+        from app_browse import run_browse
+        run_browse()
     # elif "맛 선호도" in choice:
+        # from app_pref import run_pref
         # run_pref()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 페이지별 스크립트 실행 시간 (FOOD_AI_METRICS* 환경 변수가 없으면 아무것도 하지 않음)
+    # 메뉴 콜백은 스크립트보다 먼저 실행되므로 여기서 읽은 메뉴가 이번 실행의 페이지입니다.
+    from app_metrics import start_exporter, timed, write_metrics_file
+    from app_resources import refresh_catalog
+    start_exporter()
+    # 공유 카탈로그(FOOD_AI_SHARED_CATALOG)의 새 버전이 발행되었으면 이번 실행부터 사용합니다.
+    refresh_catalog()
+    with timed("script_run", page=st.session_state.get("menu_choice", "홈")):
+        main()
+    write_metrics_file()
\ No newline at end of file
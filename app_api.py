@@ -0,0 +1,299 @@
+"""맛춤식 헤드리스 JSON API (ASGI).
+
+Streamlit 세션 없이 모바일 클라이언트 등이 영양 계산 엔진을 직접 호출할 수 있도록
+app_nutrition / app_resources 의 함수를 JSON 엔드포인트로 제공합니다.
+카탈로그와 회귀 모델, Gemini 클라이언트는 워커 프로세스 당 한 번만 로드되며, 워커가
+요청을 받기 전에 시작 단계에서 미리 불러옵니다. (app_warmup, FOOD_AI_WARMUP=0 이면 생략)
+
+실행:
+    python app_api.py --port 8000 --workers 4
+    uvicorn app_api:app --workers 4
+
+엔드포인트:
+    GET  /health                          프로세스 생존 확인 (Gemini 회로 차단기 상태 포함)
+    GET  /ready                           warm-up 완료 여부와 구성 요소별 소요 시간 (준비 전 503)
+    GET  /metrics                         Prometheus 지표 (FOOD_AI_METRICS=1 일 때 수집)
+    GET  /foods?q=김치&limit=20          식품명 검색
+    GET  /foods/{name}?grams=150          섭취량 환산 영양 정보 + 피드백
+    GET  /cooked?q=귀리 밥&grams=150       조리상태별 영양 정보 (q=귀리&state=밥 도 가능)
+    GET  /filter?q=kcal<200 and protein>=15&sort=protein_density&limit=50
+                                          영양소 조건 검색 (order=asc 면 오름차순)
+    POST /bmi        {"height", "weight", "age"}
+    POST /calories   {"carbo", "protein", "fat", "sugar", "sodium"}
+    POST /diet       {"bmi", "age", "preferences", "avoid_foods"}
+    POST /recommend  {"height", "weight", "age", "sex"?, "preferences"?, "avoid_foods"?, "k"?}
+                                          Gemini 없이 점수 상위 음식 추천 (근거 포함)
+"""
+import argparse
+import contextlib
+import math
+import os
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app_breaker import get_gemini_breaker
+from app_cooking import find_cooked_food
+from app_filter import filter_foods, parse_conditions, resolve_column
+from app_metrics import export_text
+from app_rank import recommend_foods
+from app_warmup import WARMUP_ENABLED, readiness, warm_up
+from app_resources import find_food_record, get_nutrient_filter, get_regressor, refresh_catalog, search_foods
+from app_nutrition import (
+    DAILY_LIMITS,
+    compute_bmi,
+    determine_bmi_status,
+    get_ai_diet_recommendation,
+    get_bmi_criteria,
+    limit_share,
+    macro_feedback,
+    predict_calories,
+    scale_nutrients,
+)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+
+class ApiError(Exception):
+    """잘못된 요청을 JSON 오류 응답으로 돌려주기 위한 예외입니다."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+async def handle_api_error(request, exc):
+    return JSONResponse({"error": exc.message}, status_code=exc.status_code)
+
+
+def parse_number(value, field, minimum=None, maximum=None):
+    """요청 값을 숫자로 변환하고 범위를 검사합니다."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ApiError(f"'{field}' 값은 숫자여야 합니다.")
+    # nan 은 어떤 비교도 False 라 범위 검사를 통과하므로 먼저 거릅니다.
+    if not math.isfinite(number):
+        raise ApiError(f"'{field}' 값은 유한한 숫자여야 합니다.")
+    if minimum is not None and maximum is not None and not minimum <= number <= maximum:
+        raise ApiError(f"'{field}' 값은 {minimum} ~ {maximum} 사이여야 합니다.")
+    if minimum is not None and number < minimum:
+        raise ApiError(f"'{field}' 값은 {minimum} 이상이어야 합니다.")
+    if maximum is not None and number > maximum:
+        raise ApiError(f"'{field}' 값은 {maximum} 이하여야 합니다.")
+    return number
+
+
+async def read_json(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ApiError("요청 본문이 올바른 JSON 이 아닙니다.")
+    if not isinstance(body, dict):
+        raise ApiError("요청 본문은 JSON 객체여야 합니다.")
+    return body
+
+
+# =========================================================================
+# 엔드포인트
+# =========================================================================
+
+async def health(request):
+    # 회로가 열려 있어도 식단 추천은 로컬 대체 결과로 응답하므로 상태만 알려줍니다.
+    return JSONResponse({"status": "ok", "gemini_circuit": get_gemini_breaker().state})
+
+
+async def ready(request):
+    report = readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+
+async def metrics(request):
+    return PlainTextResponse(export_text(), media_type="text/plain; version=0.0.4")
+
+
+async def food_search(request):
+    refresh_catalog()
+    query = request.query_params.get("q", "").strip()
+    limit = int(parse_number(request.query_params.get("limit", DEFAULT_SEARCH_LIMIT), "limit", 1, MAX_SEARCH_LIMIT))
+    return JSONResponse({"query": query, "results": search_foods(query, limit)})
+
+
+async def food_detail(request):
+    refresh_catalog()
+    name = request.path_params["name"]
+    grams = parse_number(request.query_params.get("grams", 100), "grams", 1, 1000)
+    info = find_food_record(name)
+    if info is None:
+        raise ApiError(f"'{name}' 음식을 찾을 수 없습니다.", status_code=404)
+
+    scaled = scale_nutrients(info, grams)
+    return JSONResponse({
+        "name": name,
+        "code": info["식품코드"],
+        "grams": grams,
+        "nutrients": scaled,
+        "daily_share": {
+            "나트륨": limit_share(scaled["나트륨(mg)"], DAILY_LIMITS["나트륨"]),
+            "당류": limit_share(scaled["당류(g)"], DAILY_LIMITS["당류"]),
+        },
+        "feedback": macro_feedback(scaled),
+    })
+
+
+async def cooked_food(request):
+    query = request.query_params.get("q", "").strip()
+    state = request.query_params.get("state", "").strip() or None
+    grams = parse_number(request.query_params.get("grams", 100), "grams", 1, 1000)
+    if not query:
+        raise ApiError("'q' 는 필수입니다.")
+    info = find_cooked_food(query, state)
+    if info is None:
+        raise ApiError(f"'{query}' 음식을 찾을 수 없습니다.", status_code=404)
+
+    return JSONResponse({
+        "name": info.name,
+        "state": info.state,
+        "requested_state": info.requested_state,
+        "exact": info.exact,
+        "grams": grams,
+        "nutrients": {col: value * grams / 100 for col, value in info.nutrients.items()},
+    })
+
+
+async def nutrient_filter(request):
+    refresh_catalog()
+    params = request.query_params
+    limit = int(parse_number(params.get("limit", DEFAULT_SEARCH_LIMIT), "limit", 1, MAX_SEARCH_LIMIT))
+    order = params.get("order", "desc")
+    if order not in ("asc", "desc"):
+        raise ApiError("'order' 는 'asc' 또는 'desc' 여야 합니다.")
+    columns = get_nutrient_filter().columns
+    try:
+        conditions = parse_conditions(params.get("q", ""), columns)
+        sort = resolve_column(params["sort"], columns) if params.get("sort") else None
+    except ValueError as e:
+        raise ApiError(str(e))
+
+    frame, total = filter_foods(conditions, sort=sort, descending=order == "desc", limit=limit)
+    return JSONResponse({
+        "conditions": [{"column": c, "op": op, "value": v} for c, op, v in conditions],
+        "sort": sort,
+        "total": total,
+        # 파생 컬럼의 NaN(열량 0 인 음식의 단백질 밀도)은 JSON 에서 null 로 보냅니다.
+        "results": frame.astype(object).where(frame.notna(), None).to_dict("records"),
+    })
+
+
+async def bmi(request):
+    body = await read_json(request)
+    height = parse_number(body.get("height"), "height", 140, 250)
+    weight = parse_number(body.get("weight"), "weight", 40, 200)
+    age = int(parse_number(body.get("age"), "age", 1, 100))
+
+    value = compute_bmi(height, weight)
+    return JSONResponse({
+        "bmi": value,
+        "status": determine_bmi_status(value, age),
+        "criteria": get_bmi_criteria(age),
+    })
+
+
+async def correct_calories(request):
+    body = await read_json(request)
+    values = [parse_number(body.get(field), field, 0)
+              for field in ("carbo", "protein", "fat", "sugar", "sodium")]
+    try:
+        regressor = get_regressor()
+    except FileNotFoundError as e:
+        raise ApiError(str(e), status_code=503)
+    # sklearn 예측은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    kcal = await run_in_threadpool(predict_calories, regressor, *values)
+    return JSONResponse({"corrected_kcal": kcal})
+
+
+async def diet(request):
+    body = await read_json(request)
+    bmi_value = parse_number(body.get("bmi"), "bmi", 5, 100)
+    age = int(parse_number(body.get("age"), "age", 1, 100))
+    preferences = body.get("preferences") or []
+    avoid_foods = body.get("avoid_foods") or []
+    # 항목은 프롬프트와 조리 식품 검색에 그대로 쓰이므로 문자열만 받습니다.
+    if not all(isinstance(items, list) and all(isinstance(item, str) for item in items)
+               for items in (preferences, avoid_foods)):
+        raise ApiError("'preferences' 와 'avoid_foods' 는 문자열 목록이어야 합니다.")
+
+    # Gemini 호출은 블로킹 I/O 이므로 스레드 풀에서 실행합니다.
+    text = await run_in_threadpool(get_ai_diet_recommendation, bmi_value, age, preferences, avoid_foods)
+    return JSONResponse({
+        "bmi_status": determine_bmi_status(bmi_value, age),
+        "recommendation": text,
+    })
+
+
+async def recommend(request):
+    refresh_catalog()
+    body = await read_json(request)
+    height = parse_number(body.get("height"), "height", 140, 250)
+    weight = parse_number(body.get("weight"), "weight", 40, 200)
+    age = int(parse_number(body.get("age"), "age", 1, 100))
+    k = int(parse_number(body.get("k", 10), "k", 1, MAX_SEARCH_LIMIT))
+    sex = body.get("sex")
+    preferences = body.get("preferences") or []
+    avoid_foods = body.get("avoid_foods") or []
+    if not isinstance(preferences, list) or not isinstance(avoid_foods, list):
+        raise ApiError("'preferences' 와 'avoid_foods' 는 문자열 목록이어야 합니다.")
+
+    return JSONResponse({
+        "bmi_status": determine_bmi_status(compute_bmi(height, weight), age),
+        "results": recommend_foods(height, weight, age, k=k, sex=sex,
+                                   preferences=[str(p) for p in preferences],
+                                   avoid_foods=[str(a) for a in avoid_foods]),
+    })
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # uvicorn 은 시작 단계(lifespan startup)가 끝난 뒤에 요청을 받기 시작합니다.
+    if WARMUP_ENABLED:
+        await run_in_threadpool(warm_up)
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health),
+        Route("/ready", ready),
+        Route("/metrics", metrics),
+        Route("/foods", food_search),
+        Route("/foods/{name}", food_detail),
+        Route("/cooked", cooked_food),
+        Route("/filter", nutrient_filter),
+        Route("/bmi", bmi, methods=["POST"]),
+        Route("/calories", correct_calories, methods=["POST"]),
+        Route("/diet", diet, methods=["POST"]),
+        Route("/recommend", recommend, methods=["POST"]),
+    ],
+    exception_handlers={ApiError: handle_api_error},
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="맛춤식 헤드리스 JSON API 서버")
+    parser.add_argument("--host", default=os.environ.get("FOOD_AI_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("FOOD_AI_API_PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("FOOD_AI_API_WORKERS", 1)),
+                        help="워커 프로세스 수 (각 워커가 카탈로그/모델을 한 번씩 로드)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run("app_api:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
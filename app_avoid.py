@@ -0,0 +1,142 @@
+"""피해야 할 음식/알레르기 제외 색인.
+
+사용자가 입력한 피해야 할 음식은 AVOID_SYNONYMS 로 관련 식품명 단어까지 넓힌 뒤
+(우유 → 치즈, 요거트, 버터 ...) 식품명에 하나라도 포함되면 제외합니다. 한 글자 단어
+(밀, 굴, 콩 ...)는 밀크, 굴비, 땅콩처럼 다른 단어의 일부로 자주 나오므로 식품명의 단어
+(TOKEN_SEPARATORS 로 나눈 조각) 전체와 같을 때만 제외합니다.
+
+단어들을 하나의 정규식 선택(a|b|c)으로 묶어 Arrow 의 RE2 엔진에 넘기면, RE2 가
+여러 단어를 한 번에 찾는 오토마톤(DFA)으로 컴파일하므로 단어 수와 관계없이 식품명
+전체를 한 번만 훑습니다. 결과 bool 배열은 단어 묶음별로 보관하므로 같은 사용자의
+두 번째 요청부터는 배열을 꺼내 쓰기만 하면 됩니다.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 피해야 할 음식/알레르기 유발 식품 → 식품명에서 함께 제외할 단어
+_DAIRY = ["우유", "치즈", "요거트", "요구르트", "버터", "크림", "라떼", "아이스크림", "연유"]
+_EGG = ["달걀", "계란", "마요네즈", "오믈렛", "에그"]
+# (한 글자 단어는 단어 전체로만 찾으므로 자주 쓰이는 합성어를 함께 둡니다)
+_PINE_NUTS = ["잣", "잣죽"]
+_NUTS = ["땅콩", "호두", "아몬드", "캐슈", "피스타치오", "헤이즐넛", "마카다미아"] + _PINE_NUTS
+_CRUSTACEANS = ["새우", "꽃게", "게장", "게살", "랍스터", "크랩", "쉬림프"]
+_OYSTER = ["굴", "굴국", "굴전", "굴밥", "굴죽", "굴찜", "굴무침"]
+_SHELLFISH = ["조개", "홍합", "전복", "바지락", "키조개"] + _OYSTER
+_FISH = ["생선", "고등어", "연어", "참치", "가자미", "동태", "명태", "갈치", "꽁치"]
+_WHEAT = ["빵", "통밀", "밀가루", "국수", "라면", "파스타", "스파게티", "우동", "만두", "칼국수", "피자", "케이크",
+          "도넛", "와플"]
+_HAM = ["햄", "햄치즈", "햄에그", "햄샌드위치", "햄볶음"]
+_PORK = ["돼지", "삼겹", "제육", "베이컨", "소시지", "소세지", "순대", "족발", "보쌈"] + _HAM
+_BEEF = ["소고기", "쇠고기", "불고기", "소갈비", "육회", "사골"]
+_SOY = ["콩", "콩나물", "콩밥", "검정콩", "검은콩", "콩조림", "콩자반", "콩국수", "콩비지", "콩고물", "두유", "두부", "된장",
+        "간장", "청국장"]
+
+AVOID_SYNONYMS = {
+    "우유": _DAIRY, "유제품": _DAIRY, "유당": _DAIRY,
+    "달걀": _EGG, "계란": _EGG, "난류": _EGG,
+    "견과류": _NUTS, "견과": _NUTS, "땅콩": ["땅콩"], "잣": _PINE_NUTS,
+    "갑각류": _CRUSTACEANS, "새우": ["새우", "쉬림프"], "게": ["꽃게", "게장", "게살", "크랩"],
+    "조개류": _SHELLFISH, "조개": _SHELLFISH, "굴": _OYSTER,
+    "해산물": _CRUSTACEANS + _SHELLFISH + ["오징어", "문어", "낙지", "쭈꾸미"],
+    "생선": _FISH,
+    "밀": _WHEAT, "밀가루": _WHEAT, "글루텐": _WHEAT,
+    "돼지고기": _PORK, "햄": _HAM, "소고기": _BEEF, "쇠고기": _BEEF,
+    "대두": _SOY, "콩": _SOY,
+}
+# 단어 묶음별 제외 배열을 보관할 최대 개수
+MASK_CACHE_SIZE = 512
+# 식품명 안의 단어를 나누는 문자 (예: "스무디_말차 밀크 프라페", "햄&에그")
+TOKEN_SEPARATORS = r"\s_(),/&+·-"
+# 한 글자지만 어디에 붙어도 같은 음식을 뜻해(식빵, 크림빵 ...) 포함 여부로 찾는 단어
+SUBSTRING_SYLLABLES = {"빵"}
+
+
+def expand_avoid_terms(terms, synonyms=True):
+    """피해야 할 음식 목록을 정리하고(공백, 중복 제거) 관련 단어를 더한 정렬된 튜플.
+
+    결과는 순서와 관계없이 같은 묶음이면 같으므로 캐시 키로 씁니다.
+    """
+    expanded = set()
+    for term in terms:
+        term = " ".join(str(term).split())
+        if not term:
+            continue
+        expanded.add(term)
+        if synonyms:
+            expanded.update(AVOID_SYNONYMS.get(term, ()))
+    return tuple(sorted(expanded))
+
+
+def term_pattern(term, whole_syllables=True):
+    """단어 하나의 검색 정규식. whole_syllables 이면 한 글자 단어는 식품명의 단어 전체와 같을 때만 찾습니다."""
+    if not whole_syllables or len(term) > 1 or term in SUBSTRING_SYLLABLES:
+        return re.escape(term)
+    return f"(?:^|[{TOKEN_SEPARATORS}]){re.escape(term)}(?:$|[{TOKEN_SEPARATORS}])"
+
+
+class ExclusionIndex:
+    """식품명 배열에 대해 단어 묶음별 포함 여부(bool 배열)를 계산하고 보관합니다."""
+
+    def __init__(self, names):
+        import pyarrow as pa
+
+        if isinstance(names, pa.ChunkedArray):
+            names = names.combine_chunks()
+        elif not isinstance(names, pa.Array):
+            names = pa.array(names, type=pa.string())
+        self._names = names
+        # Streamlit 세션 스레드와 API 스레드 풀이 함께 쓰므로 캐시 갱신은 잠금 안에서 합니다.
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def match(self, terms, whole_syllables=True):
+        """정리된 단어 튜플 중 하나라도 식품명에 포함된 행의 bool 배열 (최근 사용 순으로 보관)."""
+        key = (terms, whole_syllables)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+        # 검색은 잠금 밖에서 합니다. 같은 묶음을 동시에 계산하면 나중 결과로 덮어쓸 뿐입니다.
+        if terms:
+            import pyarrow.compute as pc
+            pattern = "|".join(term_pattern(term, whole_syllables) for term in terms)
+            matched = pc.match_substring_regex(self._names, pattern)
+            mask = matched.to_numpy(zero_copy_only=False)
+            if matched.null_count:
+                mask = mask & matched.is_valid().to_numpy(zero_copy_only=False)
+        else:
+            mask = np.zeros(len(self._names), dtype=bool)
+        mask.flags.writeable = False  # 여러 요청이 같은 배열을 나눠 쓰므로 읽기 전용
+        with self._lock:
+            self._masks[key] = mask
+            self._masks.move_to_end(key)
+            if len(self._masks) > MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        return mask
+
+    def mask(self, terms, synonyms=True):
+        """피해야 할 음식(관련 단어 포함)이 식품명에 들어 있는 행의 bool 배열.
+
+        synonyms=False 는 선호 음식처럼 입력한 단어만 찾는 경우로, 한 글자 단어(밥, 떡 ...)도
+        그대로 포함 여부로 찾습니다.
+        """
+        return self.match(expand_avoid_terms(terms, synonyms), whole_syllables=synonyms)
+
+
+def exclusion_mask(avoid_foods, synonyms=True):
+    """카탈로그 행별 제외 여부 bool 배열 (get_catalog() 행 순서)."""
+    from app_resources import get_exclusion_index
+    return get_exclusion_index().mask(avoid_foods, synonyms)
+
+
+def matched_terms(name, avoid_foods, synonyms=True):
+    """식품명에 들어 있는 피해야 할 단어 목록 (제외 이유 표시용)."""
+    return [term for term in expand_avoid_terms(avoid_foods, synonyms)
+            if re.search(term_pattern(term, whole_syllables=synonyms), name)]
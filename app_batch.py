@@ -0,0 +1,181 @@
+"""식사 기록 파일 일괄 처리 CLI.
+
+(음식 이름, 섭취량 g, 시각) 으로 이루어진 CSV/JSONL 식사 기록을 청크 단위로 읽어
+카탈로그에서 음식을 찾고, 음식 영양 정보 페이지(run_eda)와 같은 방식으로 섭취량에
+맞게 환산한 행별 결과와 일별 합계(나트륨/당류 하루 권장량 대비 %)를 출력합니다.
+입력 크기와 관계없이 한 번에 한 청크(워커 사용 시 워커 수 x 2 청크)만 메모리에 둡니다.
+
+    python app_batch.py meals.csv --out rows.csv --daily daily.csv
+    python app_batch.py meals.jsonl --workers 8 --chunksize 200000
+"""
+import argparse
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app_resources import get_food_index, get_nutrient_matrix
+from app_nutrition import DAILY_LIMITS, NUTRIENT_COLUMNS
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# 행별 결과 CSV 컬럼 순서
+ROW_COLUMNS = ["date", "timestamp", "food", "grams", "matched"] + NUTRIENT_COLUMNS + ["나트륨(%)", "당류(%)"]
+
+
+def read_chunks(path, chunksize, columns):
+    """입력 파일을 DataFrame 청크로 나눠 읽습니다. (.jsonl/.ndjson 은 JSON Lines)"""
+    if path.endswith((".jsonl", ".ndjson")):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, usecols=columns, dtype={columns[0]: str})
+    for chunk in reader:
+        yield chunk[columns]
+
+
+def process_chunk(chunk, name_col, grams_col, time_col):
+    """청크 하나를 환산하여 (행별 결과, 일별 합계 DataFrame, 건너뛴 행 수 dict) 를 반환합니다.
+
+    워커 프로세스에서도 실행되므로 카탈로그는 app_resources 에서 프로세스마다
+    한 번만 로드됩니다.
+    """
+    matrix = get_nutrient_matrix()
+
+    positions = chunk[name_col].map(get_food_index())
+    found = positions.notna().to_numpy()
+    grams = pd.to_numeric(chunk[grams_col], errors="coerce").to_numpy(dtype=float)
+    # 섭취량을 읽을 수 없는 행은 영양값을 계산할 수 없으므로 매칭에서 뺍니다.
+    matched = found & np.isfinite(grams)
+    dates = parse_dates(chunk[time_col])
+
+    # run_eda 와 같은 계산: 100g 기준 값 x (섭취량 / 100)
+    values = np.full((len(chunk), len(NUTRIENT_COLUMNS)), np.nan)
+    values[matched] = matrix[positions[matched].astype(int).to_numpy()] * (grams[matched, None] / 100)
+
+    rows = pd.DataFrame(values, columns=NUTRIENT_COLUMNS, index=chunk.index)
+    rows.insert(0, "date", dates)
+    rows.insert(1, "timestamp", chunk[time_col])
+    rows.insert(2, "food", chunk[name_col])
+    rows.insert(3, "grams", grams)
+    rows.insert(4, "matched", matched)
+    add_limit_shares(rows)
+
+    # 날짜를 읽을 수 없는 행은 행별 결과에는 남기고 일별 합계에서만 빠지며, 건수를 따로 알립니다.
+    counted = rows[matched & dates.notna().to_numpy()]
+    daily = counted.groupby("date")[NUTRIENT_COLUMNS].sum()
+    daily["items"] = counted.groupby("date").size()
+    counts = {
+        "unmatched": int((~found).sum()),
+        "bad_grams": int((found & ~matched).sum()),
+        "bad_dates": int((matched & dates.isna().to_numpy()).sum()),
+    }
+    return rows, daily, counts
+
+
+def parse_dates(values):
+    """시각 컬럼을 날짜 문자열(YYYY-MM-DD)로 바꿉니다. 읽을 수 없는 값은 NaN.
+
+    첫 값으로 형식을 추측하면 같은 청크의 다른 ISO 8601 표기('T' 구분자, 초 생략 등)가
+    모두 NaT 가 되므로 ISO8601 형식으로 읽습니다. 시간대가 섞인 청크는 값마다 읽어
+    기록된 현지 날짜를 그대로 씁니다.
+    """
+    try:
+        return pd.to_datetime(values, errors="coerce", format="ISO8601").dt.strftime("%Y-%m-%d")
+    except ValueError:
+        return values.map(lambda v: pd.to_datetime(v, errors="coerce", format="ISO8601")).map(
+            lambda t: t.strftime("%Y-%m-%d") if pd.notna(t) else np.nan
+        )
+
+
+def render_chunk(chunk, name_col, grams_col, time_col):
+    """청크를 처리하고 행별 결과를 CSV 텍스트(헤더 제외)로 직렬화합니다.
+
+    직렬화까지 워커에서 수행해야 병렬 처리 시 부모 프로세스가 병목이 되지 않습니다.
+    """
+    rows, daily, counts = process_chunk(chunk, name_col, grams_col, time_col)
+    text = rows.to_csv(header=False, index=False, float_format="%.3f", lineterminator="\n")
+    return text, daily, len(rows), counts
+
+
+def add_limit_shares(frame):
+    """나트륨/당류의 하루 권장량 대비 비율(%) 컬럼을 추가합니다."""
+    frame["나트륨(%)"] = frame["나트륨(mg)"] / DAILY_LIMITS["나트륨"] * 100
+    frame["당류(%)"] = frame["당류(g)"] / DAILY_LIMITS["당류"] * 100
+
+
+def iter_results(chunks, workers, name_col, grams_col, time_col):
+    """청크 처리 결과를 입력 순서대로 내보냅니다.
+
+    workers > 1 이면 프로세스 풀을 사용하되, 미리 제출하는 청크 수를 제한해
+    메모리 사용량이 입력 크기에 따라 늘어나지 않게 합니다.
+    """
+    args = (name_col, grams_col, time_col)
+    if workers <= 1:
+        for chunk in chunks:
+            yield render_chunk(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(render_chunk, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="식사 기록 CSV/JSONL 일괄 영양 환산")
+    parser.add_argument("input", help="식사 기록 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("--out", default="-", help="행별 결과 CSV 경로 (기본: 표준 출력)")
+    parser.add_argument("--daily", help="일별 합계 CSV 경로 (기본: 표준 오류로 요약 출력)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=1, help="청크를 병렬 처리할 프로세스 수")
+    parser.add_argument("--name-col", default="food")
+    parser.add_argument("--grams-col", default="grams")
+    parser.add_argument("--time-col", default="timestamp")
+    args = parser.parse_args(argv)
+
+    columns = [args.name_col, args.grams_col, args.time_col]
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8-sig", newline="")
+    daily_totals = None
+    total_rows = 0
+    skipped = {"unmatched": 0, "bad_grams": 0, "bad_dates": 0}
+
+    try:
+        chunks = read_chunks(args.input, args.chunksize, columns)
+        results = iter_results(chunks, args.workers, *columns)
+        out.write(",".join(ROW_COLUMNS) + "\n")
+        for text, daily, n_rows, counts in results:
+            out.write(text)
+            # 일별 합계는 날짜 수만큼만 커지므로 청크마다 누적합니다.
+            daily_totals = daily if daily_totals is None else daily_totals.add(daily, fill_value=0)
+            total_rows += n_rows
+            for key, count in counts.items():
+                skipped[key] += count
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if daily_totals is None:
+        daily_totals = pd.DataFrame(columns=NUTRIENT_COLUMNS + ["items"])
+    daily_totals = daily_totals.sort_index()
+    # 청크 간 add 로 float 가 된 건수를 정수로 되돌립니다.
+    daily_totals["items"] = daily_totals["items"].astype(int)
+    add_limit_shares(daily_totals)
+    daily_totals.index.name = "date"
+
+    if args.daily:
+        daily_totals.to_csv(args.daily, encoding="utf-8-sig", float_format="%.3f")
+    else:
+        print(daily_totals.round(1).to_string(), file=sys.stderr)
+    print(f"처리한 행: {total_rows}, 카탈로그에 없는 음식: {skipped['unmatched']}, "
+          f"섭취량을 읽을 수 없는 행: {skipped['bad_grams']}, "
+          f"시각을 읽을 수 없어 일별 합계에서 뺀 행: {skipped['bad_dates']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
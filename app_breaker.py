@@ -0,0 +1,144 @@
+"""Gemini 호출 회로 차단기(circuit breaker).
+
+Gemini 가 느리거나 계속 실패하면 모든 사용자가 긴 대기 끝에 오류를 받습니다. 최근 호출
+WINDOW 건 중 실패(느린 호출 포함) 비율이 기준을 넘으면 회로를 열어(open) OPEN_SECONDS
+동안 호출하지 않고 바로 CircuitOpenError 를 올리며, 호출한 쪽은 로컬 대체 결과를 보여줍니다.
+(app_fallback)
+
+    closed     평소 상태. 호출 결과를 기록하고 실패 비율이 기준을 넘으면 open
+    open       호출하지 않음. OPEN_SECONDS 가 지나면 half_open
+    half_open  시험 호출 한 건만 허용. 성공하면 closed (기록 초기화), 실패하면 다시 open
+
+상태가 바뀌기 전에 허용된 호출이 나중에 끝나면 그 결과는 버립니다. 그래서 half_open 을
+벗어나게 하는 것은 시험 호출 자신의 결과뿐입니다.
+
+    FOOD_AI_BREAKER_FAILURE_RATE=0.5   회로를 여는 실패 비율
+    FOOD_AI_BREAKER_SLOW_SECONDS=20    이보다 오래 걸린 호출은 실패로 셉니다
+    FOOD_AI_BREAKER_OPEN_SECONDS=30    열린 상태를 유지하는 시간
+"""
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from app_metrics import inc
+
+FAILURE_RATE = float(os.environ.get("FOOD_AI_BREAKER_FAILURE_RATE", 0.5))
+SLOW_SECONDS = float(os.environ.get("FOOD_AI_BREAKER_SLOW_SECONDS", 20))
+OPEN_SECONDS = float(os.environ.get("FOOD_AI_BREAKER_OPEN_SECONDS", 30))
+# 실패 비율을 계산하는 최근 호출 수와, 판단을 시작할 최소 호출 수
+WINDOW = 20
+MIN_CALLS = 5
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """회로가 열려 있어 호출하지 않았음을 알리는 예외입니다."""
+
+
+class CircuitBreaker:
+    """최근 호출의 실패/지연 비율로 호출 허용 여부를 정합니다. 여러 스레드에서 공유합니다."""
+
+    def __init__(self, name, failure_rate=FAILURE_RATE, slow_seconds=SLOW_SECONDS,
+                 open_seconds=OPEN_SECONDS, window=WINDOW, min_calls=MIN_CALLS, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.min_calls = min_calls
+        self._clock = clock
+        self._results = deque(maxlen=window)  # True = 실패
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._epoch = 0  # 상태가 바뀔 때마다 증가. 허용 토큰에 담아 오래된 결과를 가려냅니다.
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state):
+        self._state = state
+        self._epoch += 1
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state != HALF_OPEN:
+            self._probing = False
+        if state == CLOSED:
+            self._results.clear()
+        inc("gemini_breaker_transitions", breaker=self.name, state=state)
+
+    def allow(self):
+        """지금 호출해도 되면 허용 토큰 (상태 번호, 시험 호출 여부), 아니면 None.
+
+        half_open 에서는 시험 호출 한 건에만 토큰을 줍니다. 토큰은 record()/release() 에 넘깁니다.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return self._epoch, False
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return self._epoch, True
+        inc("gemini_breaker_rejected", breaker=self.name)
+        return None
+
+    def record(self, token, success, seconds=0.0):
+        """허용된 호출 한 건의 결과를 기록합니다. 기준 시간보다 느린 성공도 실패로 셉니다.
+
+        토큰을 받은 뒤 상태가 바뀌었으면(closed 에서 허용된 호출이 open/half_open 이 된 뒤에
+        끝난 경우 등) 결과를 버립니다.
+        """
+        epoch, probe = token
+        failed = not success or seconds >= self.slow_seconds
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            if probe:
+                self._transition(OPEN if failed else CLOSED)
+                return
+            self._results.append(failed)
+            if (self._state == CLOSED and len(self._results) >= self.min_calls
+                    and sum(self._results) / len(self._results) >= self.failure_rate):
+                self._transition(OPEN)
+
+    def release(self, token):
+        """결과를 기록하지 않고 허용을 돌려놓습니다. 시험 호출이었다면 다음 시험 호출을 허용합니다."""
+        epoch, probe = token
+        with self._lock:
+            if probe and epoch == self._epoch:
+                self._probing = False
+
+    def call(self, fn, *args, **kwargs):
+        """fn 을 회로 차단기로 감싸 호출합니다. 열려 있으면 CircuitOpenError."""
+        token = self.allow()
+        if token is None:
+            raise CircuitOpenError(f"{self.name} 호출이 일시적으로 중단되었습니다. (회로 열림)")
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(token, False, time.perf_counter() - started)
+            raise
+        except BaseException:
+            # Streamlit 의 rerun/stop 처럼 호출과 무관한 제어 예외는 결과로 세지 않고
+            # 시험 호출 자리만 돌려놓습니다.
+            self.release(token)
+            raise
+        self.record(token, True, time.perf_counter() - started)
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_gemini_breaker():
+    """Gemini 호출(이미지 분석, 식단 생성)이 함께 쓰는 프로세스 공용 회로 차단기."""
+    return CircuitBreaker("gemini")
@@ -0,0 +1,82 @@
+import streamlit as st
+
+# 정렬/필터/페이지 나누기는 서버(app_filter 의 정렬 색인)에서 하고,
+# 브라우저에는 현재 페이지의 행만 보냅니다. 카탈로그가 커져도 전송량은 페이지 크기로 일정합니다.
+from app_filter import RANGE_INPUTS, browse_foods
+from app_resources import get_category_index, get_nutrient_filter
+
+# 정렬 선택 목록의 첫 항목 (카탈로그 순서)
+CATALOG_ORDER = "카탈로그 순"
+ALL_CATEGORIES = "전체"
+PAGE_SIZES = [25, 50, 100]
+
+
+def run_browse():
+    st.markdown("""
+        <div style="text-align: center; padding: 2rem 0;">
+            <h1 style="color: var(--primary-color);">식품 목록 보기</h1>
+            <p style="color: var(--text-color); font-size: 1.2rem;">
+                전체 식품을 이름, 분류, 영양소 조건으로 찾아보고 원하는 순서로 정렬할 수 있습니다
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+    st.caption("※ 모든 수치는 100g 또는 100ml 기준입니다. 단백질 밀도 = 100kcal 당 단백질(g)")
+
+    col1, col2 = st.columns([2, 1])
+    name_query = col1.text_input("식품명 검색", placeholder="예: 닭가슴살, 김치").strip()
+    categories = get_category_index()
+    category = col2.selectbox("분류", [ALL_CATEGORIES] + categories.categories)
+
+    conditions = []
+    with st.expander("영양소 조건 / 제외할 음식"):
+        for col, (label, column, op, step) in zip(st.columns(len(RANGE_INPUTS)), RANGE_INPUTS):
+            value = col.number_input(label, min_value=0.0, value=None, step=step,
+                                     placeholder="제한 없음", key=f"browse_{column}")
+            if value is not None:
+                conditions.append((column, op, value))
+        avoid_text = st.text_input("제외할 음식 (쉼표로 구분, 알레르기 관련 식품도 함께 제외)",
+                                   placeholder="예: 땅콩, 우유, 새우")
+        exclude = tuple(food.strip() for food in avoid_text.split(",") if food.strip())
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    sort = col1.selectbox("정렬 기준", [CATALOG_ORDER] + get_nutrient_filter().columns)
+    descending = col2.radio("순서", ["높은 순", "낮은 순"], horizontal=True) == "높은 순"
+    page_size = col3.selectbox("페이지 크기", PAGE_SIZES, index=1)
+
+    # 검색 조건이 바뀌면 첫 페이지로 돌아갑니다. (페이지 입력 위젯을 만들기 전에 바꿔야 합니다)
+    signature = (name_query, category, tuple(conditions), exclude, sort, descending, page_size)
+    if st.session_state.get("browse_signature") != signature:
+        st.session_state.browse_signature = signature
+        st.session_state.browse_page = 1
+
+    query = dict(
+        name_query=name_query or None,
+        category=None if category == ALL_CATEGORIES else category,
+        sort=None if sort == CATALOG_ORDER else sort,
+        descending=descending,
+        limit=page_size,
+        exclude=exclude,
+    )
+    page = st.session_state.get("browse_page", 1)
+    frame, total = browse_foods(conditions, offset=(page - 1) * page_size, **query)
+    pages = max(1, -(-total // page_size))
+    if page > pages:
+        # 카탈로그가 새 버전으로 바뀌어 페이지 수가 줄어든 경우
+        page = st.session_state.browse_page = pages
+        frame, total = browse_foods(conditions, offset=(page - 1) * page_size, **query)
+
+    if total == 0:
+        st.info("조건에 맞는 식품이 없습니다.")
+        return
+
+    start = (page - 1) * page_size
+    st.caption(f"전체 {total:,}개 중 {start + 1:,}–{start + len(frame):,}번째 ({page}/{pages} 페이지)")
+    # 같은 식품명이 여러 식품코드로 나뉘어 있으므로 행을 구분하는 식품코드를 함께 보여줍니다.
+    st.dataframe(frame, hide_index=True, use_container_width=True)
+    st.number_input("페이지", min_value=1, max_value=pages, step=1, key="browse_page")
+
+
+# 이 스크립트를 메인으로 실행할 때 run_browse() 함수를 호출합니다.
+if __name__ == "__main__":
+    st.set_page_config(page_title="식품 목록", layout="wide")
+    run_browse()
@@ -0,0 +1,122 @@
+"""식품명 접두어("분류_메뉴")로 만든 분류 색인.
+
+food1.csv 의 식품명은 대부분 "국밥_돼지머리", "국밥_순대국밥" 처럼 분류와 메뉴를 "_" 로
+잇습니다. ("김밥" 처럼 "_" 가 없으면 이름 전체가 분류입니다.) 카탈로그를 불러올 때
+한 번만 행을 분류 순으로 정렬해 두면, 분류별 행 범위/식품명 목록/영양소 요약을
+정규식 검색 없이 바로 꺼낼 수 있습니다.
+
+    order[offsets[i]:offsets[i + 1]]   분류 i 의 카탈로그 행 번호 (카탈로그 순서 유지)
+"""
+import numpy as np
+
+CATEGORY_SEPARATOR = "_"
+# run_eda 등에서 분류 요약으로 보여주는 영양소
+SUMMARY_COLUMNS = ["에너지(kcal)", "나트륨(mg)"]
+
+
+def category_of(name):
+    """식품명의 분류 (첫 번째 "_" 앞부분)."""
+    return name.split(CATEGORY_SEPARATOR, 1)[0]
+
+
+class CategoryIndex:
+    """분류 → 카탈로그 행 범위, 식품명 목록, 영양소 평균/최솟값/최댓값."""
+
+    # 발행(app_shared_catalog)할 때 파일로 저장하고 워커가 메모리 매핑해 쓰는 배열
+    STATE_ARRAYS = ("order", "counts", "offsets", "means", "mins", "maxs", "name_rows", "name_offsets")
+
+    def __init__(self, names, matrix, columns):
+        import pandas as pd
+
+        names = np.asarray(names, dtype=object)
+        codes, categories = pd.factorize(pd.Series(names).str.split(CATEGORY_SEPARATOR, n=1).str[0])
+
+        # 안정 정렬이므로 같은 분류 안에서는 카탈로그 순서가 유지됩니다.
+        self.order = np.argsort(codes, kind="stable").astype(np.int32)
+        self.counts = np.bincount(codes, minlength=len(categories))
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)]).astype(np.int32)
+
+        starts = self.offsets[:-1]
+        values = np.asarray(matrix)[self.order]
+        # 합계는 float64 로 누적하고, 최솟값/최댓값은 원래 dtype(float32) 그대로 둡니다.
+        self.means = np.add.reduceat(values, starts, axis=0, dtype=np.float64) / self.counts[:, None]
+        self.mins = np.minimum.reduceat(values, starts, axis=0)
+        self.maxs = np.maximum.reduceat(values, starts, axis=0)
+
+        # 분류별 중복 없는 식품명의 첫 행 (분류 → 식품명 → 행의 두 번째 단계).
+        # 식품명은 한 분류에만 속하므로 분류 순 정렬에서 처음 나온 이름이 곧 분류 안의 첫 등장입니다.
+        first = np.flatnonzero(~pd.Series(names[self.order]).duplicated().to_numpy())
+        self.name_rows = self.order[first]
+        name_counts = np.bincount(codes[self.name_rows], minlength=len(categories))
+        self.name_offsets = np.concatenate([[0], np.cumsum(name_counts)]).astype(np.int32)
+        self._setup(list(categories), columns, names)
+
+    def _setup(self, categories, columns, names):
+        self.categories = categories  # 카탈로그 첫 등장 순
+        self._codes = {category: i for i, category in enumerate(self.categories)}
+        self.columns = list(columns)
+        self._source_names = names  # 카탈로그 행 순서의 식품명 (take 를 지원하는 배열)
+        self._names = {}  # 분류 번호 → 식품명 목록 (처음 요청할 때 만듭니다)
+
+    def state(self):
+        """발행용 (JSON 메타데이터, 배열 dict)."""
+        return {"categories": self.categories, "columns": self.columns}, \
+            {name: getattr(self, name) for name in self.STATE_ARRAYS}
+
+    @classmethod
+    def from_state(cls, meta, arrays, names):
+        """state() 로 저장한 값(메모리 매핑 배열)으로 다시 계산 없이 색인을 만듭니다."""
+        index = cls.__new__(cls)
+        for name in cls.STATE_ARRAYS:
+            setattr(index, name, arrays[name])
+        index._setup(meta["categories"], meta["columns"], names)
+        return index
+
+    def __len__(self):
+        return len(self.categories)
+
+    def __contains__(self, category):
+        return category in self._codes
+
+    def code(self, category):
+        """분류 번호. 없는 분류면 None."""
+        return self._codes.get(category)
+
+    def rows(self, category):
+        """분류에 속한 카탈로그 행 번호 배열 (카탈로그 순서)."""
+        i = self._codes.get(category)
+        if i is None:
+            return self.order[:0]
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def names(self, category):
+        """분류에 속한 중복 없는 식품명 목록 (카탈로그 순서)."""
+        i = self._codes.get(category)
+        if i is None:
+            return []
+        names = self._names.get(i)
+        if names is None:
+            rows = self.name_rows[self.name_offsets[i]:self.name_offsets[i + 1]]
+            names = self._names[i] = list(self._source_names.take(rows))
+        return names
+
+    def name_count(self, category):
+        """분류에 속한 중복 없는 식품명 수."""
+        i = self._codes.get(category)
+        return 0 if i is None else int(self.name_offsets[i + 1] - self.name_offsets[i])
+
+    def summary(self, category, columns=SUMMARY_COLUMNS):
+        """분류의 행 수, 식품명 수와 영양소별 평균/최솟값/최댓값. 없는 분류면 None."""
+        i = self._codes.get(category)
+        if i is None:
+            return None
+        result = {"category": category, "count": int(self.counts[i]), "names": self.name_count(category)}
+        for col in columns:
+            j = self.columns.index(col)
+            # float32 값은 가장 짧은 10진 표현으로 되돌립니다. (FoodRecord 와 같은 방식)
+            result[col] = {
+                "mean": float(self.means[i, j]),
+                "min": float(str(self.mins[i, j])),
+                "max": float(str(self.maxs[i, j])),
+            }
+        return result
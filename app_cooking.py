@@ -0,0 +1,171 @@
+"""조리상태별 영양 정보 조회 (data/완.csv).
+
+완.csv 는 같은 식품을 조리상태별 행으로 나눠 둡니다. (예: 귀리/생것, 귀리/밥)
+식품명 → 조리상태 → 영양소 값의 2단계 사전으로 색인하여, "귀리 밥" 같은 질의나
+식품명 + 조리상태를 사전 조회 몇 번으로 찾습니다.
+
+요청한 조리상태가 없으면 가장 가까운 상태로 대체합니다.
+    1. 같은 표현 (생 → 생것, 삶은 → 삶은것 등 STATE_ALIASES)
+    2. 한쪽이 다른 쪽을 포함하는 상태 (말린것 → 삶아서 말린것)
+    3. 같은 조리 방식 묶음 (STATE_GROUPS, 예: 삶은것 ↔ 데친것 ↔ 찐것)
+    4. 기본 상태 (생것, 구분 없음 "-", 파일의 첫 상태 순)
+"""
+import csv
+
+# 조리상태 구분이 없는 행의 표기
+NO_STATE = "-"
+# 조리상태를 지정하지 않았거나 대체할 상태가 없을 때 우선 사용하는 상태
+DEFAULT_STATES = ["생것", NO_STATE]
+
+# 흔한 표현 → 완.csv 의 조리상태 표기
+STATE_ALIASES = {
+    "생": "생것", "날것": "생것", "날": "생것",
+    "익힌것": "삶은것", "익힌": "삶은것", "삶은": "삶은것", "삶음": "삶은것",
+    "데친": "데친것", "데침": "데친것",
+    "찐": "찐것", "찜": "찐것",
+    "구운": "구운것", "구이": "구운것",
+    "볶은": "볶은것", "볶음": "볶은것",
+    "튀긴": "튀긴것", "튀김": "튀긴것",
+    "말린": "말린것", "건조": "말린것",
+}
+
+# 영양 성분 변화가 비슷한 조리 방식 묶음 (앞쪽일수록 우선)
+STATE_GROUPS = [
+    ["삶은것", "데친것", "찐것", "밥", "죽"],
+    ["구운것", "볶은것", "튀긴것", "훈제"],
+    ["말린것", "반건조", "동결건조", "가루", "삶아서 말린것", "조미하여 말린것"],
+    ["통조림", "캔", "레토르트", "냉동"],
+    ["염장", "염절임", "젓갈", "양념젓갈"],
+]
+_STATE_GROUP = {state: group for group in STATE_GROUPS for state in group}
+
+
+def normalize_state(state):
+    """조리상태 표현을 완.csv 표기로 맞춥니다. (공백 정리, 별칭 변환)"""
+    state = " ".join(state.split())
+    return STATE_ALIASES.get(state, state)
+
+
+class CookedFood:
+    """조리상태별 영양 정보 한 건 (100g 기준).
+
+    FoodRecord 처럼 영양소 컬럼명으로 인덱싱할 수 있어 scale_nutrients 에 그대로
+    넘길 수 있습니다. 완.csv 에 없는 영양소(나트륨)는 포함되지 않습니다.
+    """
+
+    __slots__ = ("name", "state", "requested_state", "nutrients")
+
+    def __init__(self, name, state, requested_state, nutrients):
+        self.name = name
+        self.state = state
+        self.requested_state = requested_state
+        self.nutrients = nutrients  # {영양소 컬럼: float}
+
+    @property
+    def exact(self):
+        """요청한 조리상태를 그대로 찾았는지 (지정하지 않았으면 True)."""
+        return self.requested_state is None or self.requested_state == self.state
+
+    @property
+    def label(self):
+        return self.name if self.state == NO_STATE else f"{self.name} ({self.state})"
+
+    def __getitem__(self, column):
+        return self.nutrients[column]
+
+    def __contains__(self, column):
+        return column in self.nutrients
+
+    def __repr__(self):
+        return f"CookedFood({self.name!r}, {self.state!r})"
+
+
+class CookingIndex:
+    """식품명 → 조리상태 → 영양소 값 색인."""
+
+    def __init__(self, rows, columns):
+        self.columns = columns
+        self._foods = {}
+        for name, state, values in rows:
+            self._foods.setdefault(name, {})[state] = values
+
+    @classmethod
+    def from_csv(cls, path):
+        from app_nutrition import NUTRIENT_COLUMNS
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            columns = [col for col in NUTRIENT_COLUMNS if col in header]
+            positions = [header.index(col) for col in columns]
+            name_pos, state_pos = header.index("식품명"), header.index("조리상태")
+            rows = [
+                (" ".join(row[name_pos].split()), " ".join(row[state_pos].split()) or NO_STATE,
+                 tuple(float(row[pos] or 0) for pos in positions))
+                for row in reader if row
+            ]
+        return cls(rows, columns)
+
+    def __len__(self):
+        return len(self._foods)
+
+    def __contains__(self, name):
+        return name in self._foods
+
+    def states(self, name):
+        """식품의 조리상태 목록 (파일 순서). 없는 식품이면 빈 목록."""
+        return list(self._foods.get(name, ()))
+
+    def nearest_state(self, name, state=None):
+        """식품에 있는 조리상태 중 state 에 가장 가까운 것을 고릅니다. 식품이 없으면 None."""
+        states = self._foods.get(name)
+        if not states:
+            return None
+        if state:
+            state = normalize_state(state)
+            if state in states:
+                return state
+            if state + "것" in states:
+                return state + "것"
+            for candidate in states:
+                if state in candidate or candidate in state:
+                    return candidate
+            for candidate in _STATE_GROUP.get(state, ()):
+                if candidate in states:
+                    return candidate
+        for candidate in DEFAULT_STATES:
+            if candidate in states:
+                return candidate
+        return next(iter(states))
+
+    def get(self, name, state=None):
+        """식품명 + 조리상태로 찾습니다. 상태가 없으면 가장 가까운 상태, 식품이 없으면 None."""
+        name = " ".join(name.split())
+        resolved = self.nearest_state(name, state)
+        if resolved is None:
+            return None
+        values = self._foods[name][resolved]
+        requested = normalize_state(state) if state else None
+        return CookedFood(name, resolved, requested, dict(zip(self.columns, values)))
+
+    def resolve(self, query, state=None):
+        """"귀리 밥", "귀리(밥)" 같은 질의를 식품명과 조리상태로 나눠 찾습니다.
+
+        식품명에도 공백이 있을 수 있으므로(메밀 국수) 가장 긴 식품명부터 시도합니다.
+        state 를 따로 주면 질의 전체를 식품명으로 봅니다.
+        """
+        tokens = query.replace("(", " ").replace(")", " ").split()
+        if not tokens:
+            return None
+        if state is not None:
+            return self.get(" ".join(tokens), state)
+        for split in range(len(tokens), 0, -1):
+            name = " ".join(tokens[:split])
+            if name in self._foods:
+                return self.get(name, " ".join(tokens[split:]) or None)
+        return None
+
+
+def find_cooked_food(query, state=None):
+    """조리상태를 반영한 100g 기준 영양 정보(CookedFood)를 찾습니다. 없으면 None."""
+    from app_resources import get_cooking_index
+    return get_cooking_index().resolve(query, state)
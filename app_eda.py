@@ -1,12 +1,74 @@
+import json
+import threading
+from collections import OrderedDict
+
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from app_filter import RANGE_INPUTS, filter_foods
+from app_metrics import inc, timed
+from app_rank import recommend_foods
+from app_resources import find_food_record, get_category_index, get_food_names
+from app_nutrition import DAILY_LIMITS, limit_color, limit_share, macro_feedback, scale_nutrients
+from app_user_info import get_user_data
+
+# 분류 선택 목록의 첫 항목 (분류 구분 없이 전체 음식)
+ALL_CATEGORIES = "전체"
+
+# 영양소 조건 검색의 정렬 기준과 표시 개수 (입력 항목은 app_filter.RANGE_INPUTS)
+FILTER_SORTS = ["단백질 밀도", "단백질(g)", "에너지(kcal)", "나트륨(mg)", "당류(g)"]
+FILTER_RESULT_LIMIT = 100
+# BMI 정보가 있을 때 보여주는 맞춤 추천 개수
+RECOMMENDATION_COUNT = 10
+
+# 도넛 차트 figure JSON 캐시 (식품코드 → JSON, 모든 세션 공유)
+# 비율은 음식에만 의존하고 섭취량과 무관하므로 값과 제목만 바꿔서 재사용합니다.
+PIE_CACHE_MAX_BYTES = 2 * 1024 * 1024
+_pie_specs = OrderedDict()
+_pie_bytes = 0
+_pie_lock = threading.Lock()
+
+
+def get_pie_spec(food_id, carb, protein, fat):
+    """음식별 영양소 비율 도넛 차트의 figure JSON 을 반환합니다.
+
+    최근에 사용한 순서(LRU)로 유지하며, 전체 크기가 PIE_CACHE_MAX_BYTES 를
+    넘으면 가장 오래된 항목부터 제거합니다.
+    """
+    global _pie_bytes
+    with _pie_lock:
+        spec = _pie_specs.get(food_id)
+        if spec is not None:
+            _pie_specs.move_to_end(food_id)
+            inc("pie_cache_hits")
+            return spec
+    inc("pie_cache_misses")
 
+    nutrients = ['탄수화물', '단백질', '지방']
+    colors = ['#2ECC71', '#3498DB', '#E74C3C']
+    with timed("plotly_figure", chart="nutrient_pie"):
+        fig = px.pie(
+            names=nutrients,
+            values=[carb, protein, fat],
+            color=nutrients,
+            color_discrete_sequence=colors,
+            hole=0.4,
+        )
+        fig.update_traces(textinfo='percent+label', pull=[0.05, 0.05, 0.05])
+        fig.update_layout(legend_title="영양소", margin=dict(t=50, b=20, l=0, r=0))
+        spec = fig.to_json()
+
+    with _pie_lock:
+        if food_id not in _pie_specs:
+            _pie_specs[food_id] = spec
+            _pie_bytes += len(spec)
+            while _pie_bytes > PIE_CACHE_MAX_BYTES and len(_pie_specs) > 1:
+                _, old = _pie_specs.popitem(last=False)
+                _pie_bytes -= len(old)
+    return spec
 
-def run_eda():
-    df = pd.read_csv('./food1.csv')
 
+def run_eda():
     st.markdown("""
         <div style="text-align: center; padding: 2rem 0;">
             <h1 style="color: var(--primary-color);">음식 영양 정보</h1>
@@ -17,26 +79,62 @@ def run_eda():
     """, unsafe_allow_html=True)
     st.caption("※ 모든 수치는 100g 또는 100ml 기준입니다. 섭취량(g/ml)을 입력하면 자동으로 계산됩니다.")
 
-    # 음식 선택 + 섭취량 입력
+    # 분류(식품명 접두어)로 목록 좁히기 - 분류 색인은 카탈로그 로드 시 한 번만 만듭니다.
+    categories = get_category_index()
+    category = st.selectbox(
+        "분류", [ALL_CATEGORIES] + categories.categories,
+        format_func=lambda c: c if c == ALL_CATEGORIES else f"{c} ({categories.name_count(c)})",
+    )
+    if category == ALL_CATEGORIES:
+        options = get_food_names()
+    else:
+        options = categories.names(category)
+        show_category_summary(categories.summary(category))
+
+    # 음식 선택 (음식이 바뀔 때만 페이지 전체가 다시 실행됩니다)
+    choice = st.selectbox("음식을 선택하세요", options)
+    # 카탈로그는 프로세스 당 한 번만 읽고, 식품명 색인으로 바로 찾습니다.
+    info = find_food_record(choice)
+
+    show_nutrition(choice, info)
+    show_filter_panel()
+    show_recommendations()
+
+
+def show_category_summary(summary):
+    """선택한 분류의 식품 수와 열량/나트륨 평균·범위를 한 줄로 보여줍니다. (100g 기준)"""
+    kcal, sodium = summary["에너지(kcal)"], summary["나트륨(mg)"]
+    st.caption(
+        f"📂 {summary['category']}: 식품 {summary['names']}종 · "
+        f"열량 평균 {kcal['mean']:.0f} kcal ({kcal['min']:g}~{kcal['max']:g}) · "
+        f"나트륨 평균 {sodium['mean']:.0f} mg ({sodium['min']:g}~{sodium['max']:g})"
+    )
+
+
+@st.fragment
+@timed("fragment_run", fragment="eda_nutrition")
+def show_nutrition(choice, info):
+    """섭취량에 따라 달라지는 영역입니다.
+
+    fragment 로 분리되어 있어 섭취량을 바꾸면 CSV 로드, 음식 선택 목록 등은
+    다시 실행/전송되지 않고 이 함수만 다시 실행됩니다.
+    """
+    # 섭취량 입력 + 음식명 표시
     col1, col2 = st.columns([3, 1])
-    with col1:
-        choice = st.selectbox("음식을 선택하세요", df["식품명"].unique())
     with col2:
         user_amount = st.number_input("섭취량 (g/ml)", min_value=1, max_value=1000, value=100, step=10)
 
-    info = df[df["식품명"] == choice].iloc[0]
-    ratio = user_amount / 100
-
     # 🔹 섭취량에 따른 영양값 계산
-    adj_energy = info['에너지(kcal)'] * ratio
-    adj_carb = info['탄수화물(g)'] * ratio
-    adj_protein = info['단백질(g)'] * ratio
-    adj_fat = info['지방(g)'] * ratio
-    adj_sodium = info['나트륨(mg)'] * ratio if '나트륨(mg)' in info else None
-    adj_sugar = info['당류(g)'] * ratio if '당류(g)' in info else None
+    scaled = scale_nutrients(info, user_amount)
+    adj_energy = scaled['에너지(kcal)']
+    adj_carb = scaled['탄수화물(g)']
+    adj_protein = scaled['단백질(g)']
+    adj_fat = scaled['지방(g)']
+    adj_sodium = scaled['나트륨(mg)']
+    adj_sugar = scaled['당류(g)']
 
     # 음식명 + 섭취량 표시
-    st.markdown(f"## 🍽️ {choice} ({user_amount:.0f}g 기준)")
+    col1.markdown(f"## 🍽️ {choice} ({user_amount:.0f}g 기준)")
 
     # 🔹 4분할 카드 형태로 핵심 정보 표시
     col1, col2, col3, col4 = st.columns(4)
@@ -49,76 +147,69 @@ def run_eda():
     if adj_sodium is not None or adj_sugar is not None:
         st.markdown("### 🧂 나트륨 · 당류 섭취량")
 
-        rec_sodium = 2000  # 하루 권장 나트륨 (mg)
-        rec_sugar = 50     # 하루 권장 당류 (g)
-
-        sodium_ratio = (adj_sodium / rec_sodium * 100) if adj_sodium else 0
-        sugar_ratio = (adj_sugar / rec_sugar * 100) if adj_sugar else 0
+        # 하루 권장 나트륨 2000mg, 당류 50g 대비 비율
+        sodium_ratio = limit_share(adj_sodium, DAILY_LIMITS["나트륨"])
+        sugar_ratio = limit_share(adj_sugar, DAILY_LIMITS["당류"])
 
         col1, col2 = st.columns(2)
         if adj_sodium is not None:
-            color = "🟢" if sodium_ratio < 30 else "🟠" if sodium_ratio < 70 else "🔴"
-            col1.write(f"**나트륨:** {adj_sodium:.0f} mg ({sodium_ratio:.1f}% {color})")
+            col1.write(f"**나트륨:** {adj_sodium:.0f} mg ({sodium_ratio:.1f}% {limit_color(sodium_ratio)})")
         if adj_sugar is not None:
-            color = "🟢" if sugar_ratio < 30 else "🟠" if sugar_ratio < 70 else "🔴"
-            col2.write(f"**당류:** {adj_sugar:.1f} g ({sugar_ratio:.1f}% {color})")
+            col2.write(f"**당류:** {adj_sugar:.1f} g ({sugar_ratio:.1f}% {limit_color(sugar_ratio)})")
 
     # 🔹 도넛 그래프 (기존 그대로 유지)
     st.markdown("### 🥗 영양소 비율")
-    nutrients = ['탄수화물', '단백질', '지방']
-    values = [adj_carb, adj_protein, adj_fat]
-    colors = ['#2ECC71', '#3498DB', '#E74C3C']
-
-    fig = px.pie(
-        names=nutrients,
-        values=values,
-        color=nutrients,
-        color_discrete_sequence=colors,
-        hole=0.4,
-        title=f"{choice}의 영양 비율 ({user_amount:.0f}g 기준)"
-    )
-    fig.update_traces(textinfo='percent+label', pull=[0.05, 0.05, 0.05])
-    fig.update_layout(legend_title="영양소", margin=dict(t=50, b=20, l=0, r=0))
+    spec = get_pie_spec(info['식품코드'], info['탄수화물(g)'], info['단백질(g)'], info['지방(g)'])
+    fig = json.loads(spec)
+    # 캐시된 figure 는 100g 기준 값이므로, 마우스를 올렸을 때 보이는 값이 섭취량 기준이 되도록 바꿉니다.
+    fig["data"][0]["values"] = [float(adj_carb), float(adj_protein), float(adj_fat)]
+    fig["layout"]["title"] = {"text": f"{choice}의 영양 비율 ({user_amount:.0f}g 기준)"}
     st.plotly_chart(fig, use_container_width=True)
 
     # 🔹 자동 피드백
     st.markdown("### 💬 식단 피드백")
 
-    carb_ratio = adj_carb * 4 / adj_energy * 100 if adj_energy > 0 else 0
-    protein_ratio = adj_protein * 4 / adj_energy * 100 if adj_energy > 0 else 0
-    fat_ratio = adj_fat * 9 / adj_energy * 100 if adj_energy > 0 else 0
-
-    feedback = []
-
-    # 탄수화물 비율 피드백
-    if carb_ratio > 60:
-        feedback.append("🍚 탄수화물 비중이 높아요. 밥이나 빵류 섭취를 줄여보세요.")
-    elif carb_ratio < 40:
-        feedback.append("🍞 탄수화물 비중이 낮아요. 에너지를 충분히 섭취하세요.")
-    else:
-        feedback.append("✅ 탄수화물 비율이 적정합니다.")
-
-    # 단백질 피드백
-    if protein_ratio < 15:
-        feedback.append("💪 단백질 섭취가 적습니다. 달걀, 닭가슴살, 두부를 추가해보세요.")
-    elif protein_ratio > 25:
-        feedback.append("🥩 단백질이 많아요. 탄수화물과의 균형을 확인해보세요.")
-    else:
-        feedback.append("✅ 단백질 섭취가 적당합니다.")
-
-    # 지방 피드백
-    if fat_ratio > 30:
-        feedback.append("🍟 지방 섭취가 높아요. 튀김이나 가공식품을 줄이세요.")
-    elif fat_ratio < 10:
-        feedback.append("🥑 지방이 적어요. 견과류나 올리브유로 보충해보세요.")
-    else:
-        feedback.append("✅ 지방 섭취도 적정합니다.")
-
-    # 나트륨, 당류 피드백
-    if adj_sodium and adj_sodium > 1500:
-        feedback.append("⚠️ 나트륨이 높아요. 짠 음식 섭취를 줄이세요.")
-    if adj_sugar and adj_sugar > 30:
-        feedback.append("⚠️ 당류가 많아요. 단 음료나 디저트는 자제하세요.")
+    feedback = macro_feedback(scaled)
 
     for fb in feedback:
         st.write(fb)
+
+
+@st.fragment
+@timed("fragment_run", fragment="eda_filter")
+def show_filter_panel():
+    """영양소 범위 조건으로 음식을 찾는 패널입니다.
+
+    조건은 폼으로 한 번에 제출하며, fragment 라서 검색해도 이 영역만 다시 실행됩니다.
+    검색은 app_filter 의 컬럼별 정렬 색인을 사용합니다.
+    """
+    with st.expander("🔎 영양소 조건으로 음식 찾기"):
+        with st.form("nutrient_filter"):
+            conditions = []
+            for col, (label, column, op, step) in zip(st.columns(len(RANGE_INPUTS)), RANGE_INPUTS):
+                value = col.number_input(label, min_value=0.0, value=None, step=step, placeholder="제한 없음")
+                if value is not None:
+                    conditions.append((column, op, value))
+            sort_col, order_col = st.columns([3, 1])
+            sort = sort_col.selectbox("정렬 기준", FILTER_SORTS)
+            descending = order_col.radio("순서", ["높은 순", "낮은 순"], horizontal=True) == "높은 순"
+            st.form_submit_button("검색")
+
+        if not conditions:
+            st.caption("조건을 하나 이상 입력하고 검색을 누르세요. (100g/100ml 기준, 단백질 밀도 = 100kcal 당 단백질 g)")
+            return
+        frame, total = filter_foods(conditions, sort=sort, descending=descending, limit=FILTER_RESULT_LIMIT)
+        st.caption(f"조건에 맞는 음식 {total:,}개 중 {len(frame)}개")
+        st.dataframe(frame.drop(columns="식품코드"), hide_index=True, use_container_width=True)
+
+
+def show_recommendations():
+    """BMI 계산을 마친 사용자에게 카탈로그 점수 상위 음식(app_rank)을 보여줍니다."""
+    user_data = get_user_data()
+    if user_data['bmi'] is None:
+        return
+    with st.expander("👤 나에게 맞는 음식 추천"):
+        results = recommend_foods(user_data['height'], user_data['weight'], user_data['age'], k=RECOMMENDATION_COUNT)
+        st.caption("BMI 목표 대비 탄단지 비율, 나트륨·당류, 열량 밀도로 매긴 점수 순입니다. (100g 기준)")
+        for rank, result in enumerate(results, start=1):
+            st.write(f"{rank}. **{result['name']}** — {', '.join(result['reasons'])}")
@@ -0,0 +1,130 @@
+"""Gemini 를 쓸 수 없을 때의 로컬 식단 추천.
+
+회로 차단기(app_breaker)가 열려 있으면 get_ai_diet_recommendation 은 Gemini 를 기다리지 않고
+이 모듈의 결과를 바로 돌려줍니다.
+
+    1. 최근 Gemini 가 만든 식단 중 같은 나이대/BMI 상태/피해야 할 음식이고 BMI 가 가장 가까운
+       구간(BMI_BUCKET 단위)의 식단 (PLAN_CACHE_SIZE 개까지 보관)
+    2. 없으면 카탈로그 점수(app_rank) 상위 음식으로 만든 식단
+
+두 경우 모두 Gemini 응답과 같은 마크다운 형식(아침/점심/저녁, 구성 이유, 주의사항)입니다.
+"""
+import bisect
+import threading
+from collections import OrderedDict
+
+from app_nutrition import BMI_AGE_BREAKS, BMI_STATUSES, classify_bmi, cohort_targets
+
+# 보관한 식단을 찾을 때의 BMI 구간 폭과 허용하는 최대 구간 차이
+BMI_BUCKET = 1.0
+MAX_BUCKET_DISTANCE = 2
+PLAN_CACHE_SIZE = 256
+# 카탈로그 식단: 끼니별 음식 수와 1회 제공량 범위 (g)
+MEALS = ["🌅 아침", "🌞 점심", "🌙 저녁"]
+DISHES_PER_MEAL = 2
+PORTION_RANGE = (50, 300)
+# 음료/나물처럼 한 끼 음식이 되기 어려운 저열량 식품은 제외합니다. (100g 당 kcal)
+MIN_DISH_KCAL = 60
+# BMI 로 키/몸무게를 되돌릴 때 쓰는 기준 키 (탄단지 목표 비율은 키와 무관합니다)
+REFERENCE_HEIGHT = 170
+FALLBACK_NOTICE = "> ⚠️ AI 식단 서비스가 일시적으로 응답하지 않아 {source} 식단을 보여드립니다. 잠시 후 다시 시도해 주세요.\n\n"
+
+_plans = OrderedDict()  # (나이대, 상태, 피해야 할 음식) → {BMI 구간: 식단}
+_plans_lock = threading.Lock()
+
+
+def _plan_key(bmi, age, avoid_foods):
+    avoid = tuple(sorted({" ".join(str(food).split()) for food in avoid_foods} - {""}))
+    return bisect.bisect_right(BMI_AGE_BREAKS, age), classify_bmi(bmi, age), avoid
+
+
+def remember_plan(bmi, age, avoid_foods, text):
+    """Gemini 가 만든 식단을 BMI 구간별로 보관합니다."""
+    key = _plan_key(bmi, age, avoid_foods)
+    with _plans_lock:
+        buckets = _plans.pop(key, {})
+        buckets[round(bmi / BMI_BUCKET)] = text
+        _plans[key] = buckets
+        if len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+
+
+def cached_plan(bmi, age, avoid_foods):
+    """같은 나이대/상태/피해야 할 음식이고 BMI 구간이 가장 가까운 보관 식단. 없으면 None."""
+    key = _plan_key(bmi, age, avoid_foods)
+    bucket = round(bmi / BMI_BUCKET)
+    with _plans_lock:
+        buckets = _plans.get(key)
+        if not buckets:
+            return None
+        nearest = min(buckets, key=lambda b: abs(b - bucket))
+        if abs(nearest - bucket) > MAX_BUCKET_DISTANCE:
+            return None
+        return buckets[nearest]
+
+
+def catalog_plan(bmi, age, preferences=(), avoid_foods=()):
+    """카탈로그 점수 상위 음식으로 아침/점심/저녁 식단을 만듭니다. (Gemini 응답과 같은 형식)"""
+    from app_category import category_of
+    from app_rank import recommend_foods
+    from app_resources import find_food_record
+
+    height = REFERENCE_HEIGHT
+    weight = bmi * (height / 100) ** 2
+    daily_kcal = float(cohort_targets([height], [weight], [age])["에너지(kcal)"][0])
+    meal_kcal = daily_kcal / len(MEALS)
+    dish_kcal = meal_kcal / DISHES_PER_MEAL
+
+    # 같은 분류(국밥, 김밥 ...)가 겹치지 않도록 점수 순으로 고릅니다.
+    needed = len(MEALS) * DISHES_PER_MEAL
+    dishes, seen = [], set()
+    for result in recommend_foods(height, weight, age, k=needed * 10,
+                                  preferences=preferences, avoid_foods=avoid_foods):
+        category = category_of(result["name"])
+        if category in seen:
+            continue
+        kcal_100g = float(find_food_record(result["name"])["에너지(kcal)"])
+        if kcal_100g < MIN_DISH_KCAL:
+            continue
+        seen.add(category)
+        dishes.append((result, kcal_100g))
+        if len(dishes) == needed:
+            break
+
+    sections = []
+    for i, meal in enumerate(MEALS):
+        meal_dishes = dishes[i * DISHES_PER_MEAL:(i + 1) * DISHES_PER_MEAL]
+        if not meal_dishes:
+            break
+        items, total = [], 0.0
+        for dish, kcal_100g in meal_dishes:
+            grams = min(max(dish_kcal / kcal_100g * 100, PORTION_RANGE[0]), PORTION_RANGE[1])
+            grams = round(grams / 10) * 10
+            total += kcal_100g * grams / 100
+            items.append(f"{dish['name']} {grams}g")
+        reasons = ", ".join(dict.fromkeys(reason for dish, _ in meal_dishes for reason in dish["reasons"][1:]))
+        sections.append(
+            f"### {meal}\n- 추천 식단: {', '.join(items)}\n- 예상 칼로리: {total:.0f}kcal\n"
+            f"- 추천 이유: {reasons or '탄단지 비율이 목표에 가깝습니다.'}\n"
+        )
+    if not sections:
+        return "조건에 맞는 음식을 찾지 못했습니다. 피해야 할 음식을 줄여 다시 시도해 주세요."
+
+    sections.append(
+        "### 💡 전체적인 식단 구성 이유:\n"
+        f"BMI {bmi:.1f} ({BMI_STATUSES[classify_bmi(bmi, age)]}) 기준 하루 약 {daily_kcal:.0f}kcal 목표에 맞춰, 탄수화물·단백질·지방 "
+        "열량 비율이 목표에 가깝고 나트륨·당류가 낮은 음식을 식품 데이터에서 골랐습니다. (100g 영양값 기준)\n"
+    )
+    sections.append(
+        "### ⚠️ 주의사항:\n"
+        "식품 데이터만으로 계산한 식단이므로 조리법과 실제 제공량에 따라 열량이 달라질 수 있습니다.\n"
+    )
+    return "\n".join(sections)
+
+
+def fallback_diet_plan(bmi, age, preferences=(), avoid_foods=()):
+    """보관한 식단 또는 카탈로그 식단을 안내 문구와 함께 반환합니다."""
+    plan = cached_plan(bmi, age, avoid_foods)
+    if plan is not None:
+        return FALLBACK_NOTICE.format(source="비슷한 조건으로 최근 생성된") + plan
+    return FALLBACK_NOTICE.format(source="식품 데이터 기반") + catalog_plan(bmi, age, preferences, avoid_foods)
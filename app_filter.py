@@ -0,0 +1,260 @@
+"""영양소 범위/다중 조건 검색.
+
+    "kcal < 200 and protein >= 15 and sodium < 300", 단백질 밀도 높은 순
+
+카탈로그를 불러올 때 영양소 컬럼마다 값 순서(argsort)를 한 번 만들어 두면, 조건 하나는
+searchsorted 로 정렬 순서의 연속 구간이 됩니다. 조건이 여러 개면 가장 좁은 구간의 행만
+후보로 꺼낸 뒤 나머지 조건을 NumPy 마스크로 확인하므로 전체 행을 훑지 않습니다.
+
+공유 카탈로그(app_shared_catalog)를 쓰는 경우 정렬 색인도 함께 발행되어 워커는 매핑만 합니다.
+"""
+import re
+
+import numpy as np
+
+# 파생 컬럼: 이름 → (분자 컬럼, 분모 컬럼, 배율). 단백질 밀도 = 100kcal 당 단백질(g)
+DERIVED_COLUMNS = {"단백질 밀도": ("단백질(g)", "에너지(kcal)", 100.0)}
+
+# 조건식에서 쓸 수 있는 컬럼 별칭 (대소문자 무시)
+COLUMN_ALIASES = {
+    "kcal": "에너지(kcal)", "energy": "에너지(kcal)", "열량": "에너지(kcal)", "에너지": "에너지(kcal)",
+    "칼로리": "에너지(kcal)",
+    "carb": "탄수화물(g)", "carbs": "탄수화물(g)", "탄수화물": "탄수화물(g)",
+    "protein": "단백질(g)", "단백질": "단백질(g)",
+    "fat": "지방(g)", "지방": "지방(g)",
+    "sugar": "당류(g)", "당류": "당류(g)", "당": "당류(g)",
+    "sodium": "나트륨(mg)", "나트륨": "나트륨(mg)",
+    "protein_density": "단백질 밀도", "단백질밀도": "단백질 밀도",
+}
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "=": np.equal,
+}
+_OPERATOR_ALIASES = {"≤": "<=", "≥": ">=", "==": "="}
+
+# 화면(run_eda 조건 검색, 식품 목록)의 범위 입력 항목: (라벨, 컬럼, 연산자, 입력 단계)
+RANGE_INPUTS = [
+    ("열량 최대 (kcal)", "에너지(kcal)", "<=", 50.0),
+    ("단백질 최소 (g)", "단백질(g)", ">=", 1.0),
+    ("나트륨 최대 (mg)", "나트륨(mg)", "<=", 50.0),
+    ("당류 최대 (g)", "당류(g)", "<=", 1.0),
+]
+
+# 값 뒤에는 단위를 붙일 수 있으며 컬럼 단위와 같아야 합니다. (예: sodium < 300mg, protein ≥ 15 g)
+_CONDITION_RE = re.compile(
+    r"^\s*(.+?)\s*(<=|>=|==|≤|≥|<|>|=)\s*([-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zA-Z]+)?\s*$"
+)
+_UNIT_RE = re.compile(r"\(([^()]+)\)$")
+_SPLIT_RE = re.compile(r"\s+(?:and|AND|그리고)\s+|\s*[,&]\s*")
+
+
+def resolve_column(name, columns):
+    """컬럼명 또는 별칭을 검색 가능한 컬럼명으로 바꿉니다. 없으면 ValueError."""
+    name = name.strip()
+    if name in columns:
+        return name
+    column = COLUMN_ALIASES.get(name.lower()) or COLUMN_ALIASES.get(name.replace(" ", ""))
+    if column is None or column not in columns:
+        raise ValueError(f"알 수 없는 영양소입니다: '{name}' (사용 가능: {', '.join(columns)})")
+    return column
+
+
+def parse_conditions(text, columns):
+    """ "kcal < 200 and protein >= 15" 같은 조건식을 (컬럼, 연산자, 값) 목록으로 바꿉니다."""
+    conditions = []
+    for part in _SPLIT_RE.split(text.strip()):
+        if not part:
+            continue
+        match = _CONDITION_RE.match(part)
+        if match is None:
+            raise ValueError(f"조건 형식이 올바르지 않습니다: '{part}' (예: kcal < 200)")
+        name, op, value, unit = match.groups()
+        column = resolve_column(name, columns)
+        if unit is not None:
+            expected = column_unit(column)
+            if unit.lower() != (expected or "").lower():
+                raise ValueError(
+                    f"'{part}' 의 단위 '{unit}' 가 {column} 의 단위와 다릅니다."
+                    + (f" ({expected} 로 입력하세요)" if expected else " (단위 없이 입력하세요)")
+                )
+        conditions.append((column, _OPERATOR_ALIASES.get(op, op), float(value)))
+    return conditions
+
+
+def column_unit(column):
+    """컬럼명 괄호 안의 단위 ("나트륨(mg)" → "mg"). 파생 컬럼처럼 단위가 없으면 None."""
+    match = _UNIT_RE.search(column)
+    return match.group(1) if match else None
+
+
+class NutrientFilter:
+    """영양소 컬럼별 정렬 색인으로 범위 조건을 평가합니다."""
+
+    # 발행(app_shared_catalog)할 때 파일로 저장하고 워커가 메모리 매핑해 쓰는 배열
+    STATE_ARRAYS = ("matrix", "_order", "_sorted", "_valid", "_order_desc")
+
+    def __init__(self, matrix, columns):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        derived = []
+        for numerator, denominator, scale in DERIVED_COLUMNS.values():
+            num, den = matrix[:, columns.index(numerator)], matrix[:, columns.index(denominator)]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                derived.append(np.where(den > 0, num * scale / den, np.nan).astype(np.float32))
+        self._setup(list(columns) + list(DERIVED_COLUMNS))
+        self.matrix = np.column_stack([matrix] + derived) if derived else matrix
+
+        # 컬럼별 값 순서와 정렬된 값 (NaN 은 끝으로 가며 검색 구간에서 제외)
+        self._order = np.argsort(self.matrix, axis=0, kind="stable").astype(np.int32)
+        self._sorted = np.take_along_axis(self.matrix, self._order, axis=0)
+        self._valid = (~np.isnan(self.matrix)).sum(axis=0)
+        # 내림차순 순서 (NaN 은 여전히 끝). 목록 화면의 페이지를 복사 없이 잘라 쓰기 위해 둡니다.
+        self._order_desc = np.empty_like(self._order)
+        for j, valid in enumerate(self._valid):
+            self._order_desc[:valid, j] = self._order[valid - 1::-1, j] if valid else []
+            self._order_desc[valid:, j] = self._order[valid:, j]
+
+    def _setup(self, columns):
+        self.columns = columns
+        self._col = {col: j for j, col in enumerate(self.columns)}
+
+    def state(self):
+        """발행용 (JSON 메타데이터, 배열 dict)."""
+        return {"columns": self.columns}, {name: getattr(self, name) for name in self.STATE_ARRAYS}
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        """state() 로 저장한 값(메모리 매핑 배열)으로 다시 정렬하지 않고 색인을 만듭니다."""
+        engine = cls.__new__(cls)
+        for name in cls.STATE_ARRAYS:
+            setattr(engine, name, arrays[name])
+        engine._setup(meta["columns"])
+        return engine
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def _range(self, j, op, value):
+        """조건을 만족하는 값들의 정렬 순서 구간 [lo, hi)."""
+        values = self._sorted[:self._valid[j], j]
+        value = np.float32(value)
+        if op == "<":
+            return 0, int(np.searchsorted(values, value, side="left"))
+        if op == "<=":
+            return 0, int(np.searchsorted(values, value, side="right"))
+        if op == ">":
+            return int(np.searchsorted(values, value, side="right")), len(values)
+        if op == ">=":
+            return int(np.searchsorted(values, value, side="left")), len(values)
+        return int(np.searchsorted(values, value, side="left")), int(np.searchsorted(values, value, side="right"))
+
+    def select(self, conditions):
+        """모든 조건을 만족하는 카탈로그 행 번호 배열 (카탈로그 순서)."""
+        if not conditions:
+            return np.arange(len(self.matrix), dtype=np.int32)
+        ranges = []
+        for column, op, value in conditions:
+            if op not in OPERATORS:
+                raise ValueError(f"알 수 없는 연산자입니다: '{op}'")
+            j = self._col[column]
+            lo, hi = self._range(j, op, value)
+            ranges.append((hi - lo, j, lo, hi, op, value))
+        # 가장 좁은 구간을 후보로 삼고 나머지 조건은 후보 행에서만 확인합니다.
+        ranges.sort(key=lambda r: r[0])
+        _, j, lo, hi, _, _ = ranges[0]
+        rows = self._order[lo:hi, j]
+        for _, j, _, _, op, value in ranges[1:]:
+            if not len(rows):
+                break
+            rows = rows[OPERATORS[op](self.matrix[rows, j], np.float32(value))]
+        return np.sort(rows)
+
+    def query(self, conditions, sort=None, descending=True, limit=50):
+        """조건에 맞는 행을 sort 컬럼 순으로 최대 limit 개 반환합니다. (행 번호, 전체 건수)"""
+        rows = self.select(conditions)
+        total = len(rows)
+        if sort is not None:
+            keys = self.matrix[rows, self._col[sort]]
+            # NaN(파생 컬럼의 분모 0)은 정렬 방향과 관계없이 맨 뒤로 보냅니다.
+            keys = np.where(np.isnan(keys), -np.inf if descending else np.inf, keys)
+            order = np.argsort(-keys if descending else keys, kind="stable")
+            rows = rows[order]
+        if limit is not None:
+            rows = rows[:limit]
+        return rows, total
+
+    def window(self, conditions, sort=None, descending=True, offset=0, limit=50, mask=None):
+        """조건과 mask(행별 bool 배열)를 만족하는 행을 sort 순으로 정렬했을 때 [offset, offset + limit) 구간.
+
+        미리 만든 컬럼별 정렬 순서를 그대로 쓰므로 조건이 없으면 페이지 크기만큼만,
+        조건이 있어도 벡터 연산 한 번으로 구간을 잘라냅니다. (행 번호, 전체 건수)
+        """
+        if conditions:
+            selected = np.zeros(len(self.matrix), dtype=bool)
+            selected[self.select(conditions)] = True
+            mask = selected if mask is None else mask & selected
+        if sort is None:
+            ordered = np.arange(len(self.matrix), dtype=np.int32) if mask is not None else None
+        else:
+            ordered = (self._order_desc if descending else self._order)[:, self._col[sort]]
+        if mask is None:
+            total = len(self.matrix)
+            if ordered is None:
+                return np.arange(offset, min(offset + limit, total), dtype=np.int32), total
+            return ordered[offset:offset + limit], total
+        ordered = ordered[mask[ordered]]
+        return ordered[offset:offset + limit], len(ordered)
+
+
+def _result_frame(engine, rows):
+    """행 번호의 식품코드/식품명과 영양소(파생 컬럼 포함) DataFrame."""
+    import pandas as pd
+    from app_resources import get_catalog
+
+    catalog = get_catalog()
+    # float32 값은 소수 둘째 자리로 맞춰 CSV 원본 값처럼 보이게 합니다.
+    values = np.round(engine.matrix[rows].astype(np.float64), 2)
+    frame = pd.DataFrame(values, columns=engine.columns)
+    frame.insert(0, "식품명", catalog["식품명"].array.take(rows))
+    frame.insert(0, "식품코드", catalog["식품코드"].array.take(rows))
+    return frame
+
+
+def filter_foods(conditions, sort=None, descending=True, limit=50):
+    """조건 검색 결과를 DataFrame(식품코드, 식품명, 영양소..., 단백질 밀도)과 전체 건수로 반환합니다."""
+    from app_resources import get_nutrient_filter
+
+    engine = get_nutrient_filter()
+    rows, total = engine.query(conditions, sort=sort, descending=descending, limit=limit)
+    return _result_frame(engine, rows), total
+
+
+def browse_foods(conditions=(), name_query=None, category=None, sort=None, descending=True, offset=0, limit=50,
+                 exclude=()):
+    """식품 목록 화면의 한 페이지를 DataFrame 과 전체 건수로 반환합니다.
+
+    식품명 부분 일치(name_query), 분류(category), 영양소 조건을 모두 적용하고
+    피해야 할 음식(exclude, 관련 알레르기 식품 포함)이 들어간 식품명은 뺀 뒤
+    sort 순으로 정렬하여 [offset, offset + limit) 구간만 만듭니다.
+    """
+    from app_avoid import exclusion_mask
+    from app_resources import get_catalog, get_category_index, get_nutrient_filter
+
+    engine = get_nutrient_filter()
+    mask = None
+    if name_query:
+        # Arrow 문자열 컬럼의 부분 일치는 C 구현으로 전체 행을 한 번에 검사합니다.
+        mask = get_catalog()["식품명"].str.contains(name_query, regex=False).to_numpy(dtype=bool, na_value=False)
+    if category:
+        in_category = np.zeros(len(engine), dtype=bool)
+        in_category[get_category_index().rows(category)] = True
+        mask = in_category if mask is None else mask & in_category
+    if exclude:
+        allowed = ~exclusion_mask(exclude)
+        mask = allowed if mask is None else mask & allowed
+    rows, total = engine.window(list(conditions), sort=sort, descending=descending,
+                                offset=offset, limit=limit, mask=mask)
+    return _result_frame(engine, rows), total
@@ -0,0 +1,188 @@
+"""Gemini 호출의 꼬리 지연(tail latency)을 줄이는 헤지(hedged) 요청.
+
+첫 요청이 최근 응답 시간의 상위 백분위(기본 p95) 안에 끝나지 않으면 같은 요청을 한 번
+더 보내고, 먼저 끝난 응답을 쓰며 늦은 쪽은 취소합니다. 대부분의 요청은 기준 시간 안에
+끝나므로 추가 요청은 적고, 드물게 오래 걸리는 요청만 두 번째 요청으로 구제합니다.
+
+    FOOD_AI_GEMINI_HEDGE=1                 헤지 사용 (기본: 사용 안 함, 기존처럼 요청 한 번)
+    FOOD_AI_GEMINI_HEDGE_PERCENTILE=95     두 번째 요청을 보낼 기준 백분위
+    FOOD_AI_GEMINI_HEDGE_DELAY=4           응답 시간 표본이 모이기 전 기준 시간(초)
+    FOOD_AI_GEMINI_HEDGE_BUDGET=0.1        추가 요청 상한 (요청 1건 당 0.1건, 즉 최대 10%)
+
+추가 요청 상한은 토큰 버킷입니다. 요청마다 BUDGET 만큼 토큰이 쌓이고(최대 HEDGE_BURST)
+헤지 한 번에 토큰 1 을 씁니다. Gemini 전체가 느려져 모든 요청이 기준을 넘는 경우에도
+요청 수는 (1 + BUDGET) 배를 넘지 않습니다.
+
+요청은 프로세스 당 하나인 백그라운드 이벤트 루프에서 generate_content_async 로 보냅니다.
+(Gemini 비동기 클라이언트는 처음 사용한 루프에 묶이므로 루프를 호출마다 만들지 않습니다)
+지표: gemini_hedge_requests / gemini_hedges / gemini_hedge_wins / gemini_hedge_budget_exhausted
+(source 레이블별), 사용자가 기다린 시간은 기존 gemini_request 히스토그램에 남습니다.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from app_breaker import get_gemini_breaker
+from app_metrics import inc
+
+HEDGE_ENABLED = os.environ.get("FOOD_AI_GEMINI_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.environ.get("FOOD_AI_GEMINI_HEDGE_PERCENTILE", 95))
+HEDGE_DELAY = float(os.environ.get("FOOD_AI_GEMINI_HEDGE_DELAY", 4.0))
+HEDGE_BUDGET = float(os.environ.get("FOOD_AI_GEMINI_HEDGE_BUDGET", 0.1))
+# 한꺼번에 쓸 수 있는 최대 헤지 수 (토큰 버킷 크기)
+HEDGE_BURST = 3.0
+# 기준 시간 계산에 쓰는 최근 응답 시간 표본 수와, 백분위를 쓰기 시작할 최소 표본 수
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+# 표본이 치우쳐도 기준 시간이 이 범위를 벗어나지 않도록 합니다. (초)
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 30.0
+
+
+def percentile(values, q):
+    """values 의 q 백분위 (nearest-rank)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class HedgePolicy:
+    """최근 응답 시간으로 헤지 기준을 정하고 추가 요청 예산을 관리합니다."""
+
+    def __init__(self, percentile=HEDGE_PERCENTILE, delay=HEDGE_DELAY, budget=HEDGE_BUDGET,
+                 burst=HEDGE_BURST, window=LATENCY_WINDOW, source="gemini"):
+        self.percentile = percentile
+        self.delay = delay
+        self.budget = budget
+        self.burst = burst
+        self.source = source
+        self._latencies = deque(maxlen=window)
+        self._tokens = burst
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def threshold(self):
+        """두 번째 요청을 보내기까지 기다릴 시간(초)."""
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return self.delay
+            value = percentile(self._latencies, self.percentile)
+        return min(max(value, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    def record(self, seconds):
+        """요청 한 건의 응답 시간(취소한 첫 요청은 취소할 때까지의 시간)을 표본에 더합니다."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _start_request(self):
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+        inc("gemini_hedge_requests", source=self.source)
+
+    def _take_hedge(self):
+        with self._lock:
+            if self._tokens < 1:
+                self.budget_exhausted += 1
+                allowed = False
+            else:
+                self._tokens -= 1
+                self.hedges += 1
+                allowed = True
+        inc("gemini_hedges" if allowed else "gemini_hedge_budget_exhausted", source=self.source)
+        return allowed
+
+    def stats(self):
+        """요청 수, 헤지 수/비율, 헤지 승리 수, 현재 기준 시간."""
+        threshold = self.threshold()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "budget_exhausted": self.budget_exhausted,
+                "threshold": threshold,
+            }
+
+    async def _attempt(self, request):
+        started = time.perf_counter()
+        result = await request()
+        self.record(time.perf_counter() - started)
+        return result
+
+    async def call(self, request):
+        """request()(코루틴을 만드는 함수)를 헤지 정책에 따라 실행하고 먼저 끝난 결과를 반환합니다.
+
+        첫 요청이 기준 시간 전에 실패하면 그대로 예외를 올립니다. 헤지한 뒤에는 한쪽이
+        실패해도 다른 쪽을 기다리고, 둘 다 실패하면 첫 요청의 예외를 올립니다.
+        """
+        self._start_request()
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._attempt(request))
+        done, _ = await asyncio.wait({primary}, timeout=self.threshold())
+        if done or not self._take_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self._attempt(request))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 동시에 끝났으면 첫 요청을 우선합니다.
+                for task in sorted(done, key=lambda t: t is not primary):
+                    if task.exception() is None:
+                        if task is hedge:
+                            with self._lock:
+                                self.hedge_wins += 1
+                            inc("gemini_hedge_wins", source=self.source)
+                        return task.result()
+            return primary.result()  # 둘 다 실패
+        finally:
+            for task in pending:
+                task.cancel()
+            if primary in pending:
+                # 취소한 첫 요청의 지연은 최소 지금까지의 시간입니다. 이 값을 빼면 느린 요청이
+                # 표본에서 사라져 기준 시간이 점점 짧아지므로 하한값으로 대신 넣습니다.
+                self.record(time.perf_counter() - started)
+
+
+@lru_cache(maxsize=None)
+def _event_loop():
+    """헤지 요청을 실행하는 프로세스 공용 이벤트 루프 (데몬 스레드)."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="food-ai-gemini-hedge", daemon=True).start()
+    return loop
+
+
+@lru_cache(maxsize=None)
+def get_hedge_policy(source):
+    """호출 위치(source)별 헤지 정책. 이미지 분석과 식단 생성은 응답 시간 분포가 달라 따로 둡니다."""
+    return HedgePolicy(source=source)
+
+
+def _hedged_generate(model, contents, source):
+    policy = get_hedge_policy(source)
+    future = asyncio.run_coroutine_threadsafe(
+        policy.call(lambda: model.generate_content_async(contents)), _event_loop()
+    )
+    return future.result()
+
+
+def generate_content(model, contents, source):
+    """model.generate_content(contents) 와 같지만 FOOD_AI_GEMINI_HEDGE=1 이면 헤지 요청을 사용합니다.
+
+    모든 호출은 Gemini 회로 차단기(app_breaker)를 거치며, 회로가 열려 있으면 호출하지 않고
+    바로 CircuitOpenError 를 올립니다.
+    """
+    breaker = get_gemini_breaker()
+    if not HEDGE_ENABLED or not hasattr(model, "generate_content_async"):
+        return breaker.call(model.generate_content, contents)
+    return breaker.call(_hedged_generate, model, contents, source)
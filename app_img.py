@@ -1,12 +1,14 @@
 import streamlit as st
-import pandas as pd
-import os
-import google.generativeai as genai
 from PIL import Image
-# GradientBoostingRegressor를 사용하도록 import
-from sklearn.ensemble import GradientBoostingRegressor 
 import re
-import joblib
+
+# 회귀 모델(joblib/sklearn)과 Gemini 클라이언트는 처음 사용할 때 로드됩니다.
+from app_breaker import CircuitOpenError
+from app_cooking import find_cooked_food
+from app_hedge import generate_content
+from app_metrics import inc, record_gemini_usage, timed
+from app_resources import get_gemini_model, get_regressor
+from app_nutrition import predict_calories
 
 # =S=======================================================================
 # 1. 환경 설정 및 헬퍼 함수
@@ -16,13 +18,8 @@ import joblib
 
 def load_model():
     """Gemini AI 모델을 로드합니다."""
-    # API 키 로딩 로직 유지
-    api_key=st.secrets["GEMINI_API_KEY"]
-    genai.configure(api_key=api_key)
-    # --- [유지] ---
-    # gemini-2.5-flash 모델 유지
-    return genai.GenerativeModel("gemini-2.5-flash") 
-    # --- [유지 끝] ---
+    # gemini-2.5-flash 모델 (프로세스 당 한 번만 생성)
+    return get_gemini_model()
 
 def extract_number(text, keyword):
     """AI 응답 텍스트에서 특정 키워드의 숫자 값을 추출합니다."""
@@ -46,12 +43,8 @@ def extract_section(text, start, end_marker=None):
     return text[start_idx:end_idx].strip()
 
 def load_regression_model():
-    base_dir = os.path.dirname(__file__)
-    model_path = os.path.join(base_dir, "food_calorie_model.pkl")     # 또는 "model.joblib"
-    if not os.path.exists(model_path):
-        raise FileNotFoundError("사전 학습된 모델 파일(food_calorie_model.pkl)이 없습니다. 먼저 py에서 모델을 학습 및 저장하세요.")
-    model = joblib.load(model_path)
-    return model
+    """칼로리 보정 회귀 모델을 로드합니다. (프로세스 당 한 번만 역직렬화)"""
+    return get_regressor()
 
 # =========================================================================
 # 2. 메인 실행 함수
@@ -155,10 +148,18 @@ def run_img():
             출력은 위 형식 그대로, 문장과 숫자만 포함된 깔끔한 텍스트로 작성하세요.
             """
             
-            ex = model.generate_content([
-                    prompt, 
-                    image
-                ])
+            try:
+                with timed("gemini_request", source="img"):
+                    ex = generate_content(model, [prompt, image], "img")
+            except CircuitOpenError:
+                # 이미지 분석은 로컬 대체 결과가 없으므로 기다리게 하지 않고 바로 안내합니다.
+                inc("gemini_fallbacks", source="img")
+                st.warning("⚠️ AI 분석 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해 주세요.")
+                return
+            except Exception:
+                inc("gemini_errors", source="img")
+                raise
+            record_gemini_usage(ex, "img")
             finish = ex.text.strip()
 
             # 4. 결과 출력
@@ -219,11 +220,26 @@ def run_img():
                     """, unsafe_allow_html=True)
                     # --- [수정 유지 끝 3] ---
 
+            # 식품성분표(data/완.csv)에 있는 음식이면 조리상태별 실측값(100g 기준)을 함께 보여줍니다.
+            cooked = find_cooked_food(user_food_name) if user_food_name else None
+            if cooked is None and food_name_text:
+                cooked = find_cooked_food(food_name_text)
+            if cooked is not None:
+                fallback_note = "" if cooked.exact else (
+                    f"<p>'{cooked.requested_state}' 상태의 값이 없어 가장 가까운 '{cooked.state}' 값을 표시합니다.</p>"
+                )
+                values = " · ".join(f"{col} {value:g}" for col, value in cooked.nutrients.items())
+                st.markdown(f"""
+                    <div class="custom-card">
+                        <h3 style="color: var(--primary-color);">📖 식품성분표 기준: {cooked.label}</h3>
+                        <p style="font-size: 1.1rem;">100g 당 {values}</p>
+                        {fallback_note}
+                    </div>
+                """, unsafe_allow_html=True)
+
             # Gradient Boosting Model을 사용한 칼로리 보정
             if all(v is not None for v in [carbo, protein, fat, sugar, sodium]):
-                new_data = pd.DataFrame([[carbo, protein, fat, sugar, sodium]], 
-                                        columns=["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"])
-                corrected_kcal = regressor.predict(new_data)[0]
+                corrected_kcal = predict_calories(regressor, carbo, protein, fat, sugar, sodium)
                 
                 # 보정된 칼로리 결과 표시
                 st.markdown(f"""
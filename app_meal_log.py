@@ -0,0 +1,188 @@
+"""사용자별 섭취 기록 저장소 (SQLite, WAL 모드).
+
+세션이 끝나도 섭취 기록이 남도록 (사용자, 날짜) 색인을 가진 로컬 SQLite 파일에
+섭취 이벤트를 저장합니다. 연결은 스레드(= Streamlit 세션 실행 스레드)마다 하나씩
+만들고, SQL 문은 상수 문자열로만 실행하여 sqlite3 의 문장 캐시(prepared statement)를
+재사용합니다.
+"""
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from app_resources import BASE_DIR
+from app_nutrition import NUTRIENT_COLUMNS
+
+DB_PATH = os.environ.get("FOOD_AI_DB", os.path.join(BASE_DIR, "food_ai.db"))
+
+# NUTRIENT_COLUMNS 와 같은 순서의 SQL 컬럼명
+NUTRIENT_FIELDS = ["energy", "carb", "protein", "fat", "sugar", "sodium"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS intake_events (
+    id       INTEGER PRIMARY KEY,
+    user_id  TEXT NOT NULL,
+    day      TEXT NOT NULL,
+    eaten_at TEXT NOT NULL,
+    food     TEXT NOT NULL,
+    grams    REAL NOT NULL,
+    energy   REAL NOT NULL DEFAULT 0,
+    carb     REAL NOT NULL DEFAULT 0,
+    protein  REAL NOT NULL DEFAULT 0,
+    fat      REAL NOT NULL DEFAULT 0,
+    sugar    REAL NOT NULL DEFAULT 0,
+    sodium   REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_intake_user_day ON intake_events (user_id, day);
+"""
+
+# 사용자/날짜별 누적 합계. 이벤트가 추가/삭제될 때 트리거가 같은 트랜잭션 안에서
+# 한 행만 더하거나 빼므로(O(1)), 합계와 권장량 확인은 기록 수와 무관하게 일정한 비용입니다.
+DAILY_SCHEMA = (
+"""
+CREATE TABLE IF NOT EXISTS daily_totals (
+    user_id TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    items   INTEGER NOT NULL DEFAULT 0,
+    """ + ",\n    ".join(f"{f} REAL NOT NULL DEFAULT 0" for f in NUTRIENT_FIELDS) + """,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_intake_insert AFTER INSERT ON intake_events BEGIN
+    INSERT INTO daily_totals (user_id, day, items, """ + ", ".join(NUTRIENT_FIELDS) + """)
+    VALUES (NEW.user_id, NEW.day, 1, """ + ", ".join(f"NEW.{f}" for f in NUTRIENT_FIELDS) + """)
+    ON CONFLICT (user_id, day) DO UPDATE SET items = items + 1, """
+    + ", ".join(f"{f} = {f} + excluded.{f}" for f in NUTRIENT_FIELDS) + """;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_intake_delete AFTER DELETE ON intake_events BEGIN
+    UPDATE daily_totals SET items = items - 1, """
+    + ", ".join(f"{f} = {f} - OLD.{f}" for f in NUTRIENT_FIELDS) + """
+    WHERE user_id = OLD.user_id AND day = OLD.day;
+END;
+"""
+)
+
+# 누적 합계 테이블이 새로 생긴 기존 DB 를 위해 이벤트에서 한 번 재구성합니다.
+REBUILD_DAILY_TOTALS = (
+    "INSERT INTO daily_totals (user_id, day, items, " + ", ".join(NUTRIENT_FIELDS) + ") "
+    "SELECT user_id, day, COUNT(*), " + ", ".join(f"SUM({f})" for f in NUTRIENT_FIELDS)
+    + " FROM intake_events GROUP BY user_id, day"
+)
+
+INSERT_EVENT = (
+    "INSERT INTO intake_events (user_id, day, eaten_at, food, grams, "
+    + ", ".join(NUTRIENT_FIELDS) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+DELETE_EVENT = "DELETE FROM intake_events WHERE id = ? AND user_id = ?"
+SELECT_DAY_EVENTS = (
+    "SELECT id, eaten_at, food, grams, " + ", ".join(NUTRIENT_FIELDS)
+    + " FROM intake_events WHERE user_id = ? AND day = ? ORDER BY id"
+)
+SELECT_DAY_TOTALS = (
+    "SELECT items, " + ", ".join(NUTRIENT_FIELDS)
+    + " FROM daily_totals WHERE user_id = ? AND day = ?"
+)
+SELECT_WINDOW_TOTALS = (
+    "SELECT COUNT(*), COALESCE(SUM(items), 0), " + ", ".join(f"COALESCE(SUM({f}), 0)" for f in NUTRIENT_FIELDS)
+    + " FROM daily_totals WHERE user_id = ? AND day > ? AND day <= ? AND items > 0"
+)
+
+
+class MealLog:
+    """섭취 이벤트 저장소. 여러 세션(스레드)에서 동시에 사용할 수 있습니다."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        # SQLite 는 쓰기를 하나씩만 허용하며, 잠금 충돌 시 수 ms 단위로 잠들었다가
+        # 재시도합니다. 같은 프로세스의 쓰기는 여기서 먼저 줄을 세워 그 대기를 피합니다.
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            has_daily = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_totals'"
+            ).fetchone()
+            conn.executescript(DAILY_SCHEMA)
+            if not has_daily:
+                conn.execute(REBUILD_DAILY_TOTALS)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=64)
+            # WAL: 읽기와 쓰기가 서로를 막지 않고, NORMAL 동기화로 커밋 당 fsync 를 줄입니다.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _event_row(user_id, food, grams, nutrients, eaten_at=None):
+        eaten_at = eaten_at or datetime.now()
+        return (
+            user_id, eaten_at.date().isoformat(), eaten_at.isoformat(timespec="seconds"), food, float(grams),
+            *(float(nutrients.get(col) or 0) for col in NUTRIENT_COLUMNS),
+        )
+
+    def add_event(self, user_id, food, grams, nutrients, eaten_at=None):
+        """섭취 이벤트 하나를 기록하고 id 를 반환합니다.
+
+        nutrients 는 NUTRIENT_COLUMNS 를 키로 하는 섭취량 환산 값입니다.
+        """
+        conn = self._connect()
+        with self._write_lock, conn:
+            cur = conn.execute(INSERT_EVENT, self._event_row(user_id, food, grams, nutrients, eaten_at))
+        return cur.lastrowid
+
+    def add_events(self, user_id, events):
+        """(food, grams, nutrients[, eaten_at]) 목록을 한 트랜잭션으로 기록합니다."""
+        rows = [self._event_row(user_id, *event) for event in events]
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.executemany(INSERT_EVENT, rows)
+        return len(rows)
+
+    def remove_event(self, user_id, event_id):
+        """사용자의 섭취 이벤트를 삭제합니다. 삭제했으면 True 를 반환합니다."""
+        conn = self._connect()
+        with self._write_lock, conn:
+            cur = conn.execute(DELETE_EVENT, (event_id, user_id))
+        return cur.rowcount > 0
+
+    def day_events(self, user_id, day=None):
+        """해당 날짜(기본: 오늘)의 섭취 이벤트 목록을 dict 로 반환합니다."""
+        day = (day or date.today()).isoformat()
+        cur = self._connect().execute(SELECT_DAY_EVENTS, (user_id, day))
+        return [
+            {"id": r[0], "eaten_at": r[1], "food": r[2], "grams": r[3], **dict(zip(NUTRIENT_COLUMNS, r[4:]))}
+            for r in cur
+        ]
+
+    def day_totals(self, user_id, day=None):
+        """해당 날짜(기본: 오늘)의 영양소 합계와 이벤트 수를 반환합니다.
+
+        이벤트를 다시 더하지 않고 누적 합계 테이블의 한 행만 읽습니다.
+        """
+        day = (day or date.today()).isoformat()
+        row = self._connect().execute(SELECT_DAY_TOTALS, (user_id, day)).fetchone()
+        if row is None:
+            return {"items": 0, **dict.fromkeys(NUTRIENT_COLUMNS, 0.0)}
+        return {"items": row[0], **dict(zip(NUTRIENT_COLUMNS, row[1:]))}
+
+    def window_totals(self, user_id, days, end=None):
+        """end(기본: 오늘)까지 최근 days 일의 영양소 합계를 반환합니다.
+
+        기록이 있는 날 수(days_logged)와 그 날들의 하루 평균(daily_avg)도 함께
+        돌려줍니다. 최대 days 개의 일별 합계 행만 읽으므로 7일/30일 창 모두 일정한 비용입니다.
+        """
+        end = end or date.today()
+        start = end - timedelta(days=days)
+        row = self._connect().execute(SELECT_WINDOW_TOTALS, (user_id, start.isoformat(), end.isoformat())).fetchone()
+        days_logged, items, sums = row[0], row[1], row[2:]
+        totals = dict(zip(NUTRIENT_COLUMNS, sums))
+        return {
+            "days": days,
+            "days_logged": days_logged,
+            "items": items,
+            "totals": totals,
+            "daily_avg": {col: (v / days_logged if days_logged else 0.0) for col, v in totals.items()},
+        }
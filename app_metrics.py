@@ -0,0 +1,230 @@
+"""가벼운 계측(지연 히스토그램/카운터)과 Prometheus 텍스트 내보내기.
+
+느린 페이지가 CSV 로드, Plotly, joblib, Gemini 중 어디에서 오는지 구분하기 위해
+주요 구간을 timed() 로 감싸고 캐시 적중/오류/토큰 수를 inc() 로 셉니다.
+
+다음 환경 변수 중 하나라도 지정해야 켜지며, 꺼져 있으면 timed() 는 아무것도 하지 않는
+공유 객체를, 데코레이터는 원래 함수를 그대로 돌려주므로 비용이 거의 없습니다.
+
+    FOOD_AI_METRICS=1               수집만 (app_api 의 /metrics 로 조회)
+    FOOD_AI_METRICS_FILE=경로        Streamlit 스크립트 실행이 끝날 때마다 파일로 저장
+                                    (FOOD_AI_METRICS_FILE_INTERVAL 초에 한 번, 기본 5초)
+    FOOD_AI_METRICS_PORT=9108       로컬 HTTP 엔드포인트 (GET /metrics)
+"""
+import bisect
+import os
+import threading
+import time
+from functools import lru_cache, wraps
+
+METRICS_FILE = os.environ.get("FOOD_AI_METRICS_FILE")
+METRICS_FILE_INTERVAL = float(os.environ.get("FOOD_AI_METRICS_FILE_INTERVAL", 5))
+METRICS_PORT = os.environ.get("FOOD_AI_METRICS_PORT")
+ENABLED = bool(os.environ.get("FOOD_AI_METRICS") or METRICS_FILE or METRICS_PORT)
+
+METRIC_PREFIX = "food_ai_"
+# 지연 히스토그램 버킷 상한 (초). 메모리 조회(ms 이하)부터 Gemini 호출(수십 초)까지 포함합니다.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_histograms = {}  # (이름, 레이블) → [버킷별 개수..., +Inf 개수, 합계]
+_counters = {}    # (이름, 레이블) → 값
+_last_write = 0.0
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, seconds, **labels):
+    """지연 시간(초)을 히스토그램에 기록합니다."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    pos = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        hist[pos] += 1
+        hist[-1] += seconds
+
+
+def inc(name, value=1, **labels):
+    """카운터를 value 만큼 증가시킵니다."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class _Timer:
+    """with 문과 데코레이터로 모두 쓸 수 있는 구간 타이머."""
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        # Streamlit 의 rerun/stop 제어 예외(BaseException)는 오류로 세지 않습니다.
+        if exc_type is not None and issubclass(exc_type, Exception):
+            inc(f"{self.name}_errors", **self.labels)
+        return False
+
+    def __call__(self, fn):
+        name, labels = self.name, self.labels
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __call__(self, fn):
+        return fn
+
+
+_NOOP = _NoopTimer()
+
+
+def timed(name, **labels):
+    """구간 소요 시간을 name 히스토그램(초)에 기록합니다.
+
+        with timed("gemini_request", page="img"):
+            ...
+
+        @timed("model_load")
+        def load(): ...
+
+    구간에서 예외가 나면 name_errors 카운터도 증가합니다.
+    """
+    return _Timer(name, labels) if ENABLED else _NOOP
+
+
+def record_gemini_usage(response, source):
+    """Gemini 응답의 토큰 사용량을 카운터에 더합니다."""
+    if not ENABLED:
+        return
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, attr in (("prompt", "prompt_token_count"), ("output", "candidates_token_count")):
+        count = getattr(usage, attr, None)
+        if count:
+            inc("gemini_tokens", count, source=source, kind=kind)
+
+
+# =========================================================================
+# 내보내기
+# =========================================================================
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+def export_text():
+    """수집한 지표를 Prometheus 텍스트 형식(0.0.4)으로 반환합니다."""
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        metric = f"{METRIC_PREFIX}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+
+    for name in sorted({name for name, _ in histograms}):
+        metric = f"{METRIC_PREFIX}{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for (n, labels), hist in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, hist):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            cumulative += hist[len(LATENCY_BUCKETS)]
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {hist[-1]:.6f}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path=None, force=False):
+    """지표를 파일로 저장합니다. (node_exporter textfile collector 용)
+
+    force 가 아니면 FOOD_AI_METRICS_FILE_INTERVAL 초에 한 번만 씁니다.
+    """
+    global _last_write
+    path = path or METRICS_FILE
+    if not ENABLED or not path:
+        return
+    now = time.monotonic()
+    if not force and now - _last_write < METRICS_FILE_INTERVAL:
+        return
+    _last_write = now
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(export_text())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@lru_cache(maxsize=None)
+def start_exporter():
+    """FOOD_AI_METRICS_PORT 가 지정되어 있으면 /metrics HTTP 서버를 한 번만 띄웁니다."""
+    if not ENABLED or not METRICS_PORT:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = export_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), MetricsHandler)
+    except OSError:
+        # 같은 호스트의 다른 프로세스가 이미 포트를 사용 중인 경우
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -1,76 +1,17 @@
 import streamlit as st
-import os
-import google.generativeai as genai
 
 # app_user_info 모듈에서 필요한 함수를 임포트합니다.
 # get_bmi_criteria를 추가하여 나이별 기준을 사용할 수 있게 합니다.
 from app_user_info import get_user_data, get_bmi_criteria 
+# BMI 판정과 식단 추천 로직은 헤드리스 API 와 함께 app_nutrition 에 있습니다.
+# (제미나이 모델은 import 시점이 아니라 식단 생성 시점에 생성됩니다)
+from app_nutrition import determine_bmi_status, get_ai_diet_recommendation
+# 즉시 추천은 카탈로그 점수 계산만 하므로 Gemini 호출 없이 매 실행마다 바로 보여줍니다.
+from app_avoid import expand_avoid_terms
+from app_rank import recommend_foods
 
+INSTANT_RECOMMENDATIONS = 10
 
-# 제미나이 API 키 불러오기
-api_key=st.secrets["GEMINI_API_KEY"]
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-2.5-flash')
-
-
-
-def determine_bmi_status(bmi, age):
-    """app_user_info.py의 나이별 기준에 따라 BMI 상태를 결정합니다."""
-    if bmi is None or age is None:
-        return "정보 없음"
-    
-    criteria = get_bmi_criteria(age)
-    
-    if bmi < criteria['underweight']:
-        return "저체중"
-    elif bmi < criteria['normal_max']:
-        return "정상"
-    elif bmi <= criteria['overweight_max']:
-        return "과체중"
-    else:
-        return "비만"
-
-# get_ai_diet_recommendation 함수에 age 매개변수 추가
-def get_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
-    """AI를 통한 맞춤형 식단 추천"""
-    
-    # BMI 카테고리 결정: app_user_info의 age-specific 기준 사용
-    bmi_category = determine_bmi_status(bmi, age)
-    
-    prompt = f"""
-    다음 조건에 맞는 하루 식단을 추천해주세요:
-    
-    - BMI: {bmi:.1f} ({bmi_category})
-    - 선호하는 음식: {', '.join(preferences) if preferences else '없음'}
-    - 피해야 할 음식: {', '.join(avoid_foods) if avoid_foods else '없음'}
-    
-    다음 형식으로 자세히 응답해주세요:
-    
-    ### 🌅 아침
-    - 추천 식단:
-    - 예상 칼로리:
-    - 추천 이유:
-    
-    ### 🌞 점심
-    - 추천 식단:
-    - 예상 칼로리:
-    - 추천 이유:
-    
-    ### 🌙 저녁
-    - 추천 식단:
-    - 예상 칼로리:
-    - 추천 이유:
-    
-    ### 💡 전체적인 식단 구성 이유:
-    
-    ### ⚠️ 주의사항:
-    """
-    
-    try:
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"식단 생성 중 오류가 발생했습니다: {str(e)}"
 
 def run_ml():
     
@@ -137,6 +78,10 @@ def run_ml():
     
     # 구분선
     st.divider()
+
+    if bmi is not None and age is not None:
+        show_instant_recommendations(user_data, pref_list, avoid_list)
+        st.divider()
     
     # 식단 생성 버튼
     if bmi is not None and age is not None:
@@ -160,5 +105,25 @@ def run_ml():
         st.error("BMI 및 나이 정보가 없어 식단을 생성할 수 없습니다. 'BMI 계산기' 페이지에서 정보를 입력해 주세요.")
 
 
+def show_instant_recommendations(user_data, pref_list, avoid_list):
+    """BMI 목표와 선호/기피 음식으로 점수를 매긴 카탈로그 상위 음식을 보여줍니다."""
+    st.markdown("### ⚡ 바로 추천 (AI 호출 없이)")
+    results = recommend_foods(
+        user_data['height'], user_data['weight'], user_data['age'],
+        k=INSTANT_RECOMMENDATIONS, preferences=pref_list, avoid_foods=avoid_list,
+    )
+    if not results:
+        st.info("조건에 맞는 음식이 없습니다. 피해야 할 음식을 줄여보세요.")
+        return
+    st.caption("탄단지 비율 적합도, 나트륨·당류, BMI 상태별 열량 밀도, 선호 음식으로 매긴 점수 순입니다. (100g 기준)")
+    related = [term for term in expand_avoid_terms(avoid_list) if term not in avoid_list]
+    if related:
+        st.caption(f"🚫 함께 제외한 관련 식품: {', '.join(related)}")
+    st.dataframe(
+        [{"음식": r["name"], "점수": r["score"], "근거": ", ".join(r["reasons"])} for r in results],
+        hide_index=True, use_container_width=True,
+    )
+
+
 if __name__ == "__main__":
     run_ml()
\ No newline at end of file
@@ -0,0 +1,359 @@
+# =========================================================================
+# 영양 계산 엔진 (Streamlit 과 무관한 순수 함수)
+# =========================================================================
+# 페이지(app_eda, app_img, app_ml, app_user_info)와 헤드리스 API(app_api)가
+# 같은 계산을 사용하도록 화면 코드와 분리해 둔 모듈입니다.
+
+import bisect
+
+from app_breaker import CircuitOpenError
+from app_cooking import find_cooked_food
+from app_hedge import generate_content
+from app_metrics import inc, record_gemini_usage, timed
+from app_resources import get_gemini_model
+
+# 카탈로그의 영양소 컬럼 (모두 100g/100ml 기준)
+NUTRIENT_COLUMNS = ["에너지(kcal)", "탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]
+
+# 하루 권장 섭취 한도
+DAILY_LIMITS = {"나트륨": 2000, "당류": 50}
+
+# 칼로리 보정 회귀 모델의 입력 컬럼 순서
+REGRESSOR_FEATURES = ["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]
+
+
+# -------------------------------------------------------------------------
+# 1. 섭취량 환산 / 피드백
+# -------------------------------------------------------------------------
+
+def scale_nutrients(info, amount):
+    """100g 기준 영양 정보를 섭취량(g/ml)에 맞게 환산합니다.
+
+    info 는 카탈로그 한 행(Series 또는 dict)이며, 값이 없는 영양소는 None 입니다.
+    """
+    ratio = amount / 100
+    return {
+        col: (float(info[col]) * ratio if col in info else None)
+        for col in NUTRIENT_COLUMNS
+    }
+
+
+def limit_share(value, limit):
+    """하루 권장량 대비 섭취 비율(%)을 계산합니다."""
+    return value / limit * 100 if value else 0
+
+
+def limit_color(share):
+    """권장량 대비 비율에 따른 신호등 아이콘을 반환합니다."""
+    return "🟢" if share < 30 else "🟠" if share < 70 else "🔴"
+
+
+def macro_feedback(scaled):
+    """환산된 영양소로 탄단지 비율 및 나트륨/당류 피드백 문장을 만듭니다."""
+    energy = scaled["에너지(kcal)"]
+    carb_ratio = scaled["탄수화물(g)"] * 4 / energy * 100 if energy > 0 else 0
+    protein_ratio = scaled["단백질(g)"] * 4 / energy * 100 if energy > 0 else 0
+    fat_ratio = scaled["지방(g)"] * 9 / energy * 100 if energy > 0 else 0
+
+    feedback = []
+
+    # 탄수화물 비율 피드백
+    if carb_ratio > 60:
+        feedback.append("🍚 탄수화물 비중이 높아요. 밥이나 빵류 섭취를 줄여보세요.")
+    elif carb_ratio < 40:
+        feedback.append("🍞 탄수화물 비중이 낮아요. 에너지를 충분히 섭취하세요.")
+    else:
+        feedback.append("✅ 탄수화물 비율이 적정합니다.")
+
+    # 단백질 피드백
+    if protein_ratio < 15:
+        feedback.append("💪 단백질 섭취가 적습니다. 달걀, 닭가슴살, 두부를 추가해보세요.")
+    elif protein_ratio > 25:
+        feedback.append("🥩 단백질이 많아요. 탄수화물과의 균형을 확인해보세요.")
+    else:
+        feedback.append("✅ 단백질 섭취가 적당합니다.")
+
+    # 지방 피드백
+    if fat_ratio > 30:
+        feedback.append("🍟 지방 섭취가 높아요. 튀김이나 가공식품을 줄이세요.")
+    elif fat_ratio < 10:
+        feedback.append("🥑 지방이 적어요. 견과류나 올리브유로 보충해보세요.")
+    else:
+        feedback.append("✅ 지방 섭취도 적정합니다.")
+
+    # 나트륨, 당류 피드백
+    sodium = scaled["나트륨(mg)"]
+    sugar = scaled["당류(g)"]
+    if sodium and sodium > 1500:
+        feedback.append("⚠️ 나트륨이 높아요. 짠 음식 섭취를 줄이세요.")
+    if sugar and sugar > 30:
+        feedback.append("⚠️ 당류가 많아요. 단 음료나 디저트는 자제하세요.")
+
+    return feedback
+
+
+# -------------------------------------------------------------------------
+# 2. BMI 기준표 / 판정
+# -------------------------------------------------------------------------
+
+# 나이대 경계 (이상). 구간 번호 = bisect_right(BMI_AGE_BREAKS, age)
+BMI_AGE_BREAKS = [20, 40, 60]
+# 나이대별 BMI 기준표 (BMI_AGE_BREAKS 구간 순서)
+BMI_CRITERIA = [
+    {
+        'age_group': '20세 미만',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 22.9,
+        'overweight_max': 24.9,
+        'description': '일반적인 아시아 기준 적용'
+    },
+    {
+        'age_group': '20~40대',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 22.9,
+        'overweight_max': 24.9,
+        'description': '일반적인 아시아 기준'
+    },
+    {
+        'age_group': '40~60대',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 23.4,
+        'overweight_max': 25.4,
+        'description': '중년 이후 약간 높은 BMI 권장'
+    },
+    {
+        'age_group': '60대 이상',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 24.9,
+        'overweight_max': 27.4,
+        'description': '노년층은 다소 비만 허용 범위 확대'
+    },
+]
+
+# BMI 상태 코드(0~3) 순서의 표시 이름 / 스타일 키 (app_user_info.get_status_style)
+BMI_STATUSES = ["저체중", "정상", "과체중", "비만"]
+BMI_CATEGORIES = ["underweight", "normal", "overweight", "obese"]
+BMI_STATUS_UNKNOWN = "정보 없음"
+
+
+def get_bmi_criteria(age):
+    """
+    나이에 따라 다른 BMI 기준을 알려줍니다.
+    (호출한 쪽이 고쳐도 기준표가 바뀌지 않도록 복사본을 돌려줍니다.)
+    """
+    return dict(_bmi_criteria(age))
+
+
+def _bmi_criteria(age):
+    # 읽기만 하는 내부 호출용: 기준표의 사전을 그대로 돌려줍니다.
+    return BMI_CRITERIA[bisect.bisect_right(BMI_AGE_BREAKS, age)]
+
+
+def compute_bmi(height, weight):
+    """키(cm)와 몸무게(kg)로 BMI 를 계산합니다."""
+    height_m = height / 100.0
+    return weight / (height_m ** 2)
+
+
+def classify_bmi(bmi, age):
+    """나이별 기준에 따른 BMI 상태 코드(BMI_STATUSES 의 위치)를 반환합니다."""
+    criteria = _bmi_criteria(age)
+    if bmi < criteria['underweight']:
+        return 0
+    elif bmi < criteria['normal_max']:
+        return 1
+    elif bmi <= criteria['overweight_max']:
+        return 2
+    else:
+        return 3
+
+
+def determine_bmi_status(bmi, age):
+    """나이별 기준에 따라 BMI 상태를 결정합니다."""
+    if bmi is None or age is None:
+        return BMI_STATUS_UNKNOWN
+    return BMI_STATUSES[classify_bmi(bmi, age)]
+
+
+# -------------------------------------------------------------------------
+# 2-1. 집단 단위 BMI 판정 / 하루 목표 (numpy 벡터 연산)
+# -------------------------------------------------------------------------
+# 수십만 명의 프로필을 파이썬 반복 없이 한 번에 처리합니다.
+
+# 하루 에너지 목표: Mifflin-St Jeor 기초대사량 x 활동 계수 + 상태별 조정(kcal)
+ACTIVITY_FACTOR = 1.375  # 가벼운 활동 (주 1~3회 운동)
+SEX_OFFSETS = {"남": 5.0, "여": -161.0}
+# 성별을 모르면 남녀 보정값의 평균을 사용합니다.
+UNKNOWN_SEX_OFFSET = (SEX_OFFSETS["남"] + SEX_OFFSETS["여"]) / 2
+# BMI 상태 코드별 에너지 조정 (저체중은 증량, 과체중/비만은 감량)
+STATUS_KCAL_ADJUST = [300.0, 0.0, -300.0, -500.0]
+# 에너지 중 탄수화물/단백질/지방 비율과 g 당 열량
+MACRO_SPLIT = {"탄수화물(g)": (0.55, 4.0), "단백질(g)": (0.20, 4.0), "지방(g)": (0.25, 9.0)}
+
+
+def _bmi_thresholds():
+    import numpy as np
+    return (
+        np.array([c['underweight'] for c in BMI_CRITERIA]),
+        np.array([c['normal_max'] for c in BMI_CRITERIA]),
+        np.array([c['overweight_max'] for c in BMI_CRITERIA]),
+    )
+
+
+def classify_cohort(height, weight, age):
+    """키(cm)/몸무게(kg)/나이 배열로 BMI 와 상태 코드를 한 번에 계산합니다.
+
+    반환값은 {"bmi", "age_band", "status"} 배열 사전이며, status 는 BMI_STATUSES 의
+    위치(0~3)이고 값이 없거나(NaN) 잘못된 프로필은 -1 입니다.
+    입력이 모두 스칼라이면 값도 스칼라로 돌려줍니다.
+    """
+    import numpy as np
+    scalar = all(np.ndim(v) == 0 for v in (height, weight, age))
+    height, weight, age = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (height, weight, age))
+    )
+
+    height_m = height / 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = weight / (height_m * height_m)
+    band = np.searchsorted(BMI_AGE_BREAKS, age, side="right")
+    underweight, normal_max, overweight_max = (t[band] for t in _bmi_thresholds())
+    # 각 기준을 넘을 때마다 상태 코드가 1씩 올라갑니다. (과체중 상한은 포함)
+    status = (bmi >= underweight).astype(np.int8) + (bmi >= normal_max) + (bmi > overweight_max)
+    valid = np.isfinite(bmi) & np.isfinite(age) & (height > 0)
+    status[~valid] = -1
+    if scalar:
+        return {"bmi": bmi[0], "age_band": band[0], "status": status[0]}
+    return {"bmi": bmi, "age_band": band, "status": status}
+
+
+def status_labels(status):
+    """classify_cohort 의 상태 코드 배열을 표시 이름 배열로 바꿉니다. (-1 은 BMI_STATUS_UNKNOWN)"""
+    import numpy as np
+    # 마지막 원소가 '정보 없음' 이므로 -1 인덱스가 그대로 대응됩니다.
+    return np.array(BMI_STATUSES + [BMI_STATUS_UNKNOWN], dtype=object)[status]
+
+
+def cohort_targets(height, weight, age, sex=None, activity=ACTIVITY_FACTOR):
+    """프로필 배열의 하루 에너지(kcal)와 탄수화물/단백질/지방(g) 목표를 한 번에 계산합니다.
+
+    sex 는 "남"/"여" 배열(또는 None)이며, 알 수 없는 값은 남녀 평균 보정을 씁니다.
+    반환값은 classify_cohort 결과에 "에너지(kcal)" 와 MACRO_SPLIT 컬럼을 더한 사전입니다.
+    상태를 판정할 수 없는 프로필의 목표는 NaN 입니다.
+    """
+    import numpy as np
+    result = classify_cohort(height, weight, age)
+    height = np.asarray(height, dtype=np.float64)
+    weight = np.asarray(weight, dtype=np.float64)
+    age = np.asarray(age, dtype=np.float64)
+
+    if sex is None:
+        offset = UNKNOWN_SEX_OFFSET
+    else:
+        sex = np.asarray(sex, dtype=object)
+        offset = np.full(sex.shape, UNKNOWN_SEX_OFFSET)
+        for label, value in SEX_OFFSETS.items():
+            offset[sex == label] = value
+
+    bmr = 10.0 * weight + 6.25 * height - 5.0 * age + offset
+    status = result["status"]
+    adjust = np.array(STATUS_KCAL_ADJUST)[np.maximum(status, 0)]
+    kcal = np.where(status >= 0, bmr * activity + adjust, np.nan)
+    result["에너지(kcal)"] = kcal
+    for col, (share, kcal_per_gram) in MACRO_SPLIT.items():
+        result[col] = kcal * share / kcal_per_gram
+    return result
+
+
+# -------------------------------------------------------------------------
+# 3. 칼로리 보정
+# -------------------------------------------------------------------------
+
+def predict_calories(regressor, carbo, protein, fat, sugar, sodium):
+    """영양 성분으로 회귀 모델의 칼로리 추정값을 계산합니다."""
+    import pandas as pd
+    new_data = pd.DataFrame([[carbo, protein, fat, sugar, sodium]], columns=REGRESSOR_FEATURES)
+    with timed("model_predict"):
+        return float(regressor.predict(new_data)[0])
+
+
+# -------------------------------------------------------------------------
+# 4. AI 식단 추천
+# -------------------------------------------------------------------------
+
+def cooked_reference(foods):
+    """식품성분표(data/완.csv)에서 찾은 음식의 조리상태별 100g 영양값을 프롬프트용 문단으로 만듭니다.
+
+    예상 칼로리를 모델이 추측하지 않고 실측값을 근거로 계산하도록 함께 전달합니다.
+    찾은 음식이 없으면 빈 문자열을 반환합니다.
+    """
+    lines = []
+    for food in foods:
+        cooked = find_cooked_food(food)
+        if cooked is not None:
+            values = ", ".join(f"{col} {value:g}" for col, value in cooked.nutrients.items())
+            lines.append(f"    - {cooked.label}: {values}")
+    if not lines:
+        return ""
+    return "\n    참고 영양정보 (식품성분표, 100g 당):\n" + "\n".join(lines) + "\n"
+
+
+def build_diet_prompt(bmi, age, preferences, avoid_foods):
+    """식단 추천용 Gemini 프롬프트를 만듭니다."""
+    # BMI 카테고리 결정: 나이별 기준 사용
+    bmi_category = determine_bmi_status(bmi, age)
+    reference = cooked_reference(preferences)
+    
+    return f"""
+    다음 조건에 맞는 하루 식단을 추천해주세요:
+    
+    - BMI: {bmi:.1f} ({bmi_category})
+    - 선호하는 음식: {', '.join(preferences) if preferences else '없음'}
+    - 피해야 할 음식: {', '.join(avoid_foods) if avoid_foods else '없음'}
+    {reference}
+    다음 형식으로 자세히 응답해주세요:
+    
+    ### 🌅 아침
+    - 추천 식단:
+    - 예상 칼로리:
+    - 추천 이유:
+    
+    ### 🌞 점심
+    - 추천 식단:
+    - 예상 칼로리:
+    - 추천 이유:
+    
+    ### 🌙 저녁
+    - 추천 식단:
+    - 예상 칼로리:
+    - 추천 이유:
+    
+    ### 💡 전체적인 식단 구성 이유:
+    
+    ### ⚠️ 주의사항:
+    """
+
+
+def get_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
+    """AI를 통한 맞춤형 식단 추천"""
+    from app_fallback import fallback_diet_plan, remember_plan
+    prompt = build_diet_prompt(bmi, age, preferences, avoid_foods)
+    
+    try:
+        model = get_gemini_model()
+        with timed("gemini_request", source="diet"):
+            response = generate_content(model, prompt, "diet")
+        record_gemini_usage(response, "diet")
+        remember_plan(bmi, age, avoid_foods, response.text)
+        return response.text
+    except CircuitOpenError:
+        # Gemini 가 계속 실패/지연 중이면 기다리지 않고 로컬 식단을 바로 보여줍니다.
+        inc("gemini_fallbacks", source="diet")
+        return fallback_diet_plan(bmi, age, preferences, avoid_foods)
+    except Exception as e:
+        inc("gemini_errors", source="diet")
+        return f"식단 생성 중 오류가 발생했습니다: {str(e)}"
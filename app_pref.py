@@ -1,8 +1,11 @@
 import pandas as pd
 import streamlit as st
 
+from app_resources import find_food_means, get_catalog, get_meal_log
+from app_nutrition import DAILY_LIMITS, limit_share, scale_nutrients
+from app_user_info import get_user_id
+
 # ------------------- 상수 -------------------
-DAILY_LIMITS = {"나트륨": 2000, "당류": 50}
 SERVING_SIZE = 300  # 1인분 기준 (300g)
 
 # ------------------- 피드백 함수 -------------------
@@ -15,42 +18,51 @@ def feedback(consumed, limit, nutrient):
         msg = "👍 좋아요! 하루 권장량 내에 있어요." if ratio <= 100 else "⚠️ 단 음식을 조금 줄여보세요."
         return f"당류 섭취량: {consumed:.0f}g (하루 권장량의 {ratio:.0f}%)<br>→ {msg}"
 
-# ------------------- 분석 함수 -------------------
-def analyze_foods():
-    food_list = st.session_state.food_list
-    if not food_list:
-        st.warning("음식을 한 개 이상 선택해주세요.")
-        return
+# ------------------- 섭취 기록 -------------------
+def serving_nutrients(food):
+    """음식 1인분(300g)의 영양값을 계산합니다.
 
-    try:
-        df = pd.read_csv('./food1.csv')
-    except FileNotFoundError:
-        st.error("❌ food1.csv 파일을 찾을 수 없습니다.")
-        return
+    같은 이름의 여러 행 평균은 카탈로그 로드 시 미리 계산되어 있어 사전 조회만 합니다.
+    """
+    return scale_nutrients(find_food_means(food), SERVING_SIZE)
 
-    # 숫자형 변환
-    df["나트륨(mg)"] = pd.to_numeric(df["나트륨(mg)"], errors="coerce").fillna(0)
-    df["당류(g)"] = pd.to_numeric(df["당류(g)"], errors="coerce").fillna(0)
 
-    # 선택한 음식 필터링
-    matched = (
-        df[df["식품명"].isin(food_list)]
-        .groupby("식품명", as_index=False)
-        .agg({"나트륨(mg)": "mean", "당류(g)": "mean"})
-    )
+def sync_meal_log(user_id, selected_foods):
+    """선택 목록의 변경분만 오늘의 섭취 기록에 추가/삭제합니다."""
+    meal_log = get_meal_log()
+    logged = {}
+    for event in meal_log.day_events(user_id):
+        logged.setdefault(event["food"], []).append(event["id"])
+
+    added = [food for food in selected_foods if food not in logged]
+    if added:
+        meal_log.add_events(user_id, [(food, SERVING_SIZE, serving_nutrients(food)) for food in added])
+    for food, event_ids in logged.items():
+        if food not in selected_foods:
+            for event_id in event_ids:
+                meal_log.remove_event(user_id, event_id)
 
-    if matched.empty:
-        st.error("선택한 음식의 영양 정보를 찾을 수 없습니다.")
+
+# ------------------- 분석 함수 -------------------
+def analyze_foods():
+    user_id = get_user_id()
+    meal_log = get_meal_log()
+    events = meal_log.day_events(user_id)
+    if not events:
+        st.warning("음식을 한 개 이상 선택해주세요.")
         return
 
-    # ✅ 100g → 300g (1인분 기준 환산)
-    matched["나트륨(1인분mg)"] = matched["나트륨(mg)"] * (SERVING_SIZE / 100)
-    matched["당류(1인분g)"] = matched["당류(g)"] * (SERVING_SIZE / 100)
+    # ✅ 기록된 값은 이미 1인분(300g) 기준으로 환산되어 있습니다.
+    matched = pd.DataFrame(events)
+    matched["나트륨(1인분mg)"] = matched["나트륨(mg)"]
+    matched["당류(1인분g)"] = matched["당류(g)"]
+    matched = matched.rename(columns={"food": "식품명"})
     matched = matched.round({"나트륨(1인분mg)": 1, "당류(1인분g)": 2})
 
-    # ✅ 총 섭취량 계산 (1인분 단위 합계)
-    total_na = matched["나트륨(1인분mg)"].sum()
-    total_su = matched["당류(1인분g)"].sum()
+    # ✅ 오늘 총 섭취량 (일별 누적 합계에서 읽기)
+    totals = meal_log.day_totals(user_id)
+    total_na = totals["나트륨(mg)"]
+    total_su = totals["당류(g)"]
 
     # ------------------- 결과 표시 -------------------
     st.markdown("""
@@ -79,6 +91,19 @@ def analyze_foods():
         </div>
         """, unsafe_allow_html=True)
 
+    # ------------------- 최근 7일 / 30일 평균 -------------------
+    # 일별 누적 합계에서 바로 읽으므로 기록이 쌓여도 계산 비용이 늘지 않습니다.
+    col1, col2 = st.columns(2)
+    for col, days in ((col1, 7), (col2, 30)):
+        window = meal_log.window_totals(user_id, days)
+        avg_na = window["daily_avg"]["나트륨(mg)"]
+        avg_su = window["daily_avg"]["당류(g)"]
+        col.markdown(f"""
+        **최근 {days}일 하루 평균** (기록한 날 {window["days_logged"]}일)  
+        🧂 나트륨 {avg_na:.0f}mg ({limit_share(avg_na, DAILY_LIMITS["나트륨"]):.0f}%) ·
+        🍯 당류 {avg_su:.0f}g ({limit_share(avg_su, DAILY_LIMITS["당류"]):.0f}%)
+        """)
+
     # ------------------- 세부 데이터 표시 -------------------
     st.markdown("""
     <div class="custom-card" style="margin-top:2rem;">
@@ -111,12 +136,16 @@ def run_pref():
     """, unsafe_allow_html=True)
 
     # ------------------- 초기화 -------------------
+    # 새 세션이면 오늘 저장된 섭취 기록에서 선택 목록을 복원합니다.
+    user_id = get_user_id()
     if "food_list" not in st.session_state:
-        st.session_state.food_list = []
+        st.session_state.food_list = list(dict.fromkeys(
+            event["food"] for event in get_meal_log().day_events(user_id)
+        ))
 
     # ------------------- 데이터 로드 -------------------
     try:
-        df = pd.read_csv('./food1.csv')
+        df = get_catalog()
         food_options = sorted(df["식품명"].dropna().unique().tolist())
     except FileNotFoundError:
         st.error("❌ food1.csv 파일을 찾을 수 없습니다.")
@@ -137,7 +166,9 @@ def run_pref():
         key="multi_food"
     )
 
-    # 선택된 음식 목록 업데이트
+    # 선택된 음식 목록 업데이트 (바뀐 경우에만 섭취 기록에 반영)
+    if selected_foods != st.session_state.food_list:
+        sync_meal_log(user_id, selected_foods)
     st.session_state.food_list = selected_foods
 
     # ------------------- 선택 목록 표시 -------------------
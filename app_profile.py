@@ -0,0 +1,129 @@
+"""사용자 프로필 저장소 (키, 몸무게, 나이, BMI 결과).
+
+BMI 계산 결과를 섭취 기록과 같은 SQLite 파일(app_meal_log.DB_PATH)에 사용자 식별자
+(?uid=)별 한 행으로 저장합니다. 같은 주소로 다시 접속한 사용자는 새 세션이 시작될 때
+저장된 프로필을 불러오므로 BMI 계산 단계를 다시 거치지 않아도 됩니다.
+
+읽기는 프로세스 메모리의 LRU 캐시를 먼저 보고(read-through), 없거나 CACHE_TTL 초가
+지났을 때만 기본 키 조회 한 번을 합니다. 저장은 DB 와 캐시를 함께 갱신(write-through)하므로
+같은 프로세스의 다른 세션은 바로 새 값을 봅니다.
+
+서버 프로세스가 여러 개이면(app_shared_catalog 배포) 다른 프로세스의 저장은 이 캐시에
+알려지지 않으므로, 캐시한 프로필은 최대 CACHE_TTL 초까지만 쓰고 프로필이 없다는 결과는
+캐시하지 않습니다. (다른 프로세스가 방금 저장한 프로필을 바로 찾을 수 있도록)
+
+    FOOD_AI_PROFILE_CACHE_TTL=5    캐시한 프로필을 DB 확인 없이 쓰는 시간(초). 0 이면 캐시하지 않음
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from app_meal_log import DB_PATH
+
+PROFILE_FIELDS = ["height", "weight", "age", "bmi", "status_category"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_profiles (
+    user_id         TEXT PRIMARY KEY,
+    height          REAL NOT NULL,
+    weight          REAL NOT NULL,
+    age             INTEGER NOT NULL,
+    bmi             REAL,
+    status_category TEXT NOT NULL DEFAULT '',
+    updated_at      TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+SELECT_PROFILE = "SELECT " + ", ".join(PROFILE_FIELDS) + " FROM user_profiles WHERE user_id = ?"
+UPSERT_PROFILE = (
+    "INSERT INTO user_profiles (user_id, " + ", ".join(PROFILE_FIELDS) + ", updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+    + ", ".join(f"{f} = excluded.{f}" for f in PROFILE_FIELDS) + ", updated_at = excluded.updated_at"
+)
+DELETE_PROFILE = "DELETE FROM user_profiles WHERE user_id = ?"
+
+# 메모리에 보관하는 최대 사용자 수 (넘으면 가장 오래 쓰지 않은 사용자부터 뺍니다)
+CACHE_SIZE = 10_000
+CACHE_TTL = float(os.environ.get("FOOD_AI_PROFILE_CACHE_TTL", 5.0))
+
+
+class ProfileStore:
+    """사용자별 프로필 저장소. 여러 세션(스레드)에서 동시에 사용할 수 있습니다."""
+
+    def __init__(self, path=DB_PATH, cache_size=CACHE_SIZE, cache_ttl=CACHE_TTL, clock=time.monotonic):
+        self.path = path
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._cache = OrderedDict()  # user_id → (프로필, 캐시한 시각)
+        self._cache_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, user_id, profile):
+        """프로필을 캐시합니다. None(프로필 없음)이면 캐시에서 뺍니다."""
+        with self._cache_lock:
+            if profile is None or self.cache_ttl <= 0:
+                self._cache.pop(user_id, None)
+                return
+            self._cache[user_id] = (profile, self._clock())
+            self._cache.move_to_end(user_id)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _cached(self, user_id):
+        with self._cache_lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return None
+            profile, cached_at = entry
+            if self._clock() - cached_at >= self.cache_ttl:
+                del self._cache[user_id]
+                return None
+            self._cache.move_to_end(user_id)
+            return profile
+
+    def get(self, user_id):
+        """저장된 프로필 dict (PROFILE_FIELDS). 없으면 None."""
+        profile = self._cached(user_id)
+        if profile is None:
+            row = self._connect().execute(SELECT_PROFILE, (user_id,)).fetchone()
+            if row is None:
+                return None
+            profile = dict(zip(PROFILE_FIELDS, row))
+            self._remember(user_id, profile)
+        return dict(profile)
+
+    def save(self, user_id, height, weight, age, bmi=None, status_category=""):
+        """프로필을 저장(덮어쓰기)하고 저장한 dict 를 반환합니다."""
+        profile = {
+            "height": height, "weight": weight, "age": int(age),
+            "bmi": None if bmi is None else float(bmi), "status_category": status_category or "",
+        }
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute(UPSERT_PROFILE, (user_id, *profile.values(), datetime.now().isoformat(timespec="seconds")))
+            self._remember(user_id, profile)
+        return dict(profile)
+
+    def delete(self, user_id):
+        """프로필을 삭제합니다. 삭제했으면 True 를 반환합니다."""
+        conn = self._connect()
+        with self._write_lock, conn:
+            cur = conn.execute(DELETE_PROFILE, (user_id,))
+            self._remember(user_id, None)
+        return cur.rowcount > 0
@@ -0,0 +1,159 @@
+"""사용자 맞춤 음식 순위 (Gemini 호출 없이 즉시 추천).
+
+카탈로그의 모든 음식(식품명별 첫 행)을 한 번의 NumPy 연산으로 점수화하고
+argpartition 으로 상위 K 개만 정렬합니다. 점수 구성:
+
+    탄단지 적합도   음식의 탄수화물/단백질/지방 열량 비율이 사용자의 목표 비율(cohort_targets)에
+                    가까울수록 1 에 가까움
+    나트륨/당류     100g 당 값이 한 끼 권장량(하루 한도 / MEALS_PER_DAY)에 가까울수록 감점
+    열량 밀도       BMI 상태별 가중치 (저체중은 가점, 과체중/비만은 감점)
+    선호 음식       식품명에 선호 음식이 포함되면 가점, 피해야 할 음식(관련 알레르기 식품 포함,
+                    app_avoid)이 포함되면 제외
+
+음식별 값은 카탈로그를 불러올 때 한 번만 계산하므로 요청마다 하는 일은 벡터 연산 몇 번입니다.
+"""
+import numpy as np
+
+from app_avoid import ExclusionIndex
+from app_nutrition import DAILY_LIMITS, MACRO_SPLIT, cohort_targets
+
+MEALS_PER_DAY = 3
+# 열량 밀도 정규화 기준 (100g 당 kcal, 이 이상은 1)
+DENSITY_REFERENCE = 400.0
+SCORE_WEIGHTS = {"macro": 1.0, "sodium": 0.5, "sugar": 0.3, "preference": 0.5}
+# BMI 상태 코드(BMI_STATUSES 순)별 열량 밀도 가중치
+STATUS_DENSITY_WEIGHTS = [0.3, 0.0, -0.2, -0.4]
+
+
+class FoodRanker:
+    """식품명별 영양 특성을 미리 계산해 두고 사용자별 점수를 매깁니다."""
+
+    # 발행(app_shared_catalog)할 때 파일로 저장하고 워커가 메모리 매핑해 쓰는 배열
+    STATE_ARRAYS = ("valid", "macro_fractions", "sodium_penalty", "sugar_penalty", "density", "_base")
+
+    def __init__(self, names, matrix, columns):
+        self._setup(names)
+        values = np.asarray(matrix, dtype=np.float64)
+        col = {c: j for j, c in enumerate(columns)}
+
+        # 탄수화물/단백질/지방이 각각 차지하는 열량 비율 (MACRO_SPLIT 순서).
+        # 영양소별로 연속된 (3, 음식 수) 배치여야 요청마다 하는 차이 합계가 빠릅니다.
+        macro_kcal = np.stack([values[:, col[c]] * kcal for c, (_, kcal) in MACRO_SPLIT.items()])
+        macro_total = macro_kcal.sum(axis=0)
+        self.valid = (macro_total > 0) & (values[:, col["에너지(kcal)"]] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.macro_fractions = np.where(self.valid, macro_kcal / macro_total, 0.0).astype(np.float32)
+
+        # 요청마다 읽는 배열은 float32 로 두어 메모리 이동량을 줄입니다.
+        meal_sodium = DAILY_LIMITS["나트륨"] / MEALS_PER_DAY
+        meal_sugar = DAILY_LIMITS["당류"] / MEALS_PER_DAY
+        self.sodium_penalty = np.clip(values[:, col["나트륨(mg)"]] / meal_sodium, 0.0, 1.0).astype(np.float32)
+        self.sugar_penalty = np.clip(values[:, col["당류(g)"]] / meal_sugar, 0.0, 1.0).astype(np.float32)
+        self.density = np.clip(values[:, col["에너지(kcal)"]] / DENSITY_REFERENCE, 0.0, 1.0).astype(np.float32)
+        # 요청과 무관한 감점은 미리 합쳐 두고, 점수를 매길 수 없는 음식은 -inf 로 둡니다.
+        self._base = (-SCORE_WEIGHTS["sodium"] * self.sodium_penalty
+                      - SCORE_WEIGHTS["sugar"] * self.sugar_penalty)
+        self._base[~self.valid] = -np.inf
+
+    def _setup(self, names):
+        import pandas as pd
+        import pyarrow as pa
+
+        self.names = pd.Series(names, dtype="string[pyarrow]")
+        self._name_array = pa.array(self.names, type=pa.string())
+        # 선호/제외 단어 묶음별 식품명 일치 배열 (한 번의 다중 단어 검색, 묶음별 보관)
+        self.terms = ExclusionIndex(self._name_array)
+
+    def state(self):
+        """발행용 (JSON 메타데이터, 배열 dict)."""
+        return {}, {name: getattr(self, name) for name in self.STATE_ARRAYS}
+
+    @classmethod
+    def from_state(cls, meta, arrays, names):
+        """state() 로 저장한 값(메모리 매핑 배열)으로 다시 계산 없이 만듭니다. names 는 같은 순서의 식품명."""
+        ranker = cls.__new__(cls)
+        for name in cls.STATE_ARRAYS:
+            setattr(ranker, name, arrays[name])
+        ranker._setup(names)
+        return ranker
+
+    def __len__(self):
+        return len(self.names)
+
+    def score(self, height, weight, age, sex=None, preferences=(), avoid_foods=()):
+        """모든 음식의 점수 배열과 점수 구성 요소를 반환합니다. 제외된 음식은 -inf."""
+        targets = cohort_targets([height], [weight], [age], None if sex is None else [sex])
+        status = int(targets["status"][0])
+        target_kcal = np.array([targets[c][0] * kcal for c, (_, kcal) in MACRO_SPLIT.items()])
+        target = target_kcal / target_kcal.sum()
+
+        diff = self.macro_fractions - target.astype(np.float32)[:, None]
+        np.abs(diff, out=diff)
+        macro_fit = diff.sum(axis=0)
+        macro_fit *= -0.5
+        macro_fit += 1.0
+        scores = macro_fit * SCORE_WEIGHTS["macro"]
+        scores += self._base
+        density_weight = STATUS_DENSITY_WEIGHTS[status] if status >= 0 else 0.0
+        if density_weight:
+            scores += density_weight * self.density
+        preferred = self.terms.mask(preferences, synonyms=False)
+        if preferences:
+            scores += SCORE_WEIGHTS["preference"] * preferred
+        if avoid_foods:
+            scores[self.terms.mask(avoid_foods)] = -np.inf
+        return scores, {"macro_fit": macro_fit, "preferred": preferred, "density_weight": density_weight,
+                        "status": status, "target": target}
+
+    def top(self, k, height, weight, age, sex=None, preferences=(), avoid_foods=()):
+        """점수 상위 k 개 음식과 점수 근거 목록."""
+        scores, parts = self.score(height, weight, age, sex, preferences, avoid_foods)
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        # 전체 정렬 대신 상위 k 개만 골라 그 안에서 정렬합니다.
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return self._explain(ranked, scores, parts)
+
+    def _explain(self, ranked, scores, parts):
+        """상위 음식별 점수 구성과 사람이 읽을 수 있는 근거 목록."""
+        # 상위 k 개의 값만 한 번에 꺼내 파이썬 값으로 바꿉니다.
+        names = self._name_array.take(ranked).to_pylist()
+        columns = zip(
+            names, scores[ranked].tolist(), parts["macro_fit"][ranked].tolist(),
+            self.sodium_penalty[ranked].tolist(), self.sugar_penalty[ranked].tolist(),
+            self.density[ranked].tolist(), parts["preferred"][ranked].tolist(),
+        )
+        density_weight = parts["density_weight"]
+        results = []
+        for name, score, macro_fit, sodium, sugar, density, preferred in columns:
+            reasons = [f"탄단지 비율 적합도 {macro_fit * 100:.0f}%"]
+            if preferred:
+                reasons.append("선호 음식 포함")
+            if sodium < 0.25:
+                reasons.append("나트륨 낮음")
+            elif sodium >= 1:
+                reasons.append("나트륨 높음")
+            if sugar < 0.25:
+                reasons.append("당류 낮음")
+            if density_weight < 0 and density < 0.3:
+                reasons.append("열량 밀도 낮음")
+            elif density_weight > 0 and density > 0.6:
+                reasons.append("열량 보충에 적합")
+            results.append({
+                "name": name,
+                "score": round(score, 4),
+                "macro_fit": round(macro_fit, 4),
+                "sodium_penalty": round(sodium, 4),
+                "sugar_penalty": round(sugar, 4),
+                "preferred": preferred,
+                "reasons": reasons,
+            })
+        return results
+
+
+def recommend_foods(height, weight, age, k=10, sex=None, preferences=(), avoid_foods=()):
+    """사용자 프로필에 맞는 상위 k 개 음식을 점수 근거와 함께 반환합니다."""
+    from app_resources import get_food_ranker
+    return get_food_ranker().top(k, height, weight, age, sex, preferences, avoid_foods)
@@ -0,0 +1,376 @@
+import os
+import time
+from enum import IntEnum
+from functools import lru_cache
+
+from app_metrics import timed
+
+# =========================================================================
+# 공유 리소스 (프로세스 당 한 번만 초기화)
+# =========================================================================
+# 페이지 모듈을 import 하는 것만으로 CSV 로드, 모델 역직렬화, Gemini 설정이
+# 실행되지 않도록 모든 무거운 리소스는 처음 사용할 때 여기서 생성합니다.
+# Streamlit 은 세션마다 스크립트를 다시 실행하지만 import 된 모듈은 프로세스에
+# 남아 있으므로, 아래 캐시는 모든 세션이 함께 사용합니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(BASE_DIR, "food1.csv")
+# CSV 파싱/정리 결과를 저장해 두는 스냅샷 (CSV 가 더 최신이면 다시 만듭니다)
+# 메모리 배치(컬럼 dtype)가 바뀌면 버전을 올려 이전 스냅샷을 쓰지 않게 합니다.
+CATALOG_LAYOUT_VERSION = 2
+CATALOG_SNAPSHOT_PATH = os.path.join(BASE_DIR, f"food1.v{CATALOG_LAYOUT_VERSION}.snapshot.pkl")
+MODEL_PATH = os.path.join(BASE_DIR, "food_calorie_model.pkl")
+# 식품명 x 조리상태별 영양 정보 (app_cooking 에서 사용)
+COOKING_TABLE_PATH = os.path.join(BASE_DIR, "data", "완.csv")
+# 지정하면 app_shared_catalog 로 발행된 공유(메모리 매핑) 카탈로그를 사용합니다.
+SHARED_CATALOG_DIR = os.environ.get("FOOD_AI_SHARED_CATALOG")
+GEMINI_MODEL_NAME = "gemini-2.5-flash"
+
+# 영양성분함량기준량 컬럼의 값 (category 코드 = BasisUnit 값)
+BASIS_UNITS = ["100g", "100ml"]
+
+
+class BasisUnit(IntEnum):
+    """영양성분 함량 기준량 (카탈로그에는 1바이트 category 코드로 저장됩니다)."""
+
+    GRAM = 0
+    MILLILITER = 1
+
+    @property
+    def label(self):
+        return BASIS_UNITS[self]
+
+
+@lru_cache(maxsize=None)
+def get_catalog():
+    """food1.csv 음식 카탈로그(DataFrame, 식품코드별 행)를 불러옵니다.
+
+    영양소 컬럼의 숫자 변환(변환 불가 값은 0)은 여기서 한 번만 수행합니다.
+    공유 카탈로그가 발행되어 있으면 복사 없이 그 매핑을 사용합니다.
+    """
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.catalog
+    with timed("catalog_load", source="snapshot"):
+        df = load_catalog_snapshot()
+    if df is None:
+        with timed("catalog_load", source="csv"):
+            df = load_catalog_csv()
+        save_catalog_snapshot(df)
+    return df
+
+
+def load_catalog_csv():
+    """food1.csv 를 읽고 영양소 컬럼을 정리합니다.
+
+    카탈로그는 워커 프로세스마다 한 벌씩 올라가므로 작은 배치로 저장합니다.
+    - 식품코드/식품명: 행마다 파이썬 문자열 객체를 만들지 않는 Arrow 문자열 버퍼
+      (식품명은 76% 가 서로 달라 category 로 바꾸면 이름 사전과 해시 색인 때문에 오히려 커집니다)
+    - 영양성분함량기준량: 두 가지 값뿐이므로 1바이트 category 코드 (= BasisUnit)
+    - 영양소: float32 (원본 수치는 소수 둘째 자리까지라 충분합니다)
+    """
+    import pandas as pd
+    from app_nutrition import NUTRIENT_COLUMNS
+    df = pd.read_csv(CATALOG_PATH, dtype={"식품코드": "string[pyarrow]", "식품명": "string[pyarrow]"})
+    for col in NUTRIENT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("float32")
+    df["영양성분함량기준량"] = pd.Categorical(df["영양성분함량기준량"], categories=BASIS_UNITS)
+    return df
+
+
+def load_catalog_snapshot():
+    """CSV 보다 최신인 카탈로그 스냅샷(pickle)이 있으면 읽고, 없으면 None 을 반환합니다."""
+    import pandas as pd
+    try:
+        if os.path.getmtime(CATALOG_SNAPSHOT_PATH) < os.path.getmtime(CATALOG_PATH):
+            return None
+        return pd.read_pickle(CATALOG_SNAPSHOT_PATH)
+    except Exception:
+        return None
+
+
+def save_catalog_snapshot(df):
+    """정리된 카탈로그를 스냅샷으로 저장합니다. (쓰기 실패는 무시)"""
+    tmp_path = f"{CATALOG_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, CATALOG_SNAPSHOT_PATH)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@lru_cache(maxsize=None)
+def get_food_table():
+    """식품명별 영양소 평균 테이블(식품명 인덱스)을 만듭니다.
+
+    같은 식품명이 여러 식품코드로 나뉘어 있으므로 모든 영양소 컬럼의 평균을
+    카탈로그 로드 시 한 번만 계산해 둡니다.
+    """
+    from app_nutrition import NUTRIENT_COLUMNS
+    return get_catalog().groupby("식품명", sort=False)[NUTRIENT_COLUMNS].mean()
+
+
+@lru_cache(maxsize=None)
+def _food_means():
+    return get_food_table().to_dict("index")
+
+
+def find_food_means(name):
+    """식품명의 영양소 평균(dict)을 찾습니다. 없으면 None 을 반환합니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.means(name)
+    return _food_means().get(name)
+
+
+@lru_cache(maxsize=None)
+def get_food_names():
+    """선택 목록에 사용할 중복 없는 식품명 배열을 반환합니다."""
+    return get_catalog()["식품명"].unique()
+
+
+@lru_cache(maxsize=None)
+def get_food_index():
+    """식품명 → 카탈로그 행 번호(같은 이름이 여러 개면 첫 번째 행) 사전을 만듭니다."""
+    names = get_catalog()["식품명"]
+    index = {}
+    for pos, name in enumerate(names):
+        index.setdefault(name, pos)
+    return index
+
+
+@lru_cache(maxsize=None)
+def get_nutrient_matrix():
+    """카탈로그 영양소 컬럼(NUTRIENT_COLUMNS 순서)을 float32 2차원 배열로 반환합니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.nutrients
+    import numpy as np
+    from app_nutrition import NUTRIENT_COLUMNS
+    return get_catalog()[NUTRIENT_COLUMNS].to_numpy(dtype=np.float32)
+
+
+@lru_cache(maxsize=None)
+def get_category_index():
+    """식품명 접두어 분류 색인(app_category.CategoryIndex)을 카탈로그 로드 후 한 번만 만듭니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.category_index()
+    from app_category import CategoryIndex
+    from app_nutrition import NUTRIENT_COLUMNS
+    return CategoryIndex(get_catalog()["식품명"].to_numpy(dtype=object), get_nutrient_matrix(), NUTRIENT_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def get_nutrient_filter():
+    """영양소 범위 검색용 컬럼별 정렬 색인(app_filter.NutrientFilter)을 한 번만 만듭니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.nutrient_filter()
+    from app_filter import NutrientFilter
+    from app_nutrition import NUTRIENT_COLUMNS
+    return NutrientFilter(get_nutrient_matrix(), NUTRIENT_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def get_food_ranker():
+    """식품명별(첫 행) 맞춤 추천 점수용 특성(app_rank.FoodRanker)을 한 번만 계산합니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.food_ranker()
+    import numpy as np
+    from app_nutrition import NUTRIENT_COLUMNS
+    from app_rank import FoodRanker
+    names = get_food_names()
+    rows = np.fromiter((find_food_position(name) for name in names), dtype=np.int64, count=len(names))
+    return FoodRanker(names, get_nutrient_matrix()[rows], NUTRIENT_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def get_exclusion_index():
+    """카탈로그 행별 피해야 할 음식 제외 색인(app_avoid.ExclusionIndex)."""
+    from app_avoid import ExclusionIndex
+    return ExclusionIndex(get_catalog()["식품명"])
+
+
+def search_foods(query, limit=20):
+    """식품명에 query 가 포함된 음식을 카탈로그 순서대로 최대 limit 개 찾습니다."""
+    results = []
+    for name in get_food_names():
+        if query in name:
+            results.append(name)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def find_food_position(name):
+    """식품명의 첫 번째 카탈로그 행 번호를 찾습니다. 없으면 None 을 반환합니다."""
+    shared = get_shared_catalog()
+    if shared is not None:
+        return shared.position(name)
+    return get_food_index().get(name)
+
+
+def find_food(name):
+    """식품명으로 카탈로그 행(Series)을 찾습니다. 없으면 None 을 반환합니다."""
+    pos = find_food_position(name)
+    return None if pos is None else get_catalog().iloc[pos]
+
+
+class FoodRecord:
+    """카탈로그 한 행의 가벼운 읽기 전용 보기.
+
+    Series 행을 만들지 않고 영양소 배열에서 바로 값을 꺼내며, 카탈로그 컬럼명으로
+    인덱싱할 수 있어 scale_nutrients 등 Series 를 받던 함수에 그대로 넘길 수 있습니다.
+    """
+
+    __slots__ = ("code", "name", "basis", "values")
+
+    def __init__(self, code, name, basis, values):
+        self.code = code
+        self.name = name
+        self.basis = basis
+        self.values = values  # NUTRIENT_COLUMNS 순서의 float 튜플
+
+    def __getitem__(self, column):
+        from app_nutrition import NUTRIENT_COLUMNS
+        if column == "식품코드":
+            return self.code
+        if column == "식품명":
+            return self.name
+        if column == "영양성분함량기준량":
+            return None if self.basis is None else self.basis.label
+        try:
+            return self.values[NUTRIENT_COLUMNS.index(column)]
+        except ValueError:
+            raise KeyError(column) from None
+
+    def __contains__(self, column):
+        from app_nutrition import NUTRIENT_COLUMNS
+        return column in ("식품코드", "식품명", "영양성분함량기준량") or column in NUTRIENT_COLUMNS
+
+    def __repr__(self):
+        return f"FoodRecord({self.code!r}, {self.name!r})"
+
+
+def find_food_record(name):
+    """식품명으로 카탈로그 행을 FoodRecord 로 찾습니다. 없으면 None 을 반환합니다."""
+    pos = find_food_position(name)
+    if pos is None:
+        return None
+    codes, basis_codes, matrix = _record_columns()
+    basis_code = basis_codes[pos]
+    return FoodRecord(
+        codes[pos],
+        name,
+        BasisUnit(basis_code) if basis_code >= 0 else None,
+        # float32 값을 가장 짧은 10진 표현으로 되돌려 CSV 원본 값(예: 19.98)을 그대로 돌려줍니다.
+        tuple(float(str(v)) for v in matrix[pos]),
+    )
+
+
+@lru_cache(maxsize=None)
+def _record_columns():
+    catalog = get_catalog()
+    return catalog["식품코드"].array, catalog["영양성분함량기준량"].cat.codes.to_numpy(), get_nutrient_matrix()
+
+
+@lru_cache(maxsize=None)
+def get_cooking_index():
+    """data/완.csv 의 식품명 → 조리상태 → 영양소 색인(app_cooking.CookingIndex)을 만듭니다."""
+    from app_cooking import CookingIndex
+    with timed("catalog_load", source="cooking"):
+        return CookingIndex.from_csv(COOKING_TABLE_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_shared_catalog():
+    """FOOD_AI_SHARED_CATALOG 에 발행된 공유 카탈로그에 연결합니다. (미지정/미발행이면 None)"""
+    if not SHARED_CATALOG_DIR:
+        return None
+    from app_shared_catalog import attach
+    with timed("catalog_load", source="shared"):
+        return attach(SHARED_CATALOG_DIR)
+
+
+# 카탈로그에서 파생된 캐시 (공유 카탈로그 버전이 바뀌면 함께 비웁니다)
+CATALOG_CACHES = [
+    get_shared_catalog, get_catalog, get_food_table, _food_means, get_food_names,
+    get_food_index, get_nutrient_matrix, get_category_index, get_nutrient_filter,
+    get_food_ranker, get_exclusion_index, _record_columns,
+]
+
+
+def refresh_catalog():
+    """공유 카탈로그의 새 버전이 발행되었으면 다음 사용 시 새 버전에 연결되도록 캐시를 비웁니다.
+
+    이전 버전을 쓰고 있는 실행은 가지고 있던 참조로 끝까지 진행됩니다.
+    """
+    global _unpublished_checked_at
+    if not SHARED_CATALOG_DIR:
+        return
+    from app_shared_catalog import REFRESH_INTERVAL, read_manifest
+    shared = get_shared_catalog()
+    if shared is not None:
+        stale = shared.is_stale()
+    else:
+        # 처음 연결할 때 아직 발행 전이었으면 발행되는 대로 공유 카탈로그로 바꿉니다.
+        now = time.monotonic()
+        stale = now - _unpublished_checked_at >= REFRESH_INTERVAL and read_manifest(SHARED_CATALOG_DIR) is not None
+        _unpublished_checked_at = now
+    if stale:
+        for cache in CATALOG_CACHES:
+            cache.cache_clear()
+
+
+_unpublished_checked_at = 0.0
+
+
+@lru_cache(maxsize=None)
+def get_meal_log():
+    """사용자별 섭취 기록 저장소(SQLite)를 엽니다."""
+    from app_meal_log import MealLog
+    return MealLog()
+
+
+@lru_cache(maxsize=None)
+def get_profile_store():
+    """사용자 프로필 저장소(SQLite, 메모리 read-through 캐시)를 엽니다."""
+    from app_profile import ProfileStore
+    return ProfileStore()
+
+
+@lru_cache(maxsize=None)
+def get_regressor():
+    """사전 학습된 칼로리 보정 회귀 모델을 불러옵니다."""
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError("사전 학습된 모델 파일(food_calorie_model.pkl)이 없습니다. 먼저 py에서 모델을 학습 및 저장하세요.")
+    with timed("model_load"):
+        import joblib
+        return joblib.load(MODEL_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_gemini_model():
+    """API 키를 설정하고 Gemini 모델 클라이언트를 생성합니다.
+
+    GEMINI_API_KEY 환경 변수가 있으면 사용하고(헤드리스 API 서버용),
+    없으면 Streamlit secrets 에서 읽습니다.
+    FOOD_AI_GEMINI_FACTORY="모듈:호출가능객체" 를 지정하면 그 객체가 만든 모델을
+    대신 사용합니다. (예: 오프라인 벤치마크용 bench.fake_gemini:FakeGeminiModel)
+    """
+    factory = os.environ.get("FOOD_AI_GEMINI_FACTORY")
+    if factory:
+        import importlib
+        module_name, _, attr = factory.partition(":")
+        return getattr(importlib.import_module(module_name), attr)()
+
+    import google.generativeai as genai
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        import streamlit as st
+        api_key = st.secrets["GEMINI_API_KEY"]
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
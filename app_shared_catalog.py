@@ -0,0 +1,318 @@
+"""여러 Streamlit/API 서버 프로세스가 함께 쓰는 메모리 매핑 카탈로그.
+
+로더가 카탈로그 배열과 파생 색인(식품명 색인, 분류 색인, 영양소 범위 검색 색인, 맞춤 추천
+특성)을 한 번 파일로 발행(publish)하면, 각 워커는 같은 파일을 메모리 매핑(attach)하여
+복사나 재계산 없이 사용합니다. /dev/shm 같은 tmpfs 에 발행하면 POSIX 공유 메모리와 같아서
+워커를 늘려도 카탈로그 메모리는 늘지 않습니다.
+
+    python app_shared_catalog.py publish --dir /dev/shm/food_ai_catalog
+    python app_shared_catalog.py publish --dir /dev/shm/food_ai_catalog --watch 10
+    FOOD_AI_SHARED_CATALOG=/dev/shm/food_ai_catalog streamlit run app1.py
+
+발행 디렉터리 구조 (버전마다 새 디렉터리를 만들고 manifest.json 을 원자적으로 교체):
+
+    manifest.json             {"version": ..., "rows": ..., "names": ..., ...}
+    <version>/strings.arrow   식품코드, 식품명, 영양성분함량기준량 (Arrow IPC, 메모리 매핑)
+    <version>/nutrients.npy   영양소 float32 (행 x NUTRIENT_COLUMNS)
+    <version>/name_hashes.npy 식품명 64비트 해시 (정렬됨)
+    <version>/name_rows.npy   해시 순서의 식품명별 첫 행 번호
+    <version>/name_means.npy  해시 순서의 식품명별 영양소 평균 float32
+    <version>/<색인>.<배열>.npy 파생 색인의 배열 (색인 = INDEX_CLASSES 의 이름, 배열 = STATE_ARRAYS)
+
+워커는 manifest 의 버전이 바뀌면 새 버전에 다시 연결합니다. 이전 버전 파일은
+KEEP_VERSIONS 개까지 남겨 두며, 삭제되더라도 이미 매핑한 워커는 계속 읽을 수 있습니다.
+
+피해야 할 음식 제외 색인(app_avoid.ExclusionIndex)은 미리 계산하는 배열 없이 식품명 Arrow
+버퍼를 그대로 검색하므로 따로 발행하지 않으며, 워커에서도 매핑한 식품명 버퍼를 씁니다.
+요청마다 달라지는 결과 캐시(제외 마스크 LRU 등)는 프로세스마다 둡니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from app_nutrition import NUTRIENT_COLUMNS
+
+MANIFEST_NAME = "manifest.json"
+# 파생 색인 발행을 추가하며 2 로 올렸습니다. (이전 형식의 발행본은 쓰지 않습니다)
+FORMAT_VERSION = 2
+KEEP_VERSIONS = 2
+# 워커가 manifest 변경을 확인하는 최소 간격 (초)
+REFRESH_INTERVAL = 1.0
+STRING_COLUMNS = ["식품코드", "식품명", "영양성분함량기준량"]
+
+
+def _index_classes():
+    """발행하는 파생 색인: 이름 → 클래스 (state()/from_state() 를 구현합니다)."""
+    from app_category import CategoryIndex
+    from app_filter import NutrientFilter
+    from app_rank import FoodRanker
+    return {"category": CategoryIndex, "filter": NutrientFilter, "ranker": FoodRanker}
+
+
+def name_hash(name):
+    """식품명의 64비트 해시 (프로세스와 무관하게 같은 값)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# =========================================================================
+# 발행 (로더)
+# =========================================================================
+
+def _save_npy(path, array):
+    np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def publish(df, directory):
+    """카탈로그 DataFrame 을 새 버전으로 발행하고 버전 문자열을 반환합니다."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    os.makedirs(directory, exist_ok=True)
+    # 이름순 정렬이 곧 발행 순서가 되도록 나노초 시각을 버전으로 씁니다.
+    version = f"{time.time_ns():020d}"
+    version_dir = os.path.join(directory, version)
+    os.makedirs(version_dir)
+
+    table = pa.Table.from_pandas(df[STRING_COLUMNS], preserve_index=False)
+    with pa.OSFile(os.path.join(version_dir, "strings.arrow"), "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    nutrients = df[NUTRIENT_COLUMNS].to_numpy(dtype=np.float32)
+    _save_npy(os.path.join(version_dir, "nutrients.npy"), nutrients)
+
+    # 식품명별 첫 행 / 평균을 64비트 해시 순으로 정렬해 두면 워커는 이진 탐색만 합니다.
+    names = df["식품명"]
+    first_rows = np.flatnonzero(~names.duplicated().to_numpy())
+    means = df.groupby("식품명", sort=False)[NUTRIENT_COLUMNS].mean()
+    means = means.loc[names.iloc[first_rows]].to_numpy(dtype=np.float32)
+    hashes = np.fromiter((name_hash(n) for n in names.iloc[first_rows]), dtype=np.uint64, count=len(first_rows))
+    order = np.argsort(hashes, kind="stable")
+    _save_npy(os.path.join(version_dir, "name_hashes.npy"), hashes[order])
+    _save_npy(os.path.join(version_dir, "name_rows.npy"), first_rows[order].astype(np.int32))
+    _save_npy(os.path.join(version_dir, "name_means.npy"), means[order])
+
+    # 파생 색인은 app_resources 의 get_* 와 같은 입력으로 만들어 배열만 저장합니다.
+    # (맞춤 추천은 식품명별 첫 행 = first_rows 의 카탈로그 순서)
+    classes = _index_classes()
+    indexes = {
+        "category": classes["category"](names.to_numpy(dtype=object), nutrients, NUTRIENT_COLUMNS),
+        "filter": classes["filter"](nutrients, NUTRIENT_COLUMNS),
+        "ranker": classes["ranker"](names.iloc[first_rows].to_numpy(dtype=object), nutrients[first_rows],
+                                    NUTRIENT_COLUMNS),
+    }
+    index_meta = {}
+    for key, index in indexes.items():
+        meta, arrays = index.state()
+        for attr, array in arrays.items():
+            _save_npy(os.path.join(version_dir, f"{key}.{attr}.npy"), array)
+        index_meta[key] = meta
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "rows": len(df),
+        "names": len(first_rows),
+        "columns": NUTRIENT_COLUMNS,
+        "indexes": index_meta,
+        "published_at": time.time(),
+    }
+    tmp_path = os.path.join(directory, f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+
+    _remove_old_versions(directory, keep=KEEP_VERSIONS)
+    return version
+
+
+def _remove_old_versions(directory, keep):
+    versions = sorted(
+        entry.name for entry in os.scandir(directory)
+        if entry.is_dir() and not entry.name.startswith(".")
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def read_manifest(directory):
+    """발행된 manifest 를 읽습니다. 없거나 형식이 다르면 None 을 반환합니다."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != FORMAT_VERSION or manifest.get("columns") != NUTRIENT_COLUMNS:
+        return None
+    return manifest
+
+
+# =========================================================================
+# 연결 (워커)
+# =========================================================================
+
+class SharedCatalog:
+    """발행된 한 버전의 카탈로그에 대한 읽기 전용 보기.
+
+    catalog 는 app_resources.get_catalog() 와 같은 컬럼을 가진 DataFrame 이지만,
+    문자열 컬럼은 Arrow 메모리 매핑 버퍼를, 영양소 컬럼은 nutrients.npy 매핑을 그대로 가리킵니다.
+    """
+
+    def __init__(self, directory, manifest):
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        self.directory = directory
+        self.version = manifest["version"]
+        self._version_dir = version_dir = os.path.join(directory, self.version)
+        self._index_meta = manifest["indexes"]
+        load = self._load
+
+        self.nutrients = load("nutrients.npy")
+        self.name_hashes = load("name_hashes.npy")
+        self.name_rows = load("name_rows.npy")
+        self.name_means = load("name_means.npy")
+
+        self._source = pa.memory_map(os.path.join(version_dir, "strings.arrow"), "r")
+        strings = ipc.open_file(self._source).read_all()
+
+        # 2차원 배열로 만든 DataFrame 은 블록 하나가 매핑을 그대로 가리키고,
+        # 문자열 컬럼은 Arrow 배열을 감싸기만 하므로 복사가 일어나지 않습니다.
+        catalog = pd.DataFrame(self.nutrients, columns=NUTRIENT_COLUMNS, copy=False)
+        for loc, column in enumerate(STRING_COLUMNS[:2]):
+            catalog.insert(loc, column, pd.array(strings.column(column), dtype=pd.StringDtype("pyarrow")))
+        basis = strings.column(STRING_COLUMNS[2]).combine_chunks()
+        catalog[STRING_COLUMNS[2]] = pd.Categorical.from_codes(
+            basis.indices.to_numpy(zero_copy_only=False), basis.dictionary.to_pylist()
+        )
+        self.catalog = catalog
+        # 이름 비교용: pandas 배열보다 Arrow 배열의 원소 접근이 빠릅니다.
+        self._names = strings.column("식품명").combine_chunks()
+
+        self._manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._manifest_mtime = self._mtime()
+        self._checked_at = time.monotonic()
+
+    def _load(self, name):
+        # np.memmap 하위 클래스는 원소 접근마다 비용이 커서 일반 ndarray 보기로 바꿔 둡니다.
+        return np.load(os.path.join(self._version_dir, name), mmap_mode="r").view(np.ndarray)
+
+    def _index_state(self, key):
+        cls = _index_classes()[key]
+        arrays = {attr: self._load(f"{key}.{attr}.npy") for attr in cls.STATE_ARRAYS}
+        return cls, self._index_meta[key], arrays
+
+    def category_index(self):
+        """발행된 분류 색인 (app_category.CategoryIndex, 배열은 매핑을 그대로 가리킵니다)."""
+        cls, meta, arrays = self._index_state("category")
+        return cls.from_state(meta, arrays, self.catalog["식품명"].array)
+
+    def nutrient_filter(self):
+        """발행된 영양소 범위 검색 색인 (app_filter.NutrientFilter)."""
+        cls, meta, arrays = self._index_state("filter")
+        return cls.from_state(meta, arrays)
+
+    def food_ranker(self):
+        """발행된 맞춤 추천 특성 (app_rank.FoodRanker). 식품명은 식품명별 첫 행의 카탈로그 순서."""
+        import pyarrow as pa
+        cls, meta, arrays = self._index_state("ranker")
+        names = self._names.take(pa.array(np.sort(self.name_rows)))
+        return cls.from_state(meta, arrays, names)
+
+    def _mtime(self):
+        try:
+            return os.stat(self._manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def lookup(self, name):
+        """식품명의 색인 번호(name_rows/name_means 의 위치)를 찾습니다. 없으면 None."""
+        h = np.uint64(name_hash(name))
+        i = int(self.name_hashes.searchsorted(h))
+        while i < len(self.name_hashes) and self.name_hashes[i] == h:
+            if self._names[int(self.name_rows[i])].as_py() == name:
+                return i
+            i += 1
+        return None
+
+    def position(self, name):
+        """식품명의 첫 번째 카탈로그 행 번호를 찾습니다. 없으면 None."""
+        i = self.lookup(name)
+        return None if i is None else int(self.name_rows[i])
+
+    def means(self, name):
+        """식품명의 영양소 평균(dict)을 찾습니다. 없으면 None."""
+        i = self.lookup(name)
+        if i is None:
+            return None
+        return {col: float(str(v)) for col, v in zip(NUTRIENT_COLUMNS, self.name_means[i])}
+
+    def is_stale(self):
+        """manifest 가 다른 버전으로 바뀌었는지 확인합니다. (REFRESH_INTERVAL 초에 한 번만 stat)"""
+        now = time.monotonic()
+        if now - self._checked_at < REFRESH_INTERVAL:
+            return False
+        self._checked_at = now
+        mtime = self._mtime()
+        if mtime == self._manifest_mtime:
+            return False
+        self._manifest_mtime = mtime
+        manifest = read_manifest(self.directory)
+        return manifest is not None and manifest["version"] != self.version
+
+
+def attach(directory):
+    """발행된 최신 카탈로그에 연결합니다. 발행된 것이 없으면 None 을 반환합니다."""
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    try:
+        return SharedCatalog(directory, manifest)
+    except FileNotFoundError:
+        # manifest 를 읽은 직후 버전이 정리된 경우: 한 번 더 시도합니다.
+        manifest = read_manifest(directory)
+        return None if manifest is None else SharedCatalog(directory, manifest)
+
+
+# =========================================================================
+# 로더 CLI
+# =========================================================================
+
+def default_directory():
+    env = os.environ.get("FOOD_AI_SHARED_CATALOG")
+    if env:
+        return env
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else os.path.join(os.sep, "tmp")
+    return os.path.join(base, "food_ai_catalog")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공유 메모리 카탈로그 발행")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pub = sub.add_parser("publish", help="food1.csv 를 읽어 새 버전으로 발행")
+    pub.add_argument("--dir", default=default_directory(), help="발행 디렉터리 (기본: /dev/shm/food_ai_catalog)")
+    pub.add_argument("--watch", type=float, help="이 간격(초)마다 CSV 변경을 확인해 다시 발행")
+    args = parser.parse_args(argv)
+
+    from app_resources import CATALOG_PATH, load_catalog_csv
+
+    last_mtime = None
+    while True:
+        mtime = os.path.getmtime(CATALOG_PATH)
+        if mtime != last_mtime:
+            version = publish(load_catalog_csv(), args.dir)
+            print(f"발행 완료: {args.dir} (버전 {version})", flush=True)
+            last_mtime = mtime
+        if not args.watch:
+            return
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
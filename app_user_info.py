@@ -1,5 +1,10 @@
+import uuid
+
 import streamlit as st
 
+from app_nutrition import BMI_CATEGORIES, classify_bmi, compute_bmi, get_bmi_criteria
+from app_resources import get_profile_store
+
 
 # ============================================================================
 # 1. 초기화 함수
@@ -32,6 +37,34 @@ def initialize_state():
     if 'current_page' not in st.session_state:
         st.session_state.current_page = 'user_info'
 
+    if 'profile_loaded' not in st.session_state:
+        st.session_state.profile_loaded = True
+        restore_profile()
+
+
+def restore_profile():
+    """
+    같은 주소(?uid=)로 다시 접속한 사용자의 저장된 프로필을 불러옵니다.
+    BMI 결과까지 저장되어 있으면 BMI 계산 단계를 건너뛸 수 있습니다.
+    (처음 온 사용자는 식별자를 새로 만들지 않고 그대로 둡니다)
+    """
+    user_id = st.session_state.get('user_id') or st.query_params.get('uid')
+    if not user_id:
+        return
+    profile = get_profile_store().get(user_id)
+    if profile is None:
+        return
+    st.session_state.user_id = user_id
+    st.session_state.user_height = int(profile['height'])
+    st.session_state.user_weight = int(profile['weight'])
+    st.session_state.user_age = profile['age']
+    if profile['bmi'] is not None and profile['status_category']:
+        st.session_state.bmi_result = profile['bmi']
+        st.session_state.status_category = profile['status_category']
+        st.session_state.action_message = build_action_message(
+            profile['status_category'], profile['height'], profile['weight'], profile['age']
+        )
+
 
 def clear_results():
     """
@@ -55,12 +88,14 @@ def get_user_data():
     try:
         if not all(key in st.session_state for key in ['user_height', 'user_weight', 'user_age', 'bmi_result']):
             initialize_state()
-            return {
-                'height': None,
-                'weight': None,
-                'age': None,
-                'bmi': None
-            }
+            # 저장된 프로필로 BMI 결과를 불러온 경우에는 아래에서 그 값을 반환합니다.
+            if st.session_state.bmi_result is None:
+                return {
+                    'height': None,
+                    'weight': None,
+                    'age': None,
+                    'bmi': None
+                }
         
         return {
             'height': st.session_state.user_height,
@@ -77,50 +112,27 @@ def get_user_data():
         }
 
 
+def get_user_id():
+    """
+    섭취 기록 등을 저장할 때 사용하는 사용자 식별자를 가져옵니다.
+    주소의 ?uid= 값을 사용하고, 없으면 새로 만들어 주소에 붙입니다.
+    (같은 주소로 다시 접속하면 이전 기록을 이어서 볼 수 있습니다)
+    """
+    if 'user_id' not in st.session_state:
+        user_id = st.query_params.get('uid')
+        if not user_id:
+            user_id = uuid.uuid4().hex
+            st.query_params['uid'] = user_id
+        st.session_state.user_id = user_id
+    return st.session_state.user_id
+
+
 # ============================================================================
 # 3. BMI 기준표
 # ============================================================================
 
-def get_bmi_criteria(age):
-    """
-    나이에 따라 다른 BMI 기준을 알려줍니다.
-    """
-    if 20 <= age < 40:
-        return {
-            'age_group': '20~40대',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 22.9,
-            'overweight_max': 24.9,
-            'description': '일반적인 아시아 기준'
-        }
-    elif 40 <= age < 60:
-        return {
-            'age_group': '40~60대',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 23.4,
-            'overweight_max': 25.4,
-            'description': '중년 이후 약간 높은 BMI 권장'
-        }
-    elif age >= 60:
-        return {
-            'age_group': '60대 이상',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 24.9,
-            'overweight_max': 27.4,
-            'description': '노년층은 다소 비만 허용 범위 확대'
-        }
-    else:  # 20세 미만
-        return {
-            'age_group': '20세 미만',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 22.9,
-            'overweight_max': 24.9,
-            'description': '일반적인 아시아 기준 적용'
-        }
+# 나이별 BMI 기준표(get_bmi_criteria)는 헤드리스 API 와 공유하기 위해
+# app_nutrition 에 있으며, 이 모듈에서도 그대로 import 해서 사용할 수 있습니다.
 
 
 # ============================================================================
@@ -193,47 +205,51 @@ def calculate_bmi():
         return
     
     # --- BMI 계산 ---
-    height_m = height / 100.0
-    bmi = weight / (height_m ** 2)
+    bmi = compute_bmi(height, weight)
     st.session_state.bmi_result = bmi
     
+    # --- BMI 상태 판단 (나이별 기준표, app_nutrition.classify_bmi) ---
+    st.session_state.status_category = BMI_CATEGORIES[classify_bmi(bmi, age)]
+    
+    # --- 액션 메시지 생성 ---
+    st.session_state.action_message = build_action_message(st.session_state.status_category, height, weight, age)
+    
+    # --- 프로필 저장 (다음 접속 때 BMI 계산 단계를 건너뜁니다) ---
+    get_profile_store().save(get_user_id(), height, weight, age, bmi, st.session_state.status_category)
+
+
+def build_action_message(category, height, weight, age):
+    """
+    BMI 상태별 권장 사항 카드의 내용을 만듭니다.
+    """
+    height_m = height / 100.0
+    
     # --- 나이에 맞는 BMI 기준 가져오기 ---
     criteria = get_bmi_criteria(age)
     
-    # --- BMI 상태 판단 ---
-    if bmi < criteria['underweight']:
-        st.session_state.status_category = 'underweight'
-    elif bmi < criteria['normal_max']:
-        st.session_state.status_category = 'normal'
-    elif bmi <= criteria['overweight_max']:
-        st.session_state.status_category = 'overweight'
-    else:
-        st.session_state.status_category = 'obese'
-    
     # --- 적정 체중 범위 계산 ---
     ideal_weight_min = criteria['normal_min'] * (height_m ** 2)
     ideal_weight_max = criteria['normal_max'] * (height_m ** 2)
     ideal_weight_mid = (ideal_weight_min + ideal_weight_max) / 2
     
-    # --- 액션 메시지 생성 ---
-    if st.session_state.status_category == 'underweight':
+    if category == 'underweight':
         weight_diff = ideal_weight_mid - weight
-        st.session_state.action_message = f"""
+        return f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             +{weight_diff:.1f}kg
         </div>
         <div style="font-size: 0.9rem; color: var(--text-color); opacity: 0.7;">증량이 필요합니다</div>
         """
-    elif st.session_state.status_category == 'normal':
-        st.session_state.action_message = f"""
+    elif category == 'normal':
+        return """
         <div class="status-value" style="font-size: 2rem; font-weight: bold; margin: 1.5rem 0;">
             완벽합니다! 🎉
         </div>
         <div style="font-size: 0.9rem; color: var(--text-color); opacity: 0.7;">현재 체중을 유지하세요</div>
         """
-    elif st.session_state.status_category == 'overweight':
+    elif category == 'overweight':
         weight_diff = weight - ideal_weight_max
-        st.session_state.action_message = f"""
+        return f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             -{weight_diff:.1f}kg
         </div>
@@ -241,7 +257,7 @@ def calculate_bmi():
         """
     else:  # obese
         weight_diff = weight - ideal_weight_max
-        st.session_state.action_message = f"""
+        return f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             -{weight_diff:.1f}kg
         </div>
@@ -249,6 +265,14 @@ def calculate_bmi():
         """
 
 
+def goto_diet_page():
+    """
+    식단 추천 페이지로 이동합니다.
+    버튼 콜백에서 메뉴를 바꾸므로 추가 rerun 없이 한 번에 이동합니다.
+    """
+    st.session_state.menu_choice = 'AI 맞춤 식단 설정'
+
+
 # ============================================================================
 # 6. 화면 구성 (메인 UI)
 # ============================================================================
@@ -491,6 +515,5 @@ def run_user_info():
         # --- 다음 단계 버튼 ---
         st.markdown("<div style='margin-top: 2rem;'></div>", unsafe_allow_html=True)
         
-        if st.button('🍱 AI 맞춤 식단 추천받기', key='goto_ml', use_container_width=True, type='primary'):
-            st.session_state.menu_choice = 'AI 맞춤 식단 설정'
-            st.rerun()
\ No newline at end of file
+        st.button('🍱 AI 맞춤 식단 추천받기', key='goto_ml', use_container_width=True, type='primary',
+                  on_click=goto_diet_page)
\ No newline at end of file
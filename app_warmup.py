@@ -0,0 +1,180 @@
+"""서버 시작 시 미리 불러오기(warm-up)와 준비 상태(readiness).
+
+카탈로그 파싱, 검색/조건 색인, 회귀 모델(food_calorie_model.pkl) 로드, Gemini 클라이언트
+설정은 모두 프로세스 당 한 번만 하는 lru_cache 함수입니다. 그대로 두면 새 프로세스의
+첫 사용자 요청이 이 비용을 모두 치르므로, 트래픽을 받기 전에 WARMUP_STEPS 를 차례로
+실행하고 구성 요소별 소요 시간을 stderr 와 지표(warmup_seconds)로 남깁니다.
+
+필수 단계가 모두 끝나면 준비 완료로 표시합니다.
+    app_api                GET /ready 가 200 (준비 전에는 503). uvicorn 은 시작 단계가 끝나야
+                           요청을 받기 시작합니다.
+    FOOD_AI_READY_FILE     지정하면 준비 완료 시 단계별 소요 시간을 JSON 으로 기록합니다.
+                           (Streamlit 처럼 HTTP 엔드포인트를 추가하기 어려운 서버의 readiness probe 용)
+
+    FOOD_AI_WARMUP=0       서버 시작 시 warm-up 을 생략합니다. 이때는 처음부터 준비 완료로
+                           보고합니다. (/ready 200, --serve 는 준비 파일을 바로 기록)
+
+Streamlit 은 첫 세션이 접속해야 app1.py 를 실행하므로, app1 의 백그라운드 warm-up 만으로는
+트래픽 없이 준비 파일이 생기지 않습니다. 준비 파일로 트래픽을 받는 배포에서는 Streamlit 을
+이 모듈로 실행해 서버 프로세스가 시작될 때 warm-up 을 시작합니다. (같은 프로세스이므로
+app_resources 의 캐시를 세션들이 그대로 씁니다)
+
+    python app_warmup.py                                  현재 환경에서 warm-up 을 실행하고 소요 시간을
+                                                          출력합니다. (이미지 빌드 시 카탈로그 스냅샷 생성)
+    python app_warmup.py --serve app1.py --server.port 8501
+                                                          warm-up 을 시작하며 streamlit run 을 실행합니다.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from app_metrics import observe
+
+READY_FILE = os.environ.get("FOOD_AI_READY_FILE")
+# FOOD_AI_WARMUP=0 이면 서버 시작 시 warm-up 을 하지 않습니다. (기존처럼 첫 사용 시 로드)
+WARMUP_ENABLED = os.environ.get("FOOD_AI_WARMUP", "1") != "0"
+
+
+def _warm_regressor():
+    from app_nutrition import predict_calories
+    from app_resources import get_regressor
+    # 모델 로드 뒤 첫 predict 의 입력 검증/지연 import 비용까지 미리 치릅니다.
+    predict_calories(get_regressor(), 30, 12, 8, 4, 500)
+
+
+def _warm_food_means():
+    import app_resources
+    # 공유 카탈로그는 발행된 식품명별 평균을 쓰므로 로컬 테이블을 만들지 않습니다.
+    if app_resources.get_shared_catalog() is None:
+        app_resources._food_means()
+
+
+def _resource(name):
+    def load():
+        import app_resources
+        getattr(app_resources, name)()
+    load.__name__ = name
+    return load
+
+
+# (이름, 함수, 필수 여부). 앞 단계의 결과를 뒤 단계가 쓰므로 순서대로 실행합니다.
+# Gemini 는 API 키가 없는 환경(오프라인 벤치마크 등)에서도 나머지 기능이 동작하므로 선택 단계입니다.
+WARMUP_STEPS = [
+    ("catalog", _resource("get_catalog"), True),
+    ("food_index", _resource("get_food_index"), True),
+    ("food_means", _warm_food_means, True),
+    ("nutrient_matrix", _resource("get_nutrient_matrix"), True),
+    ("category_index", _resource("get_category_index"), True),
+    ("nutrient_filter", _resource("get_nutrient_filter"), True),
+    ("exclusion_index", _resource("get_exclusion_index"), True),
+    ("food_ranker", _resource("get_food_ranker"), True),
+    ("cooking_index", _resource("get_cooking_index"), True),
+    ("regressor", _warm_regressor, True),
+    ("gemini", _resource("get_gemini_model"), False),
+]
+
+_lock = threading.Lock()
+_report = None  # 마지막 warm_up() 결과
+
+
+def warm_up(steps=WARMUP_STEPS, ready_file=READY_FILE):
+    """WARMUP_STEPS 를 실행하고 결과 dict 를 반환합니다.
+
+    {"ready": bool, "seconds": 전체, "components": {이름: {"seconds", "error"?, "required"}}}
+    여러 스레드에서 호출해도 한 번만 실행합니다.
+    """
+    global _report
+    with _lock:
+        if _report is not None:
+            return _report
+        if ready_file and os.path.exists(ready_file):
+            os.remove(ready_file)  # 이전 프로세스가 남긴 파일
+        started = time.perf_counter()
+        components = {}
+        for name, load, required in steps:
+            step_started = time.perf_counter()
+            result = {"required": required}
+            try:
+                load()
+            except Exception as exc:
+                result["error"] = f"{type(exc).__name__}: {exc}"
+            result["seconds"] = round(time.perf_counter() - step_started, 4)
+            observe("warmup_seconds", result["seconds"], component=name)
+            components[name] = result
+            status = f"실패 ({result['error']})" if "error" in result else "완료"
+            print(f"[warm-up] {name:<16} {result['seconds'] * 1000:8.1f} ms  {status}", file=sys.stderr, flush=True)
+
+        ready = all("error" not in r for r in components.values() if r["required"])
+        report = {"ready": ready, "seconds": round(time.perf_counter() - started, 4), "components": components}
+        print(f"[warm-up] 전체 {report['seconds'] * 1000:.1f} ms, 준비 {'완료' if ready else '실패'}",
+              file=sys.stderr, flush=True)
+        if ready and ready_file:
+            _write_ready_file(report, ready_file)
+        _report = report
+        return report
+
+
+def _write_ready_file(report, ready_file):
+    # 부분 기록을 probe 가 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+    tmp = f"{ready_file}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**report, "pid": os.getpid()}, f, ensure_ascii=False)
+    os.replace(tmp, ready_file)
+
+
+def readiness():
+    """준비 상태 dict. warm-up 이 아직 끝나지 않았으면 {"ready": False}.
+
+    FOOD_AI_WARMUP=0 이면 미리 불러올 것이 없으므로 {"ready": True, "warmup": "disabled"}.
+    """
+    if _report is not None:
+        return _report
+    if not WARMUP_ENABLED:
+        return {"ready": True, "warmup": "disabled"}
+    return {"ready": False}
+
+
+def start_background_warmup(ready_file=READY_FILE):
+    """warm-up 을 데몬 스레드에서 시작합니다. (현재 요청을 막지 않아야 하는 Streamlit 용)"""
+    if WARMUP_ENABLED and _report is None and not _lock.locked():
+        threading.Thread(target=warm_up, kwargs={"ready_file": ready_file},
+                         name="food-ai-warmup", daemon=True).start()
+
+
+def serve_streamlit(streamlit_args, ready_file=READY_FILE):
+    """이 프로세스에서 streamlit run 을 실행하며, 서버 시작과 동시에 warm-up 을 시작합니다."""
+    # streamlit 을 먼저 import 합니다. warm-up 스레드가 pandas 를 import 하는 도중에 plotly 가
+    # 반쯤 초기화된 pandas 를 보면 streamlit import 가 실패합니다.
+    from streamlit.web import cli
+
+    if ready_file and os.path.exists(ready_file):
+        os.remove(ready_file)  # 이전 프로세스가 남긴 파일 (warm-up 스레드가 시작되기 전에 지웁니다)
+    if WARMUP_ENABLED:
+        start_background_warmup(ready_file)
+    elif ready_file:
+        _write_ready_file(readiness(), ready_file)
+
+    sys.argv = ["streamlit", "run", *streamlit_args]
+    return cli.main()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="맛춤식 warm-up 실행 및 구성 요소별 소요 시간 출력")
+    parser.add_argument("--ready-file", default=READY_FILE, help="준비 완료 시 결과를 기록할 파일")
+    parser.add_argument("--serve", nargs=argparse.REMAINDER, metavar="SCRIPT [STREAMLIT 옵션]",
+                        help="warm-up 을 시작하며 이 프로세스에서 streamlit run 을 실행 (예: --serve app1.py)")
+    args = parser.parse_args(argv)
+    if args.serve is not None:
+        if not args.serve:
+            parser.error("--serve 뒤에 실행할 스크립트를 지정하세요. (예: --serve app1.py)")
+        return serve_streamlit(args.serve, ready_file=args.ready_file)
+    report = warm_up(ready_file=args.ready_file)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report["ready"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
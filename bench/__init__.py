@@ -0,0 +1,5 @@
+"""맛춤식 성능 측정 도구 모음.
+
+각 모듈은 ``python -m bench.<모듈명>`` 으로 실행합니다.
+(``python -m bench`` 는 오프라인 벤치마크, ``python -m bench.loadtest`` 는 동시 세션 부하 테스트)
+"""
@@ -0,0 +1,66 @@
+"""맛춤식 벤치마크 실행기.
+
+    python -m bench                          # 전체 실행, 결과 JSON 을 표준 출력으로
+    python -m bench --out bench/results.json --filter catalog search
+    python -m bench compare base.json new.json --threshold 1.2
+
+Gemini 호출은 bench.fake_gemini 로 대체되고, 섭취 기록 DB 는 임시 디렉터리에
+만들어지므로 네트워크나 API 키 없이 실행할 수 있습니다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+
+def run(args):
+    # 앱 모듈을 import 하기 전에 오프라인 환경을 설정합니다.
+    tmp_dir = tempfile.mkdtemp(prefix="food_ai_bench_")
+    os.environ["FOOD_AI_GEMINI_FACTORY"] = "bench.fake_gemini:FakeGeminiModel"
+    os.environ["FOOD_AI_DB"] = os.path.join(tmp_dir, "bench.db")
+
+    from bench import suite  # noqa: F401  (벤치마크 등록)
+    from bench.runner import environment, run_benchmarks
+
+    results = run_benchmarks(args.filter, scale=args.scale)
+    report = {"meta": environment(), "results": results}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def compare_cmd(args):
+    from bench.runner import compare, load_results
+
+    rows = compare(load_results(args.base), load_results(args.new), args.threshold)
+    regressed = False
+    for name, base_ms, new_ms, ratio, is_regression in rows:
+        mark = "  ⚠️ 회귀" if is_regression else ""
+        print(f"{name:<40} {base_ms:>10.3f} → {new_ms:>10.3f} ms  x{ratio:.2f}{mark}")
+        regressed |= is_regression
+    sys.exit(1 if regressed else 0)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "compare":
+        parser = argparse.ArgumentParser(prog="python -m bench compare")
+        parser.add_argument("base")
+        parser.add_argument("new")
+        parser.add_argument("--threshold", type=float, default=1.2, help="이 비율보다 느려지면 회귀로 표시")
+        compare_cmd(parser.parse_args(argv[1:]))
+        return
+
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("--out", help="결과 JSON 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--filter", nargs="*", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--scale", type=float, default=1.0, help="반복 횟수 배율 (빠른 확인은 0.2 등)")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
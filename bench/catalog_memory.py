@@ -0,0 +1,66 @@
+"""카탈로그 메모리 배치 비교 (기본 pandas 배치 vs app_resources 의 압축 배치).
+
+    python -m bench.catalog_memory
+
+컬럼별 메모리(memory_usage(deep=True))와 CSV/스냅샷 로드 시간을 출력합니다.
+카탈로그는 워커 프로세스마다 한 벌씩 올라가므로 결과에 워커 수를 곱해 보면 됩니다.
+"""
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import app_resources
+from app_nutrition import NUTRIENT_COLUMNS
+
+
+def load_plain():
+    """압축 전 배치: 문자열 컬럼 그대로, 영양소 float64."""
+    df = pd.read_csv(app_resources.CATALOG_PATH)
+    for col in NUTRIENT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return df
+
+
+def best_time(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def snapshot_time(df):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "catalog.pkl")
+        df.to_pickle(path)
+        size = os.path.getsize(path)
+        _, elapsed = best_time(lambda: pd.read_pickle(path))
+    return elapsed, size
+
+
+def main():
+    plain, plain_csv = best_time(load_plain)
+    compact, compact_csv = best_time(app_resources.load_catalog_csv)
+
+    plain_mem = plain.memory_usage(deep=True)
+    compact_mem = compact.memory_usage(deep=True)
+    print(f"{'컬럼':<16} {'기존 dtype':<14} {'bytes':>10}   {'압축 dtype':<14} {'bytes':>10}")
+    for col in plain.columns:
+        print(f"{col:<16} {str(plain[col].dtype):<14} {plain_mem[col]:>10,}   "
+              f"{str(compact[col].dtype):<14} {compact_mem[col]:>10,}")
+    print(f"{'합계':<16} {'':<14} {plain_mem.sum():>10,}   {'':<14} {compact_mem.sum():>10,}")
+
+    plain_snap, plain_size = snapshot_time(plain)
+    compact_snap, compact_size = snapshot_time(compact)
+    print()
+    print(f"CSV 로드       기존 {plain_csv * 1000:8.1f} ms   압축 {compact_csv * 1000:8.1f} ms")
+    print(f"스냅샷 로드    기존 {plain_snap * 1000:8.1f} ms   압축 {compact_snap * 1000:8.1f} ms")
+    print(f"스냅샷 크기    기존 {plain_size:>10,} B   압축 {compact_size:>10,} B")
+
+
+if __name__ == "__main__":
+    main()
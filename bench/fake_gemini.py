@@ -0,0 +1,100 @@
+"""오프라인 측정용 가짜 Gemini 백엔드.
+
+google.generativeai.GenerativeModel 과 같은 generate_content() 인터페이스로
+정해진 형식의 응답을 돌려줍니다. 앱에서 사용하려면 환경 변수로 지정합니다.
+
+    FOOD_AI_GEMINI_FACTORY=bench.fake_gemini:FakeGeminiModel
+
+FOOD_AI_FAKE_GEMINI_LATENCY(초)와 FOOD_AI_FAKE_GEMINI_JITTER(초)로 응답 지연을,
+FOOD_AI_FAKE_GEMINI_ERROR_RATE(0~1)로 오류 비율을 흉내 낼 수 있습니다.
+FOOD_AI_FAKE_GEMINI_SLOW_RATE(0~1)를 지정하면 그 비율의 요청이 FOOD_AI_FAKE_GEMINI_SLOW_LATENCY(초)
+만큼 더 걸립니다. (일부 요청만 멈춘 듯 오래 걸리는 실제 꼬리 지연, bench.hedge_sim 참고)
+"""
+import asyncio
+import os
+import random
+import time
+
+IMAGE_RESPONSE = """🍽 음식 이름: 닭가슴살 샐러드
+🔥 영양정보 (1인분 기준)
+- 열량(kcal): 320 kcal
+- 탄수화물(g): 18 g
+- 단백질(g): 35 g
+- 지방(g): 11 g
+- 당류(g): 6 g
+- 나트륨(mg): 540 mg
+
+💡 운동 후 섭취 시 장점: 단백질이 풍부해 근육 회복에 도움이 됩니다.
+⚠️ 주의사항: 드레싱의 나트륨과 당류를 확인하세요.
+"""
+
+DIET_RESPONSE = """### 🌅 아침
+- 추천 식단: 현미밥, 두부구이, 시금치나물
+- 예상 칼로리: 450kcal
+- 추천 이유: 복합 탄수화물과 식물성 단백질로 포만감을 유지합니다.
+
+### 🌞 점심
+- 추천 식단: 닭가슴살 샐러드, 고구마
+- 예상 칼로리: 550kcal
+- 추천 이유: 단백질과 식이섬유가 풍부합니다.
+
+### 🌙 저녁
+- 추천 식단: 연어구이, 브로콜리, 잡곡밥 반 공기
+- 예상 칼로리: 500kcal
+- 추천 이유: 불포화 지방산을 섭취할 수 있습니다.
+
+### 💡 전체적인 식단 구성 이유:
+탄수화물, 단백질, 지방의 균형을 맞춘 식단입니다.
+
+### ⚠️ 주의사항:
+알레르기가 있는 재료는 대체하세요.
+"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiError(RuntimeError):
+    """주입된 가짜 API 오류입니다."""
+
+
+class FakeGeminiModel:
+    """generate_content() 만 흉내 내는 가짜 Gemini 모델입니다."""
+
+    def __init__(self, latency=None, jitter=None, error_rate=None, seed=None, slow_rate=None, slow_latency=None):
+        env = os.environ.get
+        self.latency = float(env("FOOD_AI_FAKE_GEMINI_LATENCY", 0) if latency is None else latency)
+        self.jitter = float(env("FOOD_AI_FAKE_GEMINI_JITTER", 0) if jitter is None else jitter)
+        self.error_rate = float(env("FOOD_AI_FAKE_GEMINI_ERROR_RATE", 0) if error_rate is None else error_rate)
+        self.slow_rate = float(env("FOOD_AI_FAKE_GEMINI_SLOW_RATE", 0) if slow_rate is None else slow_rate)
+        self.slow_latency = float(env("FOOD_AI_FAKE_GEMINI_SLOW_LATENCY", 10) if slow_latency is None else slow_latency)
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _delay(self):
+        # 지수 분포 지터로 긴 꼬리(long tail) 지연을 흉내 냅니다.
+        extra = self._random.expovariate(1 / self.jitter) if self.jitter > 0 else 0
+        if self.slow_rate and self._random.random() < self.slow_rate:
+            extra += self.slow_latency
+        return self.latency + extra
+
+    def _respond(self, contents):
+        self.calls += 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise FakeGeminiError("주입된 가짜 Gemini 오류")
+        prompt = contents[0] if isinstance(contents, (list, tuple)) else contents
+        return FakeResponse(IMAGE_RESPONSE if "음식 사진" in str(prompt) else DIET_RESPONSE)
+
+    def generate_content(self, contents, **kwargs):
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._respond(contents)
+
+    async def generate_content_async(self, contents, **kwargs):
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(contents)
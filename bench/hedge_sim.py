@@ -0,0 +1,89 @@
+"""Gemini 헤지 요청(app_hedge) 효과 측정.
+
+가짜 Gemini 백엔드(bench.fake_gemini)에 같은 지연 분포를 주입하고, 헤지 없이 보낸 경우와
+app_hedge.HedgePolicy 로 보낸 경우의 응답 지연 p50/p95/p99/최대값, 추가 요청 비율,
+헤지 승리 수를 비교합니다. 네트워크나 API 키 없이 실행됩니다.
+
+    python -m bench.hedge_sim
+    python -m bench.hedge_sim --requests 1000 --latency 0.2 --jitter 0.05 --slow-rate 0.03 --slow-latency 2
+
+--slow-rate 비율의 요청은 --slow-latency 초가 더 걸립니다. 실제 꼬리 지연처럼 일부 요청만
+멈춘 듯 오래 걸리는 경우가 헤지로 줄일 수 있는 지연입니다.
+"""
+import argparse
+import asyncio
+import time
+
+from app_hedge import HedgePolicy, percentile
+from bench.fake_gemini import FakeGeminiModel
+
+PROMPT = "식단을 추천해 주세요."
+PERCENTILES = [50, 95, 99]
+
+
+async def run_requests(call, requests, concurrency):
+    """call() 을 requests 번(동시 concurrency 개) 실행하고 요청별 지연(초) 목록을 반환합니다."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def summarize(latencies):
+    summary = {f"p{q}": percentile(latencies, q) for q in PERCENTILES}
+    summary["max"] = max(latencies)
+    return summary
+
+
+async def simulate(args):
+    def backend():
+        return FakeGeminiModel(latency=args.latency, jitter=args.jitter, seed=args.seed,
+                               slow_rate=args.slow_rate, slow_latency=args.slow_latency)
+
+    plain_model = backend()
+    plain = await run_requests(lambda: plain_model.generate_content_async(PROMPT), args.requests, args.concurrency)
+
+    hedged_model = backend()
+    policy = HedgePolicy(percentile=args.percentile, delay=args.delay, budget=args.budget, source="sim")
+    hedged = await run_requests(
+        lambda: policy.call(lambda: hedged_model.generate_content_async(PROMPT)), args.requests, args.concurrency
+    )
+    stats = policy.stats()
+    # 보낸 요청 수 = 원래 요청 + 헤지 (취소된 요청도 백엔드에는 도착합니다)
+    return summarize(plain), args.requests, summarize(hedged), args.requests + stats["hedges"], stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gemini 헤지 요청 지연 비교 (가짜 백엔드)")
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="기본 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="지수 분포 지터 평균(초)")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="오래 걸리는 요청 비율")
+    parser.add_argument("--slow-latency", type=float, default=2.0, help="오래 걸리는 요청의 추가 지연(초)")
+    parser.add_argument("--percentile", type=float, default=95, help="헤지 기준 백분위")
+    parser.add_argument("--delay", type=float, default=0.5, help="표본이 모이기 전 헤지 기준(초)")
+    parser.add_argument("--budget", type=float, default=0.1, help="요청 당 추가 요청 예산")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    plain, plain_calls, hedged, hedged_calls, stats = asyncio.run(simulate(args))
+    print(f"{'':<10}" + "".join(f"{name:>10}" for name in plain) + f"{'보낸 요청':>10}")
+    for label, summary, calls in (("헤지 없음", plain, plain_calls), ("헤지", hedged, hedged_calls)):
+        print(f"{label:<10}" + "".join(f"{v * 1000:>8.0f}ms" for v in summary.values()) + f"{calls:>10}")
+    print()
+    print(f"p99 개선      {(1 - hedged['p99'] / plain['p99']) * 100:.1f}%")
+    print(f"추가 요청     {stats['hedges']}건 ({stats['hedge_rate'] * 100:.1f}%), "
+          f"헤지 승리 {stats['hedge_wins']}건, 예산 초과로 생략 {stats['budget_exhausted']}건")
+    print(f"최종 헤지 기준 {stats['threshold'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
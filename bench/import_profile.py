@@ -0,0 +1,76 @@
+"""페이지 모듈별 import 시간 프로파일.
+
+각 모듈을 새 인터프리터에서 ``python -X importtime`` 으로 import 하여
+누적 import 시간과 가장 무거운 하위 모듈을 보고합니다.
+
+    python -m bench.import_profile
+    python -m bench.import_profile --json --top 5 app_img
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["app1", "app_user_info", "app_ml", "app_eda", "app_img", "app_pref"]
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력에서 (모듈명, self_us, cumulative_us) 목록을 만듭니다."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        # 이름 앞의 공백 한 칸은 구분자이고, 그 뒤 들여쓰기가 중첩 깊이입니다.
+        rows.append((fields[2][1:].rstrip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def profile_module(module, top=10):
+    """모듈 하나를 새 프로세스에서 import 하고 결과를 요약합니다."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    # 최상위(들여쓰기 없는) 항목의 누적 시간 합이 전체 import 시간입니다.
+    total_us = sum(cum for name, _, cum in rows if not name.startswith(" "))
+    heaviest = sorted(rows, key=lambda r: r[2], reverse=True)
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "total_ms": round(total_us / 1000, 1),
+        "modules_loaded": len(rows),
+        "heaviest": [
+            {"module": name.strip(), "cumulative_ms": round(cum / 1000, 1)}
+            for name, _, cum in heaviest[:top] if name.strip() != module
+        ],
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 모듈 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=5, help="표시할 무거운 하위 모듈 수")
+    parser.add_argument("--json", action="store_true", help="JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    results = [profile_module(m, args.top) for m in args.modules]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    for r in results:
+        status = "" if r["ok"] else f"  (실패: {r['error']})"
+        print(f"{r['module']:<16} {r['total_ms']:>9.1f} ms  {r['modules_loaded']:>5} modules{status}")
+        for h in r["heaviest"]:
+            print(f"    {h['module']:<40} {h['cumulative_ms']:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
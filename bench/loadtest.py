@@ -0,0 +1,462 @@
+"""Streamlit 앱(app1.py) 동시 세션 부하 테스트.
+
+브라우저와 같은 웹소켓 프로토콜(/_stcore/stream, protobuf)로 N 개의 세션을 열고
+실제 사용 흐름을 반복합니다.
+
+    홈 → 사용자 정보(키/몸무게/나이 입력, BMI 계산) → 음식 영양 정보(음식 선택,
+    섭취량 변경) → AI 맞춤 식단(선호 음식 입력, 식단 생성) → AI 음식 영양 분석기
+    (사진 업로드, 분석)
+
+세션 수 단계별로 처리량(스크립트 실행/초), 스크립트 실행 지연 p50/p95/p99,
+단계별 지연, 서버 RSS 를 보고합니다. 서버는 가짜 Gemini 백엔드와 임시 DB 로
+직접 띄우며(--url 을 주면 이미 떠 있는 서버를 사용), 네트워크나 API 키가 필요 없습니다.
+
+    python -m bench.loadtest --sessions 1 4 8 16 --duration 30
+    python -m bench.loadtest --sessions 8 --gemini-latency 1.5 --gemini-jitter 0.5 --out load.json
+
+부하 발생기와 서버가 같은 호스트의 CPU 를 나눠 쓰므로, 노드 당 수용 인원을 정할 때는
+부하 발생기를 다른 머신에서 --url 로 실행하는 편이 정확합니다.
+"""
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from http.cookies import SimpleCookie
+
+from bench.runner import ROOT_DIR, environment, percentile
+
+# 위젯 상태 값을 담는 WidgetState 필드 (위젯 종류별)
+WIDGET_VALUE_FIELDS = {
+    "number_input": "double_value",
+    "text_input": "string_value",
+    "text_area": "string_value",
+    "selectbox": "string_value",
+    "button": "trigger_value",
+}
+SAMPLE_FOODS = ["국밥_돼지머리", "국밥_순대국밥"]
+XSRF_COOKIE_NAME = "_streamlit_xsrf"
+
+
+class ScriptRunError(RuntimeError):
+    """스크립트 실행 결과에 예외 요소가 있거나 위젯을 찾지 못한 경우입니다."""
+
+
+class StreamlitSession:
+    """브라우저 탭 하나를 흉내 내는 웹소켓 세션.
+
+    위젯 상태를 유지하며 다시 보내고, ForwardMsg 캐시(ref_hash)도 브라우저처럼 처리합니다.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.ws = None
+        self.session_id = None
+        self.query_string = ""
+        self.widgets = {}        # 라벨 → (종류, 위젯 id, fragment id, 요소 proto)
+        self.states = {}         # 위젯 id → WidgetState
+        self.cache = {}          # 메시지 hash → ForwardMsg
+        self.xsrf_token = None
+        self._file_urls = {}     # request_id → Future
+
+    async def connect(self):
+        import websockets
+        ws_url = "ws" + self.base_url[len("http"):] + "/_stcore/stream"
+        self.ws = await websockets.connect(ws_url, subprotocols=["streamlit"], max_size=None)
+        self.xsrf_token = await asyncio.to_thread(self._fetch_xsrf_token)
+
+    def _fetch_xsrf_token(self):
+        with urllib.request.urlopen(f"{self.base_url}/_stcore/health", timeout=10) as resp:
+            cookie = SimpleCookie(resp.headers.get("Set-Cookie", ""))
+        return cookie[XSRF_COOKIE_NAME].value if XSRF_COOKIE_NAME in cookie else None
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    # ------------------------------------------------------------------
+    # 스크립트 실행
+    # ------------------------------------------------------------------
+
+    async def rerun(self, fragment_id=""):
+        """현재 위젯 상태로 스크립트를 실행하고 (소요 시간 초, 수신 바이트)를 반환합니다."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = self.query_string
+        state.widget_states.widgets.extend(self.states.values())
+        state.cached_message_hashes.extend(self.cache)
+        if fragment_id:
+            state.fragment_id = fragment_id
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received, seen, errors = await self._read_until_finished()
+        elapsed = time.perf_counter() - start
+
+        # 트리거(버튼)는 한 번만 전달되고, 전체 실행 후 화면에서 사라진 위젯의 상태는 버립니다.
+        # (fragment 실행은 화면 일부만 다시 그리므로 나머지 위젯 상태를 유지합니다)
+        self.states = {
+            wid: s for wid, s in self.states.items()
+            if s.WhichOneof("value") != "trigger_value" and (fragment_id or wid in seen)
+        }
+        if errors:
+            raise ScriptRunError(errors[0])
+        return elapsed, received
+
+    async def _read_until_finished(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        received = 0
+        seen = set()
+        errors = []
+        while True:
+            data = await self.ws.recv()
+            received += len(data)
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            if msg.WhichOneof("type") == "ref_hash":
+                cached = self.cache.get(msg.ref_hash)
+                if cached is None:
+                    raise ScriptRunError(f"캐시에 없는 메시지 참조: {msg.ref_hash}")
+                cached_copy = ForwardMsg()
+                cached_copy.CopyFrom(cached)
+                cached_copy.metadata.CopyFrom(msg.metadata)
+                msg = cached_copy
+            elif msg.metadata.cacheable and msg.hash:
+                self.cache[msg.hash] = msg
+
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.session_id = msg.new_session.initialize.session_id or self.session_id
+            elif kind == "page_info_changed":
+                self.query_string = msg.page_info_changed.query_string
+            elif kind == "file_urls_response":
+                future = self._file_urls.pop(msg.file_urls_response.response_id, None)
+                if future is not None:
+                    future.set_result(msg.file_urls_response.file_urls)
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+                elif element_type in WIDGET_VALUE_FIELDS or element_type == "file_uploader":
+                    proto = getattr(element, element_type)
+                    self.widgets[proto.label] = (element_type, proto.id, msg.delta.fragment_id, proto)
+                    seen.add(proto.id)
+            elif kind == "script_finished":
+                return received, seen, errors
+
+    # ------------------------------------------------------------------
+    # 위젯 조작 (브라우저처럼 값을 바꾸면 곧바로 다시 실행)
+    # ------------------------------------------------------------------
+
+    def _widget(self, label):
+        try:
+            return self.widgets[label]
+        except KeyError:
+            raise ScriptRunError(f"위젯을 찾을 수 없습니다: {label}") from None
+
+    def _state(self, widget_id):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState()
+        state.id = widget_id
+        self.states[widget_id] = state
+        return state
+
+    async def set_value(self, label, value):
+        kind, widget_id, fragment_id, _ = self._widget(label)
+        setattr(self._state(widget_id), WIDGET_VALUE_FIELDS[kind], value)
+        return await self.rerun(fragment_id)
+
+    async def click(self, label):
+        _, widget_id, fragment_id, _ = self._widget(label)
+        self._state(widget_id).trigger_value = True
+        return await self.rerun(fragment_id)
+
+    def options(self, label):
+        return list(self._widget(label)[3].options)
+
+    async def upload(self, label, file_name, data, content_type):
+        """파일 업로드 위젯에 파일을 올리고 다시 실행합니다."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        _, widget_id, fragment_id, _ = self._widget(label)
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._file_urls[request_id] = future
+
+        msg = BackMsg()
+        msg.file_urls_request.request_id = request_id
+        msg.file_urls_request.session_id = self.session_id
+        msg.file_urls_request.file_names.append(file_name)
+        await self.ws.send(msg.SerializeToString())
+        # 응답은 다음 메시지로 오므로 직접 하나씩 읽습니다.
+        while not future.done():
+            await self._read_one()
+        file_urls = future.result()[0]
+
+        await asyncio.to_thread(self._put_file, file_urls.upload_url, file_name, data, content_type)
+
+        state = self._state(widget_id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id = file_urls.file_id
+        info.name = file_name
+        info.size = len(data)
+        info.file_urls.CopyFrom(file_urls)
+        return await self.rerun(fragment_id)
+
+    async def _read_one(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        msg = ForwardMsg()
+        msg.ParseFromString(await self.ws.recv())
+        if msg.WhichOneof("type") == "file_urls_response":
+            future = self._file_urls.pop(msg.file_urls_response.response_id, None)
+            if future is not None:
+                future.set_result(msg.file_urls_response.file_urls)
+
+    def _put_file(self, upload_url, file_name, data, content_type):
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{file_name}"; filename="{file_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+        url = upload_url if upload_url.startswith("http") else self.base_url + upload_url
+        request = urllib.request.Request(url, data=body, method="PUT")
+        request.add_header("Content-Type", f"multipart/form-data; boundary={boundary}")
+        if self.xsrf_token:
+            request.add_header("X-Xsrftoken", self.xsrf_token)
+            request.add_header("Cookie", f"{XSRF_COOKIE_NAME}={self.xsrf_token}")
+        with urllib.request.urlopen(request, timeout=30):
+            pass
+
+
+# =========================================================================
+# 사용 흐름
+# =========================================================================
+
+def sample_image():
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new("RGB", (640, 480), (210, 180, 140)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+async def user_flow(session, rng, image, record):
+    """한 사용자의 전체 흐름을 한 번 실행합니다. record(단계명, 소요 시간, 수신 바이트) 로 기록합니다."""
+
+    async def step(name, action):
+        elapsed, received = await action
+        record(name, elapsed, received)
+
+    await step("user_info.open", session.click("👤 사용자 정보 입력"))
+    await step("user_info.height", session.set_value("키(cm)", float(rng.randint(150, 190))))
+    await step("user_info.weight", session.set_value("몸무게(kg)", float(rng.randint(45, 100))))
+    await step("user_info.age", session.set_value("나이", float(rng.randint(15, 70))))
+    await step("user_info.calculate_bmi", session.click("BMI 계산 및 결과 확인"))
+
+    await step("eda.open", session.click("📊 음식 영양 정보 보기"))
+    options = session.options("음식을 선택하세요")
+    await step("eda.select_food", session.set_value("음식을 선택하세요", rng.choice(options[:500] or SAMPLE_FOODS)))
+    await step("eda.change_amount", session.set_value("섭취량 (g/ml)", float(rng.choice([50, 150, 200, 300]))))
+
+    await step("ml.open", session.click("🍱 AI 맞춤 식단 설정"))
+    await step("ml.preferences", session.set_value("선호하는 음식을 입력해주세요 (쉼표로 구분)", "연어, 닭가슴살"))
+    await step("ml.generate", session.click("🤖 AI 맞춤 식단 생성하기"))
+
+    await step("img.open", session.click("🤖 AI 음식 영양 분석기"))
+    await step("img.upload", session.upload("", "meal.jpg", image, "image/jpeg"))
+    await step("img.analyze", session.click("🚀 AI 영양 분석 시작"))
+
+
+async def run_session(base_url, deadline, seed, image, samples, errors):
+    rng = random.Random(seed)
+    session = StreamlitSession(base_url)
+
+    def record(name, elapsed, received):
+        samples.append((name, elapsed, received, time.monotonic()))
+
+    try:
+        await session.connect()
+        elapsed, received = await session.rerun()
+        record("home", elapsed, received)
+        while time.monotonic() < deadline:
+            await user_flow(session, rng, image, record)
+    except Exception as e:  # 연결 끊김, 스크립트 예외 등은 세션 오류로 집계
+        errors.append(f"{type(e).__name__}: {e}")
+    finally:
+        await session.close()
+
+
+# =========================================================================
+# 서버 / 측정
+# =========================================================================
+
+def read_rss(pid):
+    """프로세스 RSS(MiB)를 /proc 에서 읽습니다. 읽을 수 없으면 None 입니다."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_server(port, args):
+    env = dict(os.environ)
+    env.setdefault("FOOD_AI_GEMINI_FACTORY", "bench.fake_gemini:FakeGeminiModel")
+    env["FOOD_AI_DB"] = os.path.join(tempfile.mkdtemp(prefix="food_ai_load_"), "load.db")
+    env["FOOD_AI_FAKE_GEMINI_LATENCY"] = str(args.gemini_latency)
+    env["FOOD_AI_FAKE_GEMINI_JITTER"] = str(args.gemini_jitter)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT_DIR, "app1.py"),
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Streamlit 서버가 시작되지 않았습니다.")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=1):
+                return proc, base_url
+        except OSError:
+            time.sleep(0.3)
+    proc.terminate()
+    raise RuntimeError("Streamlit 서버 health 확인 시간이 초과되었습니다.")
+
+
+async def sample_rss(pid, stop, values):
+    while not stop.is_set():
+        rss = read_rss(pid)
+        if rss is not None:
+            values.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+def latency_summary(values):
+    ordered = sorted(values)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "count": len(ordered),
+        "p50_ms": ms(percentile(ordered, 50)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "p99_ms": ms(percentile(ordered, 99)),
+        "max_ms": ms(ordered[-1] if ordered else None),
+    }
+
+
+async def run_level(base_url, pid, sessions, args, image):
+    samples, errors, rss_values = [], [], []
+    stop = asyncio.Event()
+    rss_task = asyncio.create_task(sample_rss(pid, stop, rss_values)) if pid else None
+
+    start = time.monotonic()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        run_session(base_url, deadline, args.seed + i, image, samples, errors)
+        for i in range(sessions)
+    ))
+    wall = time.monotonic() - start
+    stop.set()
+    if rss_task:
+        await rss_task
+
+    by_step = {}
+    for name, elapsed, _, _ in samples:
+        by_step.setdefault(name, []).append(elapsed)
+    return {
+        "sessions": sessions,
+        "duration_s": round(wall, 2),
+        "script_runs": len(samples),
+        "throughput_runs_per_s": round(len(samples) / wall, 2) if wall else None,
+        "latency": latency_summary([s[1] for s in samples]),
+        "bytes_per_run": round(sum(s[2] for s in samples) / len(samples)) if samples else None,
+        "steps": {name: latency_summary(values) for name, values in sorted(by_step.items())},
+        "server_rss_mib": {
+            "start": round(rss_values[0], 1) if rss_values else None,
+            "max": round(max(rss_values), 1) if rss_values else None,
+        },
+        "errors": errors,
+    }
+
+
+def print_level(result, log=sys.stderr):
+    lat = result["latency"]
+    rss = result["server_rss_mib"]
+    print(
+        f"세션 {result['sessions']:>4}  실행 {result['script_runs']:>6}  "
+        f"{result['throughput_runs_per_s']:>8.2f} runs/s  "
+        f"p50 {lat['p50_ms']}ms  p95 {lat['p95_ms']}ms  p99 {lat['p99_ms']}ms  "
+        f"RSS {rss['max']} MiB  오류 {len(result['errors'])}",
+        file=log,
+    )
+
+
+async def run(args):
+    proc = None
+    if args.url:
+        base_url, pid = args.url, args.server_pid
+    else:
+        proc, base_url = start_server(args.port, args)
+        pid = proc.pid
+    try:
+        image = sample_image()
+        levels = []
+        for sessions in args.sessions:
+            result = await run_level(base_url, pid, sessions, args, image)
+            print_level(result)
+            levels.append(result)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    meta = environment()
+    meta.update({"gemini_latency_s": args.gemini_latency, "gemini_jitter_s": args.gemini_jitter, "url": base_url})
+    text = json.dumps({"meta": meta, "levels": levels}, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.loadtest", description="맛춤식 Streamlit 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16], help="단계별 동시 세션 수")
+    parser.add_argument("--duration", type=float, default=30, help="단계 당 실행 시간(초)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (기본: 직접 실행)")
+    parser.add_argument("--server-pid", type=int, help="--url 서버의 PID (RSS 측정용)")
+    parser.add_argument("--port", type=int, default=8599, help="직접 실행하는 서버의 포트")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="가짜 Gemini 기본 지연(초)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.2, help="가짜 Gemini 지수 분포 지터 평균(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 파일 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+    # 서버를 띄우기 전에 확인합니다. (requirements.txt 의 부하 테스트 항목)
+    if importlib.util.find_spec("websockets") is None:
+        parser.error("부하 테스트에는 websockets 패키지가 필요합니다: pip install websockets")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""벤치마크 등록/측정/결과 비교 도구."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 등록된 벤치마크: (이름, 함수, repeat, number, setup)
+BENCHMARKS = []
+
+
+def benchmark(name, repeat=20, number=1, setup=None):
+    """벤치마크 함수를 등록합니다.
+
+    setup 이 있으면 측정 전에 한 번 호출하고, 그 반환값을 함수 인자로 넘깁니다.
+    함수 한 번 호출 시간을 number 회 평균한 값을 repeat 번 수집합니다.
+    """
+    def decorator(fn):
+        BENCHMARKS.append((name, fn, repeat, number, setup))
+        return fn
+    return decorator
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(fn, args=(), repeat=20, number=1, warmup=1):
+    """fn(*args) 의 호출 당 소요 시간(초) 목록을 반환합니다."""
+    for _ in range(warmup):
+        fn(*args)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(*args)
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def summarize(name, samples, repeat, number):
+    ordered = sorted(samples)
+    ms = lambda v: round(v * 1000, 4)
+    return {
+        "name": name,
+        "repeat": repeat,
+        "number": number,
+        "min_ms": ms(ordered[0]),
+        "median_ms": ms(statistics.median(ordered)),
+        "mean_ms": ms(statistics.fmean(ordered)),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "max_ms": ms(ordered[-1]),
+        "ops_per_sec": round(1 / statistics.median(ordered), 1) if ordered[0] > 0 else None,
+        "error": None,
+    }
+
+
+def run_benchmarks(selected=None, scale=1.0, log=sys.stderr):
+    """등록된 벤치마크를 실행하고 결과 목록을 반환합니다. 실패한 항목은 error 에 기록합니다."""
+    results = []
+    for name, fn, repeat, number, setup in BENCHMARKS:
+        if selected and not any(s in name for s in selected):
+            continue
+        repeat = max(1, int(repeat * scale))
+        try:
+            args = (setup(),) if setup else ()
+            result = summarize(name, measure(fn, args, repeat, number), repeat, number)
+        except Exception as e:
+            result = {"name": name, "repeat": repeat, "number": number, "error": f"{type(e).__name__}: {e}"}
+        results.append(result)
+        if log:
+            if result["error"]:
+                print(f"{name:<40} 실패: {result['error']}", file=log)
+            else:
+                print(f"{name:<40} median {result['median_ms']:>10.3f} ms   p95 {result['p95_ms']:>10.3f} ms", file=log)
+    return results
+
+
+def environment():
+    """결과를 커밋 간에 비교할 수 있도록 실행 환경 정보를 모읍니다."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(base, new, threshold=1.2):
+    """두 결과 파일의 median 을 비교해 (이름, 기준, 신규, 비율, 회귀 여부) 목록을 반환합니다."""
+    base_by_name = {r["name"]: r for r in base["results"] if not r.get("error")}
+    rows = []
+    for r in new["results"]:
+        b = base_by_name.get(r["name"])
+        if b is None or r.get("error"):
+            continue
+        ratio = r["median_ms"] / b["median_ms"] if b["median_ms"] else None
+        rows.append((r["name"], b["median_ms"], r["median_ms"], ratio, ratio is not None and ratio > threshold))
+    return rows
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,341 @@
+"""앱의 주요 경로별 벤치마크 정의.
+
+python -m bench 로 실행하면 FOOD_AI_GEMINI_FACTORY / FOOD_AI_DB 가 오프라인 값으로
+설정된 뒤 이 모듈이 import 됩니다.
+"""
+from datetime import datetime, timedelta
+
+import app_resources
+from app_nutrition import predict_calories, scale_nutrients
+from bench.fake_gemini import IMAGE_RESPONSE
+from bench.runner import ROOT_DIR, benchmark
+
+SAMPLE_FOOD = "국밥_돼지머리"
+BENCH_USER = "bench-user"
+
+
+# =========================================================================
+# 1. 카탈로그
+# =========================================================================
+
+def _prepare_snapshot():
+    app_resources.save_catalog_snapshot(app_resources.load_catalog_csv())
+
+
+@benchmark("catalog.load_csv", repeat=5)
+def bench_load_csv():
+    app_resources.load_catalog_csv()
+
+
+@benchmark("catalog.load_snapshot", repeat=20, setup=_prepare_snapshot)
+def bench_load_snapshot(_):
+    app_resources.load_catalog_snapshot()
+
+
+@benchmark("catalog.build_food_table", repeat=5)
+def bench_build_food_table():
+    app_resources.get_food_table.cache_clear()
+    app_resources.get_food_table()
+
+
+@benchmark("search.substring", repeat=50)
+def bench_search():
+    app_resources.search_foods("김치", limit=20)
+
+
+@benchmark("search.no_match_full_scan", repeat=50)
+def bench_search_miss():
+    app_resources.search_foods("존재하지않는음식", limit=20)
+
+
+@benchmark("lookup.find_food", repeat=20, number=1000)
+def bench_find_food():
+    app_resources.find_food(SAMPLE_FOOD)
+
+
+@benchmark("lookup.find_food_record", repeat=20, number=1000)
+def bench_find_food_record():
+    app_resources.find_food_record(SAMPLE_FOOD)
+
+
+@benchmark("lookup.find_food_means", repeat=20, number=1000)
+def bench_find_food_means():
+    app_resources.find_food_means(SAMPLE_FOOD)
+
+
+@benchmark("lookup.find_cooked_food", repeat=20, number=1000, setup=app_resources.get_cooking_index)
+def bench_find_cooked_food(index):
+    index.resolve("메밀 국수 데친것")
+
+
+@benchmark("lookup.category_summary", repeat=20, number=1000, setup=app_resources.get_category_index)
+def bench_category_summary(index):
+    index.summary(index.categories[0])
+    index.names(index.categories[0])
+
+
+FILTER_CONDITIONS = [("에너지(kcal)", "<", 200), ("단백질(g)", ">=", 15), ("나트륨(mg)", "<", 300)]
+
+
+@benchmark("filter.query_3_conditions", repeat=20, number=100, setup=app_resources.get_nutrient_filter)
+def bench_filter_query(engine):
+    engine.query(FILTER_CONDITIONS, sort="단백질 밀도")
+
+
+@benchmark("filter.filter_foods_frame", repeat=20, number=20)
+def bench_filter_foods():
+    from app_filter import filter_foods
+    filter_foods(FILTER_CONDITIONS, sort="단백질 밀도")
+
+
+@benchmark("scale.portion", repeat=20, number=1000, setup=lambda: app_resources.find_food(SAMPLE_FOOD))
+def bench_scale(info):
+    scale_nutrients(info, 250)
+
+
+# =========================================================================
+# 2. 섭취 기록 / analyze_foods 집계
+# =========================================================================
+
+def _prepare_meal_log():
+    meal_log = app_resources.get_meal_log()
+    if meal_log.day_totals(BENCH_USER)["items"] == 0:
+        nutrients = app_resources.find_food_means(SAMPLE_FOOD)
+        now = datetime.now()
+        meal_log.add_events(BENCH_USER, [
+            (SAMPLE_FOOD, 300, nutrients, now - timedelta(days=d, minutes=i))
+            for d in range(60) for i in range(10)
+        ])
+    return meal_log
+
+
+@benchmark("meal_log.add_remove_event", repeat=20, number=50, setup=_prepare_meal_log)
+def bench_add_remove(meal_log):
+    event_id = meal_log.add_event(BENCH_USER, SAMPLE_FOOD, 300, {"나트륨(mg)": 100})
+    meal_log.remove_event(BENCH_USER, event_id)
+
+
+@benchmark("meal_log.day_totals", repeat=20, number=200, setup=_prepare_meal_log)
+def bench_day_totals(meal_log):
+    meal_log.day_totals(BENCH_USER)
+
+
+@benchmark("meal_log.window_totals_30d", repeat=20, number=200, setup=_prepare_meal_log)
+def bench_window_totals(meal_log):
+    meal_log.window_totals(BENCH_USER, 30)
+
+
+def _prepare_profile():
+    store = app_resources.get_profile_store()
+    store.save(BENCH_USER, 175, 70, 30, 22.9, "normal")
+    return store
+
+
+@benchmark("profile.get_cached", repeat=20, number=1000, setup=_prepare_profile)
+def bench_profile_get(store):
+    store.get(BENCH_USER)
+
+
+@benchmark("profile.save", repeat=20, number=50, setup=_prepare_profile)
+def bench_profile_save(store):
+    store.save(BENCH_USER, 175, 70, 30, 22.9, "normal")
+
+
+@benchmark("pref.serving_nutrients", repeat=20, number=1000)
+def bench_serving_nutrients():
+    from app_pref import serving_nutrients
+    serving_nutrients(SAMPLE_FOOD)
+
+
+def _cohort():
+    import numpy as np
+    rng = np.random.default_rng(0)
+    n = 100_000
+    return rng.uniform(140, 200, n), rng.uniform(40, 130, n), rng.integers(1, 100, n)
+
+
+@benchmark("bmi.determine_status", repeat=20, number=1000)
+def bench_determine_status():
+    from app_nutrition import determine_bmi_status
+    determine_bmi_status(23.7, 45)
+
+
+@benchmark("bmi.cohort_targets_100k", repeat=20, setup=_cohort)
+def bench_cohort_targets(profiles):
+    from app_nutrition import cohort_targets
+    cohort_targets(*profiles)
+
+
+@benchmark("avoid.exclusion_mask_cached", repeat=20, number=1000, setup=app_resources.get_exclusion_index)
+def bench_exclusion_mask(index):
+    index.mask(["우유", "새우", "견과류"])
+
+
+@benchmark("rank.recommend_top10", repeat=20, number=100, setup=app_resources.get_food_ranker)
+def bench_recommend(ranker):
+    ranker.top(10, 175, 90, 35)
+
+
+@benchmark("rank.recommend_top10_preferences", repeat=20, number=100, setup=app_resources.get_food_ranker)
+def bench_recommend_preferences(ranker):
+    ranker.top(10, 175, 90, 35, preferences=["연어", "닭가슴살"], avoid_foods=["죽"])
+
+
+@benchmark("fallback.catalog_plan", repeat=20, number=20, setup=app_resources.get_food_ranker)
+def bench_catalog_plan(_):
+    from app_fallback import catalog_plan
+    catalog_plan(29.4, 35, preferences=["닭가슴살"], avoid_foods=["우유"])
+
+
+# =========================================================================
+# 3. 칼로리 보정 모델
+# =========================================================================
+
+@benchmark("model.load", repeat=3)
+def bench_model_load():
+    app_resources.get_regressor.cache_clear()
+    app_resources.get_regressor()
+
+
+@benchmark("model.predict_single", repeat=50, setup=app_resources.get_regressor)
+def bench_predict_single(regressor):
+    predict_calories(regressor, 30, 12, 8, 4, 500)
+
+
+def _batch_features():
+    import numpy as np
+    import pandas as pd
+    from app_nutrition import REGRESSOR_FEATURES
+    rng = np.random.default_rng(0)
+    return app_resources.get_regressor(), pd.DataFrame(rng.uniform(0, 60, (1000, 5)), columns=REGRESSOR_FEATURES)
+
+
+@benchmark("model.predict_batch_1000", repeat=20, setup=_batch_features)
+def bench_predict_batch(args):
+    regressor, features = args
+    regressor.predict(features)
+
+
+# =========================================================================
+# 4. AI 응답 파싱
+# =========================================================================
+
+@benchmark("parse.extract_number", repeat=20, number=1000)
+def bench_extract_number():
+    from app_img import extract_number
+    for keyword in ("열량", "탄수화물", "단백질", "지방", "당류", "나트륨"):
+        extract_number(IMAGE_RESPONSE, keyword)
+
+
+@benchmark("parse.extract_section", repeat=20, number=1000)
+def bench_extract_section():
+    from app_img import extract_section
+    extract_section(IMAGE_RESPONSE, "🍽 음식 이름:", "🔥 영양정보 (1인분 기준)")
+    extract_section(IMAGE_RESPONSE, "💡 운동 후 섭취 시 장점:", "⚠️ 주의사항:")
+    extract_section(IMAGE_RESPONSE, "⚠️ 주의사항:")
+
+
+# =========================================================================
+# 5. 페이지 스크립트 전체 실행 (Streamlit AppTest)
+# =========================================================================
+
+PAGE_SCRIPT = f"""
+import sys
+sys.path.insert(0, {ROOT_DIR!r})
+from {{module}} import {{func}}
+{{func}}()
+"""
+
+IMG_SCRIPT = f"""
+import io, sys
+sys.path.insert(0, {ROOT_DIR!r})
+import streamlit as st
+from PIL import Image
+
+# AppTest 는 파일 업로드를 지원하지 않으므로 업로드된 사진을 흉내 냅니다.
+buf = io.BytesIO()
+Image.new("RGB", (320, 240), "white").save(buf, format="PNG")
+buf.seek(0)
+st.file_uploader = lambda *args, **kwargs: buf
+
+from app_img import run_img
+run_img()
+"""
+
+
+def _app_test(script):
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_string(script, default_timeout=60)
+
+
+def _eda_app():
+    at = _app_test(PAGE_SCRIPT.format(module="app_eda", func="run_eda"))
+    at.run()
+    return at
+
+
+@benchmark("page.run_eda.full_run", repeat=10, setup=_eda_app)
+def bench_run_eda(at):
+    at.run()
+
+
+@benchmark("page.run_eda.change_food", repeat=10, setup=_eda_app)
+def bench_run_eda_select(at):
+    box = next(b for b in at.selectbox if b.label == "음식을 선택하세요")
+    box.select_index((box.index + 1) % 50).run()
+
+
+# AppTest 는 fragment 안의 위젯을 바꿔도 스크립트 전체를 다시 실행하므로, 이 항목은 fragment
+# 재실행이 아니라 섭취량을 바꾼 뒤의 전체 재실행 시간입니다.
+@benchmark("page.run_eda.change_amount", repeat=10, setup=_eda_app)
+def bench_run_eda_amount(at):
+    amount = at.number_input[0]
+    amount.set_value(100 if amount.value != 100 else 250).run()
+
+
+def _browse_app():
+    at = _app_test(PAGE_SCRIPT.format(module="app_browse", func="run_browse"))
+    at.run()
+    return at
+
+
+@benchmark("page.run_browse.next_page", repeat=10, setup=_browse_app)
+def bench_run_browse_page(at):
+    page = at.number_input(key="browse_page")
+    page.set_value(page.value % 50 + 1).run()
+
+
+@benchmark("page.run_browse.sort_desc_density", repeat=10, setup=_browse_app)
+def bench_run_browse_sort(at):
+    box = next(b for b in at.selectbox if b.label == "정렬 기준")
+    box.select("단백질 밀도" if box.value != "단백질 밀도" else "에너지(kcal)").run()
+
+
+def _img_app():
+    at = _app_test(IMG_SCRIPT)
+    at.run()
+    return at
+
+
+@benchmark("page.run_img.upload", repeat=10, setup=_img_app)
+def bench_run_img_upload(at):
+    at.run()
+
+
+@benchmark("page.run_img.analyze_fake_gemini", repeat=10, setup=_img_app)
+def bench_run_img_analyze(at):
+    at.button[0].click().run()
+
+
+def _pref_app():
+    _prepare_meal_log()
+    script = PAGE_SCRIPT.format(module="app_pref", func="analyze_foods")
+    at = _app_test(script)
+    at.query_params["uid"] = BENCH_USER
+    at.run()
+    return at
+
+
+@benchmark("page.analyze_foods", repeat=10, setup=_pref_app)
+def bench_analyze_foods(at):
+    at.run()